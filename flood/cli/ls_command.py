@@ -22,6 +22,7 @@ def ls_command() -> None:
     
     # Group by type
     eth_tests = [name for name in generators if name.startswith('eth_')]
+    eth_tests += list(flood.tests.load_tests.subscription_test_names.keys())
     move_tests = [name for name in generators if name.startswith('move_')]
     
     if eth_tests:
@@ -41,7 +41,10 @@ def print_single(
     output_dir: str, metrics: typing.Sequence[str]
 ) -> None:
     test_payload = flood.load_single_run_test_payload(output_dir)
-    test = flood.generate_test(**test_payload['test_parameters'])
+    test = flood.generate_test(
+        **test_payload['test_parameters'],
+        cache_dir=flood.generators.get_call_cache_dir(output_dir),
+    )
     results_payload = flood.load_single_run_results_payload(output_dir)
     results = results_payload['results']
 
@@ -64,15 +64,40 @@ def get_command_spec() -> toolcli.CommandSpec:
             },
             {
                 'name': ['-m', '--mode'],
-                'choices': ['stress', 'spike', 'soak'],
-                'hidden': True,
-                'help': 'load test type: stress, spike, or soak',
+                'choices': ['stress', 'spike', 'soak', 'search', 'sweep'],
+                'help': 'load test type: stress, spike, soak, search, or sweep\n(search finds the max rate meeting [metavar]--slo-*[/metavar], using\n[metavar]--rates[/metavar] as [metavar]INITIAL [MAX][/metavar])\n(sweep runs one rate under each [metavar]--sweep-*[/metavar] client config)',  # noqa: E501
             },
             {
                 'name': ['-r', '--rates'],
                 'nargs': '+',
                 'help': 'rates to use in load test, units = reqs per second\n(default is test-specific, use [metavar]--dry[/metavar] to view)',  # noqa: E501
             },
+            {
+                'name': ['-c', '--concurrency'],
+                'dest': 'concurrencies',
+                'nargs': '+',
+                'help': 'run closed-loop test at these numbers of concurrent\nrequests instead of at rates',  # noqa: E501
+            },
+            {
+                'name': ['--batch-size'],
+                'type': int,
+                'help': 'send calls as json-rpc batches of this many calls',
+            },
+            {
+                'name': ['--cache-mode'],
+                'choices': ['cold', 'warm'],
+                'help': 'cold: no call repeats within an attack\nwarm: every attack replays a working set of calls',  # noqa: E501
+            },
+            {
+                'name': ['--working-set'],
+                'dest': 'working_set_size',
+                'type': int,
+                'help': 'number of distinct calls replayed in warm cache mode',
+            },
+            {
+                'name': ['--distribution'],
+                'help': 'distribution of call parameters, e.g. [metavar]zipf:1.2[/metavar]\nor [metavar]recency:1000[/metavar] (default = uniform)',  # noqa: E501
+            },
             {
                 'name': ['-d', '--duration'],
                 'type': int,
@@ -115,10 +140,64 @@ def get_command_spec() -> toolcli.CommandSpec:
                 'hidden': True,
                 'action': 'store_true',
             },
+            {
+                'name': ['--engine'],
+                'choices': ['vegeta', 'asyncio', 'websocket'],
+                'help': 'engine used to send requests (default = [metavar]vegeta[/metavar],\nor [metavar]websocket[/metavar] for ws:// and wss:// nodes)',  # noqa: E501
+            },
             {
                 'name': ['--vegeta-args'],
                 'help': 'extra args for vegeta, e.g. [metavar]"-timeout 5s -cpus 1"[/metavar]\nfor single args, use [metavar]--vegeta-args="..."[/metavar] (no space)',  # noqa: E501
             },
+            {
+                'name': ['--vegeta-processes'],
+                'type': int,
+                'help': 'number of vegeta processes to split each attack across\n(default = 1 per 10k rps, up to the number of cpus)',  # noqa: E501
+            },
+            {
+                'name': ['--slo-success'],
+                'type': float,
+                'help': 'min success rate for search mode (default = [metavar]0.999[/metavar])',  # noqa: E501
+            },
+            {
+                'name': ['--slo-p99'],
+                'type': float,
+                'help': 'max p99 latency in seconds for search mode',
+            },
+            {
+                'name': ['--sweep-connections'],
+                'nargs': '+',
+                'type': int,
+                'help': 'vegeta max connections to try in sweep mode\n(default = [metavar]16 64 256[/metavar])',  # noqa: E501
+            },
+            {
+                'name': ['--sweep-workers'],
+                'nargs': '+',
+                'type': int,
+                'help': 'vegeta initial workers to try in sweep mode\n(default = [metavar]10 100[/metavar])',  # noqa: E501
+            },
+            {
+                'name': ['--sweep-keepalive'],
+                'nargs': '+',
+                'choices': ['on', 'off'],
+                'help': 'keepalive settings to try in sweep mode\n(default = [metavar]on off[/metavar])',  # noqa: E501
+            },
+            {
+                'name': ['--subscribers'],
+                'dest': 'n_subscribers',
+                'type': int,
+                'help': 'number of subscribers for [metavar]eth_subscribe_*[/metavar] tests\n(default = [metavar]100[/metavar])',  # noqa: E501
+            },
+            {
+                'name': ['--subscriber-ramp'],
+                'type': float,
+                'help': 'subscribers to open per second\n(default = all at once)',  # noqa: E501
+            },
+            {
+                'name': ['--late-threshold'],
+                'type': float,
+                'help': 'delivery delay in seconds after which a notification\ncounts as late (default = [metavar]1[/metavar])',  # noqa: E501
+            },
             {
                 'name': ['-V', '--version'],
                 'help': 'print flood version and exit',
@@ -129,6 +208,7 @@ def get_command_spec() -> toolcli.CommandSpec:
             'eth_getBlockByNumber localhost:8545',
             'eth_getLogs localhost:8545 localhost:8546 localhost:8547',
             'all client1=0.0.0.0:8545 client2=0.0.0.0:8546 --equality',
+            'eth_subscribe_newHeads ws://localhost:8546 --subscribers 500',
         ],
     }
 
@@ -140,6 +220,11 @@ def root_command(
     metrics: typing.Sequence[str],
     mode: flood.LoadTestMode | None,
     rates: typing.Sequence[int] | typing.Sequence[str] | None,
+    concurrencies: typing.Sequence[int] | typing.Sequence[str] | None,
+    batch_size: int | None,
+    cache_mode: flood.CacheMode | None,
+    working_set_size: int | None,
+    distribution: flood.DistributionShorthand | None,
     duration: int | None,
     random_seed: int | None,
     dry: bool,
@@ -150,6 +235,16 @@ def root_command(
     deep_check: bool,
     remote_update: bool,
     vegeta_args: str,
+    engine: flood.LoadTestEngine | None,
+    vegeta_processes: int | None,
+    slo_success: float | None,
+    slo_p99: float | None,
+    sweep_connections: typing.Sequence[int] | None,
+    sweep_workers: typing.Sequence[int] | None,
+    sweep_keepalive: typing.Sequence[str] | None,
+    n_subscribers: int | None,
+    subscriber_ramp: float | None,
+    late_threshold: float | None,
     version: bool,
 ) -> None:
 
@@ -166,6 +261,14 @@ def root_command(
             raise Exception('metrics not used in equality test')
         if rates is not None:
             raise Exception('rates not used in equality test')
+        if concurrencies is not None:
+            raise Exception('concurrencies not used in equality test')
+        if batch_size is not None:
+            raise Exception('batch_size not used in equality test')
+        if cache_mode is not None:
+            raise Exception('cache_mode not used in equality test')
+        if distribution is not None:
+            raise Exception('distribution not used in equality test')
         if duration is not None:
             raise Exception('duration not used in equality test')
         if dry:
@@ -180,6 +283,7 @@ def root_command(
         )
 
     else:
+        from flood.runners.single_runner import single_runner_execution
 
         include_deep_output: typing.List[flood.DeepOutput] = []
         if deep_check:
@@ -189,7 +293,17 @@ def root_command(
 
         if rates is not None:
             rates = [int(rate) for rate in rates]
-        flood.run(
+        if concurrencies is not None:
+            if rates is not None:
+                raise Exception('specify only one of rates or concurrency')
+            concurrencies = [int(concurrency) for concurrency in concurrencies]
+        if sweep_keepalive is not None:
+            sweep_keepalives: typing.Sequence[bool] | None = [
+                setting == 'on' for setting in sweep_keepalive
+            ]
+        else:
+            sweep_keepalives = None
+        single_runner_execution.run(
             test_name=test,
             mode=mode,
             nodes=nodes,
@@ -197,6 +311,11 @@ def root_command(
             random_seed=random_seed,
             verbose=verbose,
             rates=rates,
+            concurrencies=concurrencies,
+            batch_size=batch_size,
+            cache_mode=cache_mode,
+            working_set_size=working_set_size,
+            distribution=distribution,
             duration=duration,
             dry=dry,
             output_dir=output_dir,
@@ -204,5 +323,15 @@ def root_command(
             include_deep_output=include_deep_output,
             deep_check=deep_check,
             vegeta_args=vegeta_args,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            slo_success=slo_success,
+            slo_p99=slo_p99,
+            sweep_connections=sweep_connections,
+            sweep_workers=sweep_workers,
+            sweep_keepalives=sweep_keepalives,
+            n_subscribers=n_subscribers,
+            subscriber_ramp=subscriber_ramp,
+            late_threshold=late_threshold,
         )
 
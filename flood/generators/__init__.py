@@ -1,3 +1,4 @@
+from .distributions import *
 from .object_generators import *
 from .raw_data_sources import *
 from .rng_utils import *
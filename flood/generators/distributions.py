@@ -0,0 +1,241 @@
+"""parameter distributions shared by object generators
+
+object generators sample ranks from a distribution and map each rank to an
+item, e.g. to a block age counted back from the latest block, or to a row of
+sample data. rank 0 is the most popular item.
+
+- uniform: every item is equally likely, which defeats node-side caches
+- zipf: a few hot items dominate, the probability of rank k is
+  proportional to (k + 1) ** -exponent
+- recency: the probability of rank k halves every half_life ranks, e.g.
+  recent blocks dominate
+
+every distribution is sampled in O(n) time and memory, independent of the
+number of items
+"""
+from __future__ import annotations
+
+import typing
+
+from flood import spec
+from . import rng_utils
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+default_zipf_exponent = 1.0
+
+# recency half life as a fraction of the number of items, if not given
+default_recency_fraction = 0.01
+
+
+def parse_distribution(
+    distribution: spec.DistributionShorthand | None,
+) -> spec.Distribution:
+    """parse distribution, e.g. None, 'uniform', 'zipf:1.2', 'recency:1000'"""
+    if distribution is None:
+        return {'name': 'uniform', 'exponent': None, 'half_life': None}
+    elif isinstance(distribution, str):
+        name, _, parameter = distribution.partition(':')
+        value = float(parameter) if parameter != '' else None
+        if name == 'uniform':
+            if value is not None:
+                raise Exception('uniform distribution takes no parameter')
+            parsed: spec.Distribution = {
+                'name': 'uniform',
+                'exponent': None,
+                'half_life': None,
+            }
+        elif name == 'zipf':
+            parsed = {'name': 'zipf', 'exponent': value, 'half_life': None}
+        elif name == 'recency':
+            parsed = {'name': 'recency', 'exponent': None, 'half_life': value}
+        else:
+            raise Exception('unknown distribution: ' + str(distribution))
+    elif isinstance(distribution, dict):
+        parsed = {
+            'name': distribution['name'],
+            'exponent': distribution.get('exponent'),
+            'half_life': distribution.get('half_life'),
+        }
+        if parsed['name'] not in ('uniform', 'zipf', 'recency'):
+            raise Exception('unknown distribution: ' + str(parsed['name']))
+    else:
+        raise Exception('invalid distribution: ' + str(distribution))
+
+    if parsed['exponent'] is not None and parsed['exponent'] <= 0:
+        raise Exception('zipf exponent must be positive')
+    if parsed['half_life'] is not None and parsed['half_life'] <= 0:
+        raise Exception('recency half_life must be positive')
+    return parsed
+
+
+def is_uniform_distribution(
+    distribution: spec.DistributionShorthand | None,
+) -> bool:
+    return parse_distribution(distribution)['name'] == 'uniform'
+
+
+def sample_ranks(
+    n: int,
+    n_items: int,
+    distribution: spec.DistributionShorthand | None = None,
+    *,
+    replace: bool = True,
+    random_seed: spec.RandomSeed | None = None,
+) -> npt.NDArray[np.int64]:
+    """sample n ranks in range(n_items) from distribution
+
+    without replacement, draws are repeated until n distinct ranks are found,
+    keeping the first occurrence of each rank. this is equivalent to sampling
+    one item at a time from the items not yet sampled
+    """
+    rng = rng_utils.get_rng(random_seed=random_seed)
+    parsed = parse_distribution(distribution)
+    if n_items < 1:
+        raise Exception('n_items must be at least 1')
+    if replace:
+        return _sample_ranks(rng, n, n_items, parsed)
+    elif n > n_items:
+        raise Exception('cannot sample more distinct ranks than items')
+    else:
+        return _sample_distinct_ranks(rng, n, n_items, parsed)
+
+
+def _sample_ranks(
+    rng: np.random.Generator,
+    n: int,
+    n_items: int,
+    distribution: spec.Distribution,
+) -> npt.NDArray[np.int64]:
+    import numpy as np
+
+    if distribution['name'] == 'uniform':
+        return rng.integers(n_items, size=n, dtype=np.int64)
+    elif distribution['name'] == 'zipf':
+        exponent = distribution['exponent']
+        if exponent is None:
+            exponent = default_zipf_exponent
+        return _sample_zipf_ranks(rng, n, n_items, exponent)
+    elif distribution['name'] == 'recency':
+        half_life = distribution['half_life']
+        if half_life is None:
+            half_life = max(1.0, n_items * default_recency_fraction)
+        return _sample_recency_ranks(rng, n, n_items, half_life)
+    else:
+        raise Exception('unknown distribution: ' + str(distribution['name']))
+
+
+def _sample_distinct_ranks(
+    rng: np.random.Generator,
+    n: int,
+    n_items: int,
+    distribution: spec.Distribution,
+    max_rounds: int = 100,
+) -> npt.NDArray[np.int64]:
+    import numpy as np
+
+    # dense samples are cheaper to take from a permutation of the range
+    if distribution['name'] == 'uniform' and n * 2 > n_items:
+        return rng.permutation(n_items)[:n].astype(np.int64)
+
+    ranks = np.empty(0, dtype=np.int64)
+    for _ in range(max_rounds):
+        n_missing = n - len(ranks)
+        if n_missing == 0:
+            return ranks
+        draws = _sample_ranks(
+            rng, n_missing + n_missing // 8 + 16, n_items, distribution
+        )
+        candidates = np.concatenate([ranks, draws])
+        _, first_indices = np.unique(candidates, return_index=True)
+        ranks = candidates[np.sort(first_indices)][:n]
+    if len(ranks) == n:
+        return ranks
+    raise Exception(
+        'could not sample '
+        + str(n)
+        + ' distinct items, sample with replacement or a flatter distribution'
+    )
+
+
+def _sample_recency_ranks(
+    rng: np.random.Generator,
+    n: int,
+    n_items: int,
+    half_life: float,
+) -> npt.NDArray[np.int64]:
+    """invert the cdf of an exponential truncated to the range, whose floor
+    follows a truncated geometric distribution over ranks"""
+    import numpy as np
+
+    decay = np.log(2) / half_life
+    tail = -np.expm1(-decay * n_items)
+    ranks = -np.log1p(-rng.random(n) * tail) / decay
+    return np.asarray(
+        np.minimum(ranks.astype(np.int64), n_items - 1), dtype=np.int64
+    )
+
+
+def _sample_zipf_ranks(
+    rng: np.random.Generator,
+    n: int,
+    n_items: int,
+    exponent: float,
+) -> npt.NDArray[np.int64]:
+    """sample zipf distribution truncated to n_items by rejection-inversion
+
+    follows Hormann and Derflinger (1996), which samples exactly using a
+    continuous hat function, accepting almost every draw
+    """
+    import numpy as np
+
+    def h(x: typing.Any) -> typing.Any:
+        return np.exp(-exponent * np.log(x))
+
+    def h_integral(x: typing.Any) -> typing.Any:
+        log_x = np.log(x)
+        return _expm1_ratio((1 - exponent) * log_x) * log_x
+
+    def h_integral_inverse(x: typing.Any) -> typing.Any:
+        t = np.maximum(x * (1 - exponent), -1.0)
+        return np.exp(_log1p_ratio(t) * x)
+
+    h_integral_x1 = h_integral(1.5) - 1.0
+    h_integral_n = h_integral(n_items + 0.5)
+    s = 2 - h_integral_inverse(h_integral(2.5) - h(2.0))
+
+    ranks = np.empty(n, dtype=np.int64)
+    pending = np.arange(n)
+    while len(pending) > 0:
+        u = h_integral_n + rng.random(len(pending)) * (
+            h_integral_x1 - h_integral_n
+        )
+        x = h_integral_inverse(u)
+        k = np.clip(np.floor(x + 0.5), 1, n_items)
+        accept = (k - x <= s) | (u >= h_integral(k + 0.5) - h(k))
+        ranks[pending[accept]] = k[accept].astype(np.int64) - 1
+        pending = pending[~accept]
+    return ranks
+
+
+def _expm1_ratio(x: typing.Any) -> typing.Any:
+    """expm1(x) / x, which is 1 at x = 0"""
+    import numpy as np
+
+    x = np.asarray(x, dtype=np.float64)
+    small = np.abs(x) < 1e-8
+    safe = np.where(small, 1.0, x)
+    return np.where(small, 1 + x / 2, np.expm1(safe) / safe)
+
+
+def _log1p_ratio(x: typing.Any) -> typing.Any:
+    """log1p(x) / x, which is 1 at x = 0"""
+    import numpy as np
+
+    x = np.asarray(x, dtype=np.float64)
+    small = np.abs(x) < 1e-8
+    safe = np.where(small, 1.0, x)
+    return np.where(small, 1 - x / 2, np.log1p(safe) / safe)
@@ -10,3 +10,4 @@ from .slot_generators import *
 from .timing_generators import *
 from .transaction_generators import *
 from .move_generators import *  # Changed from aptos_generators
+from .payload_templates import *
@@ -3,6 +3,7 @@ from __future__ import annotations
 import typing
 
 from flood import spec
+from .. import distributions
 from .. import rng_utils
 
 
@@ -11,20 +12,52 @@ def generate_block_numbers(
     start_block: int,
     end_block: int,
     *,
-    replace: bool = False,
+    replace: bool | None = None,
     sort: bool = False,
     random_seed: spec.RandomSeed | None = None,
     network: str | None = None,
+    recency_half_life: int | None = None,
+    distribution: spec.DistributionShorthand | None = None,
 ) -> typing.Sequence[int]:
-    import numpy as np
+    """sample n block numbers between start_block and end_block, inclusive
+
+    samples are drawn directly from the range, using memory proportional to n
+    rather than to the size of the range. blocks are sampled with replacement
+    if replace is True or if n exceeds the number of blocks in the range.
+    by default, uniform samples are distinct and other distributions are
+    sampled with replacement, so that popular blocks repeat.
 
+    blocks are ranked by age, so that under a zipf or recency distribution
+    the most recent blocks are the most popular. recency_half_life is a
+    shorthand for a recency distribution with that half life
+    """
     # seed a generator
     rng = rng_utils.get_rng(random_seed=random_seed)
 
     # generate blocks
-    all_blocks = np.arange(start_block, end_block + 1)
-    chosen_array = rng.choice(all_blocks, size=n, replace=(n > len(all_blocks)))
-    chosen: list[int] = chosen_array.tolist()
+    n_blocks = end_block - start_block + 1
+    if n_blocks < 1:
+        raise Exception('end_block must be at least start_block')
+    if recency_half_life is not None:
+        if distribution is not None:
+            raise Exception(
+                'specify only one of recency_half_life or distribution'
+            )
+        distribution = {
+            'name': 'recency',
+            'exponent': None,
+            'half_life': recency_half_life,
+        }
+    if replace is None:
+        replace = not distributions.is_uniform_distribution(distribution)
+    ages = distributions.sample_ranks(
+        n,
+        n_blocks,
+        distribution,
+        replace=replace or n > n_blocks,
+        random_seed=rng,
+    )
+    chosen: list[int] = (end_block - ages).tolist()
 
     # sort
     if sort:
@@ -54,7 +87,24 @@ def generate_block_ranges(
     method: str = 'strides',
     network: str | None = None,
 ) -> typing.Sequence[tuple[int, int]]:
-    if method == 'strides':
+    """sample n ranges of (start, start + range_size) within block bounds
+
+    methods:
+    - gaps: exact uniform sample over all valid sets of ranges, O(n log n)
+    - strides: ranges aligned to a random phase, shuffled (default)
+    - individual: rejection sampling of ranges, up to n_attempts
+    """
+    if method == 'gaps':
+        return _generate_block_ranges_gaps(
+            n=n,
+            range_size=range_size,
+            start_block=start_block,
+            end_block=end_block,
+            non_overlapping=non_overlapping,
+            sort=sort,
+            random_seed=random_seed,
+        )
+    elif method == 'strides':
         return _generate_block_ranges_strides(
             n=n,
             range_size=range_size,
@@ -80,6 +130,61 @@ def generate_block_ranges(
         raise Exception('unknown method: ' + str(method))
 
 
+def _generate_block_ranges_gaps(
+    *,
+    n: int,
+    range_size: int,
+    start_block: int,
+    end_block: int,
+    non_overlapping: bool = True,
+    sort: bool = False,
+    random_seed: spec.RandomSeed | None = None,
+) -> typing.Sequence[tuple[int, int]]:
+    """sample ranges by randomly allocating the free space between them
+
+    non-overlapping ranges share no blocks, including endpoints. each range
+    takes range_size + 1 blocks, leaving n_free blocks of gaps to be divided
+    among the n + 1 spaces before, between, and after the ranges. every
+    division is equally likely when the gaps are given by n sorted distinct
+    draws from range(n_free + n), minus their rank.
+    """
+    import numpy as np
+
+    rng = rng_utils.get_rng(random_seed=random_seed)
+
+    if non_overlapping:
+        n_free = (end_block - start_block) - n * (range_size + 1) + 1
+        if n_free < 0:
+            raise Exception(
+                'not enough blocks for '
+                + str(n)
+                + ' non-overlapping ranges of size '
+                + str(range_size)
+            )
+        draws = generate_block_numbers(
+            n=n, start_block=0, end_block=n_free + n - 1, random_seed=rng
+        )
+        gaps = np.sort(np.array(draws, dtype=np.int64)) - np.arange(n)
+        starts = start_block + gaps + np.arange(n) * (range_size + 1)
+    else:
+        if end_block - range_size < start_block:
+            raise Exception('range_size is larger than block bounds')
+        starts = np.array(
+            generate_block_numbers(
+                n=n,
+                start_block=start_block,
+                end_block=end_block - range_size,
+                random_seed=rng,
+            ),
+            dtype=np.int64,
+        )
+        starts.sort()
+
+    if not sort:
+        rng.shuffle(starts)
+    return [(start, start + range_size) for start in starts.tolist()]
+
+
 def _generate_block_ranges_strides(
     *,
     n: int,
@@ -134,7 +239,8 @@ def _generate_block_ranges_individual(
         n=n,
         start_block=start_block,
         end_block=end_block,
-        replace=non_overlapping,
+        replace=not non_overlapping,
+        random_seed=rng,
     )
     candidates = iter(start_blocks)
 
@@ -6,6 +6,7 @@ import flood
 from flood import generators
 from . import address_generators
 from . import block_generators
+from . import payload_templates
 from . import slot_generators
 from . import transaction_generators
 
@@ -21,23 +22,24 @@ def generate_calls_eth_get_block_by_number(
     network: str | None = None,
     block_numbers: typing.Sequence[int] | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             start_block=0,
             end_block=16_000_000,
             network=network,
         )
-    return [
-        ctc.rpc.construct_eth_get_block_by_number(block_number=block_number)
-        for block_number in block_numbers
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'eth_getBlockByNumber', [block_slot, False]
+    )
+    return payload_templates.render_payloads(template, [block_column])
 
 
 def generate_calls_eth_get_block_by_hash(
@@ -47,8 +49,6 @@ def generate_calls_eth_get_block_by_hash(
     block_hashes: typing.Sequence[str] | None = None,
     random_seed: flood.RandomSeed | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -57,10 +57,10 @@ def generate_calls_eth_get_block_by_hash(
             network=network,
             random_seed=random_seed,
         )
-    return [
-        ctc.rpc.construct_eth_get_block_by_hash(block_hash=block_hash)
-        for block_hash in block_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'eth_getBlockByHash', [payload_templates.slot('str'), False]
+    )
+    return payload_templates.render_payloads(template, [block_hashes])
 
 
 def generate_calls_eth_fee_history(
@@ -68,6 +68,7 @@ def generate_calls_eth_fee_history(
     *,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     block_numbers: typing.Sequence[int] | None = None,
     block_count: int | None = None
 ) -> typing.Sequence[flood.Call]:
@@ -79,6 +80,7 @@ def generate_calls_eth_fee_history(
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             start_block=13_000_000,
             end_block=17_000_000,
             network=network,
@@ -107,9 +109,8 @@ def generate_calls_eth_get_eth_balance(
     addresses: typing.Sequence[str] | None = None,
     block_numbers: typing.Sequence[int] | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -118,6 +119,7 @@ def generate_calls_eth_get_eth_balance(
             end_block=16_000_000,
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
     if addresses is None:
@@ -127,14 +129,16 @@ def generate_calls_eth_get_eth_balance(
             n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
 
-    return [
-        ctc.rpc.construct_eth_get_balance(
-            address=address, block_number=block_number
-        )
-        for address, block_number in zip(addresses, block_numbers)
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'eth_getBalance', [payload_templates.slot('str'), block_slot]
+    )
+    return payload_templates.render_payloads(
+        template, [addresses, block_column]
+    )
 
 
 def generate_calls_eth_get_transaction_count(
@@ -144,9 +148,8 @@ def generate_calls_eth_get_transaction_count(
     addresses: typing.Sequence[str] | None = None,
     block_numbers: typing.Sequence[int] | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -155,6 +158,7 @@ def generate_calls_eth_get_transaction_count(
             end_block=16_000_000,
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
     if addresses is None:
@@ -164,14 +168,16 @@ def generate_calls_eth_get_transaction_count(
             n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
 
-    return [
-        ctc.rpc.construct_eth_get_transaction_count(
-            from_address=address, block_number=block_number
-        )
-        for address, block_number in zip(addresses, block_numbers)
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'eth_getTransactionCount', [payload_templates.slot('str'), block_slot]
+    )
+    return payload_templates.render_payloads(
+        template, [addresses, block_column]
+    )
 
 
 #
@@ -185,9 +191,8 @@ def generate_calls_eth_get_transaction_by_hash(
     network: str,
     transaction_hashes: typing.Sequence[str] | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -195,13 +200,12 @@ def generate_calls_eth_get_transaction_by_hash(
             n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
-    return [
-        ctc.rpc.construct_eth_get_transaction_by_hash(
-            transaction_hash=transaction_hash
-        )
-        for transaction_hash in transaction_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'eth_getTransactionByHash', [payload_templates.slot('str')]
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
 
 
 def generate_calls_eth_get_transaction_receipt(
@@ -210,9 +214,8 @@ def generate_calls_eth_get_transaction_receipt(
     network: str,
     transaction_hashes: typing.Sequence[str] | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -220,13 +223,12 @@ def generate_calls_eth_get_transaction_receipt(
             n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
-    return [
-        ctc.rpc.construct_eth_get_transaction_receipt(
-            transaction_hash=transaction_hash
-        )
-        for transaction_hash in transaction_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'eth_getTransactionReceipt', [payload_templates.slot('str')]
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
 
 
 #
@@ -270,6 +272,7 @@ def generate_calls_eth_get_logs(
             n=n_calls,
             range_size=block_range_size,
             random_seed=random_seed,
+            method='gaps',
             network=network,
         )
     if topics is None:
@@ -298,9 +301,8 @@ def generate_calls_eth_get_code(
     block_numbers: typing.Sequence[int | typing.Literal['latest']]
     | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -309,6 +311,7 @@ def generate_calls_eth_get_code(
             end_block=16_000_000,
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
     if addresses is None:
@@ -318,13 +321,15 @@ def generate_calls_eth_get_code(
             n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
-    return [
-        ctc.rpc.construct_eth_get_code(
-            address=address, block_number=block_number
-        )
-        for address, block_number in zip(addresses, block_numbers)
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'eth_getCode', [payload_templates.slot('str'), block_slot]
+    )
+    return payload_templates.render_payloads(
+        template, [addresses, block_column]
+    )
 
 
 def generate_calls_eth_get_storage_at(
@@ -335,9 +340,8 @@ def generate_calls_eth_get_storage_at(
     block_numbers: typing.Sequence[int | typing.Literal['latest']]
     | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -346,20 +350,32 @@ def generate_calls_eth_get_storage_at(
             end_block=16_000_000,
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
     if slots is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         slots = slot_generators.generate_slots(
-            n_calls, network=network, random_seed=random_seed
-        )
-    return [
-        ctc.rpc.construct_eth_get_storage_at(
-            address=address, position=slot, block_number=block_number
-        )
-        for (address, slot), block_number in zip(slots, block_numbers)
-    ]
+            n_calls,
+            network=network,
+            random_seed=random_seed,
+            distribution=distribution,
+        )
+    addresses = [address for address, _ in slots]
+    positions = [position for _, position in slots]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'eth_getStorageAt',
+        [
+            payload_templates.slot('str'),
+            payload_templates.slot('str'),
+            block_slot,
+        ],
+    )
+    return payload_templates.render_payloads(
+        template, [addresses, positions, block_column]
+    )
 
 
 _default_call_datas = {
@@ -373,6 +389,7 @@ def generate_calls_eth_call(
     n_calls: int,
     network: str,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
     import ctc.rpc
 
@@ -393,6 +410,7 @@ def generate_calls_eth_call(
         end_block=16_000_000,
         n=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
         network=network,
     )
 
@@ -419,23 +437,24 @@ def generate_calls_trace_block(
     block_numbers: typing.Sequence[int] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
-            random_seed=0,
+            random_seed=random_seed,
+            distribution=distribution,
             start_block=0,
             end_block=16_000_000,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_block(block_number=block_number)
-        for block_number in block_numbers
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'trace_block', [block_slot]
+    )
+    return payload_templates.render_payloads(template, [block_column])
 
 
 def generate_calls_trace_transaction(
@@ -444,9 +463,8 @@ def generate_calls_trace_transaction(
     transaction_hashes: typing.Sequence[str] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -456,11 +474,12 @@ def generate_calls_trace_transaction(
             n=n_calls,
             network=network,
             random_seed=random_seed,
+            distribution=distribution,
         )
-    return [
-        ctc.rpc.construct_trace_transaction(transaction_hash=transaction_hash)
-        for transaction_hash in transaction_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'trace_transaction', [payload_templates.slot('str')]
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
 
 
 def generate_calls_trace_replay_block_transactions(
@@ -469,26 +488,24 @@ def generate_calls_trace_replay_block_transactions(
     block_numbers: typing.Sequence[int] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             start_block=0,
             end_block=16_000_000,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_block_transactions(
-            block_number=block_number,
-            trace_type=['trace'],
-        )
-        for block_number in block_numbers
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'trace_replayBlockTransactions', [block_slot, ['trace']]
+    )
+    return payload_templates.render_payloads(template, [block_column])
 
 
 def generate_calls_trace_replay_block_transactions_state_diff(
@@ -497,26 +514,24 @@ def generate_calls_trace_replay_block_transactions_state_diff(
     block_numbers: typing.Sequence[int] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             start_block=0,
             end_block=16_000_000,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_block_transactions(
-            block_number=block_number,
-            trace_type=['stateDiff'],
-        )
-        for block_number in block_numbers
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'trace_replayBlockTransactions', [block_slot, ['stateDiff']]
+    )
+    return payload_templates.render_payloads(template, [block_column])
 
 
 def generate_calls_trace_replay_block_transactions_vm_trace(
@@ -525,26 +540,24 @@ def generate_calls_trace_replay_block_transactions_vm_trace(
     block_numbers: typing.Sequence[int] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if block_numbers is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
         block_numbers = block_generators.generate_block_numbers(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             start_block=0,
             end_block=16_000_000,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_block_transactions(
-            block_number=block_number,
-            trace_type=['vmTrace'],
-        )
-        for block_number in block_numbers
-    ]
+    block_slot, block_column = _get_block_number_slot(block_numbers)
+    template = payload_templates.compile_payload_template(
+        'trace_replayBlockTransactions', [block_slot, ['vmTrace']]
+    )
+    return payload_templates.render_payloads(template, [block_column])
 
 
 def generate_calls_trace_replay_transaction(
@@ -553,9 +566,8 @@ def generate_calls_trace_replay_transaction(
     transaction_hashes: typing.Sequence[str] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -564,15 +576,14 @@ def generate_calls_trace_replay_transaction(
         transaction_hashes = transaction_generators.generate_transaction_hashes(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_transaction(
-            transaction_hash=transaction_hash,
-            trace_type=['trace'],
-        )
-        for transaction_hash in transaction_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'trace_replayTransaction',
+        [payload_templates.slot('str'), ['trace']],
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
 
 
 def generate_calls_trace_replay_transaction_state_diff(
@@ -581,9 +592,8 @@ def generate_calls_trace_replay_transaction_state_diff(
     transaction_hashes: typing.Sequence[str] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -592,15 +602,14 @@ def generate_calls_trace_replay_transaction_state_diff(
         transaction_hashes = transaction_generators.generate_transaction_hashes(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_transaction(
-            transaction_hash=transaction_hash,
-            trace_type=['stateDiff'],
-        )
-        for transaction_hash in transaction_hashes
-    ]
+    template = payload_templates.compile_payload_template(
+        'trace_replayTransaction',
+        [payload_templates.slot('str'), ['stateDiff']],
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
 
 
 def generate_calls_trace_replay_transaction_vm_trace(
@@ -609,9 +618,8 @@ def generate_calls_trace_replay_transaction_vm_trace(
     transaction_hashes: typing.Sequence[str] | None = None,
     network: str | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.Call]:
-    import ctc.rpc
-
     if transaction_hashes is None:
         if n_calls is None:
             raise Exception('must floodify more parameters')
@@ -620,12 +628,29 @@ def generate_calls_trace_replay_transaction_vm_trace(
         transaction_hashes = transaction_generators.generate_transaction_hashes(
             n=n_calls,
             random_seed=random_seed,
+            distribution=distribution,
             network=network,
         )
-    return [
-        ctc.rpc.construct_trace_replay_transaction(
-            transaction_hash=transaction_hash,
-            trace_type=['vmTrace'],
-        )
-        for transaction_hash in transaction_hashes
+    template = payload_templates.compile_payload_template(
+        'trace_replayTransaction',
+        [payload_templates.slot('str'), ['vmTrace']],
+    )
+    return payload_templates.render_payloads(template, [transaction_hashes])
+
+
+#
+# # payloads
+#
+
+
+def _get_block_number_slot(
+    block_numbers: typing.Sequence[int | str],
+) -> tuple[str, typing.Sequence[typing.Any]]:
+    """get payload slot and column for block numbers or tags like 'latest'"""
+    if all(isinstance(block_number, int) for block_number in block_numbers):
+        return payload_templates.slot('hex'), block_numbers
+    column = [
+        hex(block_number) if isinstance(block_number, int) else block_number
+        for block_number in block_numbers
     ]
+    return payload_templates.slot('str'), column
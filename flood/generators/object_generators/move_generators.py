@@ -6,11 +6,12 @@ import flood
 def generate_calls_move_get_account(
     n_calls: int,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     **kwargs
 ) -> typing.Sequence[flood.Call]:
     """Generate calls for Move-based chain /v1/accounts/{address}"""
     rng = flood.generators.get_rng(random_seed=random_seed)
-    addresses = _generate_valid_move_addresses(n_calls, rng)
+    addresses = _generate_valid_move_addresses(n_calls, rng, distribution)
     
     calls = []
     for address in addresses:
@@ -33,11 +34,12 @@ def generate_calls_move_get_account(
 def generate_calls_move_get_account_resources(
     n_calls: int,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     **kwargs
 ) -> typing.Sequence[flood.Call]:
     """Generate calls for Move-based chain /v1/accounts/{address}/resources"""
     rng = flood.generators.get_rng(random_seed=random_seed)
-    addresses = _generate_valid_move_addresses(n_calls, rng)
+    addresses = _generate_valid_move_addresses(n_calls, rng, distribution)
     
     return [
         {
@@ -87,11 +89,18 @@ def generate_calls_move_get_ledger_info(
 def generate_calls_move_get_block_by_height(
     n_calls: int,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     **kwargs
 ) -> typing.Sequence[flood.Call]:
     """Generate calls for Move-based chain /v1/blocks/by_height/{height}"""
     rng = flood.generators.get_rng(random_seed=random_seed)
-    heights = rng.integers(1, 5000000, size=n_calls)
+    if flood.generators.is_uniform_distribution(distribution):
+        heights = rng.integers(1, 5000000, size=n_calls)
+    else:
+        # rank heights by age, so that recent blocks are hot
+        heights = 4999999 - flood.generators.sample_ranks(
+            n_calls, 4999999, distribution, random_seed=rng
+        )
     
     return [
         {
@@ -106,12 +115,13 @@ def generate_calls_move_get_block_by_height(
 def generate_calls_move_simulate_transaction(
     n_calls: int,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     **kwargs
 ) -> typing.Sequence[flood.Call]:
     """Generate calls for Move-based chain POST /v1/transactions/simulate"""
     rng = flood.generators.get_rng(random_seed=random_seed)
-    senders = _generate_valid_move_addresses(n_calls, rng)
-    recipients = _generate_valid_move_addresses(n_calls, rng)
+    senders = _generate_valid_move_addresses(n_calls, rng, distribution)
+    recipients = _generate_valid_move_addresses(n_calls, rng, distribution)
     amounts = rng.integers(1, 10000, size=n_calls)
     
     calls = []
@@ -139,7 +149,11 @@ def generate_calls_move_simulate_transaction(
     
     return calls
 
-def _generate_valid_move_addresses(n_addresses: int, rng) -> typing.List[str]:
+def _generate_valid_move_addresses(
+    n_addresses: int,
+    rng,
+    distribution: flood.DistributionShorthand | None = None,
+) -> typing.List[str]:
     """Generate valid Move blockchain addresses (32-byte hex strings)"""
     # Common Move blockchain addresses (works for Aptos, Sui, etc.)
     real_addresses = [
@@ -175,4 +189,12 @@ def _generate_valid_move_addresses(n_addresses: int, rng) -> typing.List[str]:
         random_addr = '0x' + random_bytes.hex()
         full_addresses.append(random_addr)
     
-    return rng.choice(full_addresses, size=n_addresses, replace=True).tolist() 
\ No newline at end of file
+    if flood.generators.is_uniform_distribution(distribution):
+        choices = rng.choice(full_addresses, size=n_addresses, replace=True)
+        return choices.tolist()
+
+    # Real addresses are ranked first, so they are the hot addresses
+    ranks = flood.generators.sample_ranks(
+        n_addresses, len(full_addresses), distribution, random_seed=rng
+    )
+    return [full_addresses[rank] for rank in ranks] 
\ No newline at end of file
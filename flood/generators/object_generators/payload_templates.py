@@ -0,0 +1,226 @@
+"""render json-rpc request bodies from compiled payload templates
+
+a payload template is a json-rpc request compiled into constant byte pieces
+separated by parameter slots. rendering fills the slots of every call at once
+from arrays of parameters, writing all bodies into one contiguous buffer with
+numpy, without building or serializing a dict per call.
+
+calls are assigned sequential ids. rendered calls are bytes, which the load
+test engines send as request bodies as-is.
+
+slot values are written without json escaping, so str slots should only hold
+hex data such as addresses and hashes.
+"""
+from __future__ import annotations
+
+import typing
+
+from flood import spec
+
+if typing.TYPE_CHECKING:
+    import mmap
+
+    import numpy as np
+    import numpy.typing as npt
+
+
+_slot_marker = '\x00slot:{}\x00'
+
+
+def slot(slot_type: spec.PayloadSlot) -> str:
+    """get marker of parameter slot, for use in template params"""
+    if slot_type not in ('id', 'hex', 'str'):
+        raise Exception('invalid slot type: ' + str(slot_type))
+    return _slot_marker.format(slot_type)
+
+
+def compile_payload_template(
+    method: str, params: typing.Sequence[typing.Any]
+) -> spec.PayloadTemplate:
+    """compile json-rpc request template with slots marked by slot()
+
+    for example, compile_payload_template(
+        'eth_getBlockByNumber', [slot('hex'), False]
+    )
+    """
+    import re
+
+    import orjson
+
+    request = {
+        'jsonrpc': '2.0',
+        'id': slot('id'),
+        'method': method,
+        'params': params,
+    }
+    encoded = orjson.dumps(request)
+    parts = re.split(rb'"\\u0000slot:(\w+)\\u0000"', encoded)
+
+    pieces = [parts[0]]
+    slots: list[spec.PayloadSlot] = []
+    for slot_type, piece in zip(parts[1::2], parts[2::2]):
+        if slot_type == b'id':
+            slots.append('id')
+            pieces.append(piece)
+        elif slot_type == b'hex':
+            slots.append('hex')
+            pieces[-1] += b'"0x'
+            pieces.append(b'"' + piece)
+        elif slot_type == b'str':
+            slots.append('str')
+            pieces[-1] += b'"'
+            pieces.append(b'"' + piece)
+        else:
+            raise Exception('invalid slot type: ' + slot_type.decode())
+    if slots.count('id') != 1:
+        raise Exception('template should have exactly one id slot')
+
+    return {'method': method, 'pieces': pieces, 'slots': slots}
+
+
+def render_payloads(
+    template: spec.PayloadTemplate,
+    params: typing.Sequence[typing.Sequence[typing.Any]],
+    *,
+    start_id: int = 1,
+) -> PayloadCalls:
+    """render one call per row of params, with ids counting from start_id
+
+    params has one column of values for each non-id slot of template
+    """
+    import numpy as np
+
+    param_slots = [item for item in template['slots'] if item != 'id']
+    if len(params) != len(param_slots):
+        raise Exception('expected ' + str(len(param_slots)) + ' param columns')
+    n_calls = len(params[0]) if len(params) > 0 else 0
+    if any(len(column) != n_calls for column in params):
+        raise Exception('param columns have different lengths')
+
+    # encode each field as a (n_calls, width) matrix of bytes, and a mask of
+    # which of those bytes belong to the field
+    fields: list[tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]] = []
+    columns = iter(params)
+    for piece, slot_type in zip(template['pieces'], template['slots']):
+        fields.append(_encode_constant(piece, n_calls))
+        if slot_type == 'id':
+            ids = np.arange(start_id, start_id + n_calls, dtype=np.uint64)
+            fields.append(_encode_decimal(ids))
+        elif slot_type == 'hex':
+            values = np.asarray(next(columns), dtype=np.uint64)
+            fields.append(_encode_hex(values))
+        else:
+            fields.append(_encode_strings(next(columns)))
+    fields.append(_encode_constant(template['pieces'][-1], n_calls))
+
+    # lay out fields side by side, then keep only the masked bytes
+    matrix = np.hstack([field for field, _ in fields])
+    mask = np.hstack([field_mask for _, field_mask in fields])
+    buffer = matrix[mask]
+    row_lengths = mask.sum(axis=1, dtype=np.int64)
+    ends = np.cumsum(row_lengths)
+    starts = ends - row_lengths
+
+    return PayloadCalls(buffer.tobytes(), starts, ends)
+
+
+class PayloadCalls(typing.Sequence[bytes]):
+    """rendered calls, stored as offsets into one contiguous buffer"""
+
+    def __init__(
+        self,
+        buffer: bytes | mmap.mmap,
+        starts: npt.NDArray[np.int64],
+        ends: npt.NDArray[np.int64],
+    ) -> None:
+        self.buffer = buffer
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> bytes:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> PayloadCalls:
+        ...
+
+    def __getitem__(self, index: int | slice) -> bytes | PayloadCalls:
+        if isinstance(index, slice):
+            return PayloadCalls(
+                self.buffer, self.starts[index], self.ends[index]
+            )
+        return self.buffer[self.starts[index] : self.ends[index]]
+
+    def __iter__(self) -> typing.Iterator[bytes]:
+        buffer = self.buffer
+        for start, end in zip(self.starts.tolist(), self.ends.tolist()):
+            yield buffer[start:end]
+
+    def __repr__(self) -> str:
+        return '<PayloadCalls, ' + str(len(self)) + ' calls>'
+
+
+#
+# # field encoding
+#
+
+
+def _encode_constant(
+    piece: bytes, n: int
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]:
+    import numpy as np
+
+    row = np.frombuffer(piece, dtype=np.uint8)
+    matrix = np.broadcast_to(row, (n, len(row)))
+    return matrix, np.ones((n, len(row)), dtype=bool)
+
+
+def _encode_digits(
+    digits: npt.NDArray[np.uint64],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]:
+    """convert right-aligned digits to ascii, masking leading zeros"""
+    import numpy as np
+
+    mask = np.logical_or.accumulate(digits != 0, axis=1)
+    if mask.shape[1] > 0:
+        mask[:, -1] = True
+    characters = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    return characters[digits.astype(np.uint8)], mask
+
+
+def _encode_decimal(
+    values: npt.NDArray[np.uint64],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]:
+    import numpy as np
+
+    max_value = int(values.max()) if len(values) > 0 else 0
+    width = len(str(max_value))
+    powers = np.uint64(10) ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+    return _encode_digits((values[:, None] // powers) % np.uint64(10))
+
+
+def _encode_hex(
+    values: npt.NDArray[np.uint64],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]:
+    import numpy as np
+
+    max_value = int(values.max()) if len(values) > 0 else 0
+    width = max(1, -(-max_value.bit_length() // 4))
+    shifts = np.arange(4 * (width - 1), -4, -4, dtype=np.uint64)
+    return _encode_digits((values[:, None] >> shifts) & np.uint64(15))
+
+
+def _encode_strings(
+    values: typing.Sequence[str | bytes],
+) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.bool_]]:
+    import numpy as np
+
+    array = np.asarray(values, dtype=np.bytes_)
+    width = array.dtype.itemsize
+    matrix = array.view(np.uint8).reshape(len(array), width)
+    lengths = np.char.str_len(array)
+    return matrix, np.arange(width) < lengths[:, None]
@@ -50,6 +50,14 @@ def generate_timings(
             duration=duration,
             durations=durations,
         )
+    elif mode == 'search':
+        raise Exception(
+            'search mode chooses rates adaptively, use run_capacity_search()'
+        )
+    elif mode == 'sweep':
+        raise Exception(
+            'sweep mode varies client configs, use run_client_sweep()'
+        )
     else:
         raise Exception('unknown mode: ' + str(mode))
 
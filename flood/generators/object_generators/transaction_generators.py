@@ -10,10 +10,12 @@ def generate_transaction_hashes(
     n: int,
     network: str,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[str]:
     return generators.load_samples(
         network=network,
         datatype='transactions',
         n=n,
         random_seed=random_seed,
+        distribution=distribution,
     )
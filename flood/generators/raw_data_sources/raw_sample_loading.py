@@ -8,6 +8,8 @@ from . import raw_data_spec
 from . import raw_download_utils
 
 if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
     import polars as pl
 
 
@@ -105,9 +107,15 @@ def load_samples(
     binary_convert: bool = True,
     download_missing: bool = True,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[typing.Any]:
-    import polars as pl
+    """sample n rows of samples
 
+    rows are ranked by their position in the sample file, so that under a
+    zipf or recency distribution the same rows are hot in every call,
+    regardless of random_seed. uniform samples use each row at most once
+    per pass over the samples
+    """
     # get path
     path = get_raw_samples_path(
         datatype=datatype,
@@ -147,23 +155,142 @@ def load_samples(
         'slots': ['contract_address', 'slot'],
     }[datatype]
 
-    df = pl.scan_parquet(path).select(columns).collect()
-    if n > len(df):
-        import math
-
-        n_copies = math.ceil(n / len(df))
-        df = pl.concat(n_copies * [df])
-    if n < len(df):
-        rng = generators.get_rng(random_seed=random_seed)
-        seed = rng.integers(1_000_000_000, size=1)[0]
-        df = df.sample(n, shuffle=True, seed=seed)
-
-    for column in df.select(pl.col(pl.Binary)).columns:
-        df = df.with_columns(
-            ('0x' + pl.col(column).bin.encode('hex')).alias(column)
+    rng = generators.get_rng(random_seed=random_seed)
+    store = [load_sample_column(path, column) for column in columns]
+    if generators.is_uniform_distribution(distribution):
+        indices = _sample_indices(len(store[0]), n, rng)
+    else:
+        indices = generators.sample_ranks(
+            n, len(store[0]), distribution, random_seed=rng
         )
+    values: list[list[str]] | list[list[bytes]]
+    if binary_convert:
+        values = [_encode_hex(array[indices]) for array in store]
+    else:
+        values = [[bytes(row) for row in array[indices]] for array in store]
 
     if len(columns) == 1:
-        return df[columns[0]].to_list()
+        return values[0]
     else:
-        return df.rows()
+        return list(zip(*values))
+
+
+#
+# # sample store
+#
+
+# columns loaded in this process, shared by all generators
+_sample_columns: dict[tuple[str, str], npt.NDArray[np.uint8]] = {}
+
+
+def load_sample_column(path: str, column: str) -> npt.NDArray[np.uint8]:
+    """load binary column of samples as memory-mapped (n, width) array
+
+    the column is converted from parquet to a .npy file next to it on first
+    use, and memory-mapped from then on
+    """
+    import os
+
+    import numpy as np
+
+    key = (path, column)
+    cached = _sample_columns.get(key)
+    if cached is not None:
+        return cached
+
+    store_path = _get_store_path(path, column)
+    if not os.path.isfile(store_path) or (
+        os.path.getmtime(store_path) < os.path.getmtime(path)
+    ):
+        array = _read_sample_column(path, column)
+        try:
+            _save_sample_column(store_path, array)
+        except OSError:
+            # samples dir is read-only, keep column in memory
+            _sample_columns[key] = array
+            return array
+    mapped: npt.NDArray[np.uint8] = np.load(store_path, mmap_mode='r')
+    _sample_columns[key] = mapped
+    return mapped
+
+
+def _get_store_path(path: str, column: str) -> str:
+    if path.endswith('.parquet'):
+        path = path[: -len('.parquet')]
+    return path + '__' + column + '.npy'
+
+
+def _read_sample_column(path: str, column: str) -> npt.NDArray[np.uint8]:
+    import numpy as np
+    import polars as pl
+
+    series = pl.scan_parquet(path).select(column).collect()[column]
+    if series.dtype != pl.Binary:
+        raise Exception('sample column is not binary: ' + column)
+    if series.null_count() > 0:
+        raise Exception('sample column has null values: ' + column)
+    values = series.to_list()
+    if len(values) == 0:
+        raise Exception('no samples in ' + path)
+    width = len(values[0])
+    if any(len(value) != width for value in values):
+        raise Exception('sample column is not fixed width: ' + column)
+    buffer = np.frombuffer(b''.join(values), dtype=np.uint8)
+    return buffer.reshape(len(values), width)
+
+
+def _save_sample_column(store_path: str, array: npt.NDArray[np.uint8]) -> None:
+    import os
+    import tempfile
+
+    import numpy as np
+
+    # write to temporary file then rename, so stores are never partial
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(store_path), prefix='.tmp_', suffix='.npy'
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, store_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _sample_indices(
+    n_samples: int, n: int, rng: np.random.Generator
+) -> npt.NDArray[np.int64]:
+    """sample n indices, each index at most once per n_samples drawn"""
+    import numpy as np
+
+    if n == n_samples:
+        return np.arange(n_samples)
+    n_copies, remainder = divmod(n, n_samples)
+    remaining: npt.NDArray[np.int64] = rng.choice(
+        n_samples, size=remainder, replace=False
+    )
+    if n_copies == 0:
+        return remaining
+    indices: npt.NDArray[np.int64] = np.concatenate(
+        [np.tile(np.arange(n_samples), n_copies), remaining]
+    )
+    rng.shuffle(indices)
+    return indices
+
+
+def _encode_hex(array: npt.NDArray[np.uint8]) -> list[str]:
+    """encode rows of bytes as 0x-prefixed hex strings"""
+    import numpy as np
+
+    n, width = array.shape
+    characters = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+    encoded = np.empty((n, 2 + 2 * width), dtype=np.uint8)
+    encoded[:, 0] = ord('0')
+    encoded[:, 1] = ord('x')
+    encoded[:, 2::2] = characters[array >> 4]
+    encoded[:, 3::2] = characters[array & 15]
+    strings = encoded.view('S' + str(2 + 2 * width)).reshape(n)
+    decoded: list[str] = strings.astype(str).tolist()
+    return decoded
@@ -16,8 +16,8 @@ def get_rng(random_seed: spec.RandomSeed | None = None) -> np.random.Generator:
 
         random_seed = int(time.time())
     if isinstance(random_seed, int):
-        gen = np.random.Generator(np.random.PCG64(random_seed))
-    if isinstance(gen, np.random.Generator):
-        return gen
+        return np.random.Generator(np.random.PCG64(random_seed))
+    elif isinstance(random_seed, np.random.Generator):
+        return random_seed
     else:
         raise Exception('invalid seed format: ' + str(type(random_seed)))
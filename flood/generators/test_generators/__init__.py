@@ -1,9 +1,12 @@
 from .address_test_generators import *
 from .block_test_generators import *
+from .call_set_cache import *
 from .contract_test_generators import *
 from .generic_test_generators import *
 from .log_test_generators import *
+from .mix_test_generators import *
 from .multi_test_generators import *
+from .request_log_replay import *
 from .transaction_test_generators import *
 from .trace_test_generators import *
 from .move_test_generators import *  # Changed from aptos_test_generators
@@ -14,14 +14,17 @@ def generate_test_eth_get_balance(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_eth_balance(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_eth_balance,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
@@ -40,14 +43,17 @@ def generate_test_eth_get_transaction_count(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_transaction_count(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_transaction_count,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
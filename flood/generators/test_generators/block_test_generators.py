@@ -15,14 +15,17 @@ def generate_test_eth_get_block_by_number(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: spec.RandomSeed | None = None,
+    distribution: spec.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_block_by_number(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_block_by_number,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
@@ -41,14 +44,17 @@ def generate_test_eth_fee_history(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: spec.RandomSeed | None = None,
+    distribution: spec.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_fee_history(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_fee_history,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
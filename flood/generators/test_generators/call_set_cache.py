@@ -0,0 +1,224 @@
+"""on-disk cache of generated calls, keyed by test generation parameters
+
+generating a test reloads samples and reruns the rng for every call. tests
+are cached after generation so that rerunning a test, printing it, or
+reporting on it loads its calls from disk instead.
+
+each cache entry is a directory named by a hash of the generation
+parameters:
+- calls.bin: json request bodies of every call, concatenated
+- offsets.npy: start and end of each call in calls.bin
+- attacks.json: parameters of each attack and its number of calls
+
+calls.bin is memory-mapped when loaded, so loading takes constant time.
+json-rpc calls are loaded as request bodies, which the engines send as-is.
+generate_test draws a seed for tests without one, so that a run and later
+reports on it share a cache entry, while separate unseeded runs do not. tests
+seeded by a Generator are not cached, and neither are lazily generated tests,
+which are cheap to create and would be expensive to write.
+"""
+from __future__ import annotations
+
+import typing
+
+import flood
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    class _CachedAttack(typing.TypedDict):
+        rate: int
+        duration: int
+        vegeta_args: flood.VegetaArgs
+        concurrency: int | None
+        n_calls: int
+        # body: json-rpc request bodies, json: other calls encoded as json
+        call_format: typing.Literal['body', 'json']
+
+
+# bump when generators produce different calls for the same parameters
+call_cache_version = 2
+
+
+def get_call_cache_dir(output_dir: str | None = None) -> str | None:
+    """get cache dir, FLOOD_CACHE_DIR if set, else inside output_dir"""
+    import os
+
+    cache_dir = os.environ.get('FLOOD_CACHE_DIR')
+    if cache_dir not in [None, '']:
+        return cache_dir
+    elif output_dir is not None:
+        return os.path.join(output_dir, 'call_cache')
+    else:
+        return None
+
+
+def get_call_cache_key(
+    *,
+    test_name: str,
+    random_seed: flood.RandomSeed | None,
+    rates: typing.Sequence[int] | None,
+    durations: typing.Sequence[int] | None,
+    vegeta_args: flood.VegetaArgsShorthand | None,
+    network: str,
+    distribution: flood.DistributionShorthand | None = None,
+) -> str | None:
+    """get key of generated calls, or None if calls are not reproducible"""
+    import hashlib
+
+    import orjson
+
+    if not isinstance(random_seed, int):
+        return None
+    parameters = {
+        'cache_version': call_cache_version,
+        'flood_version': flood.get_flood_version(),
+        'test_name': test_name,
+        'random_seed': random_seed,
+        'rates': rates,
+        'durations': durations,
+        'vegeta_args': vegeta_args,
+        'network': network,
+    }
+    # keys of tests from before distributions are unchanged
+    if distribution is not None:
+        parameters['distribution'] = distribution
+    encoded = orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+def load_cached_attacks(
+    cache_dir: str, key: str
+) -> typing.Sequence[flood.VegetaAttack] | None:
+    """load cached attacks, or None if not cached"""
+    import mmap
+    import os
+
+    import numpy as np
+    import orjson
+
+    from flood.generators.object_generators import payload_templates
+
+    entry_dir = os.path.join(cache_dir, key)
+    try:
+        with open(os.path.join(entry_dir, 'attacks.json'), 'rb') as f:
+            cached_attacks: list[_CachedAttack] = orjson.loads(f.read())
+        offsets = np.load(
+            os.path.join(entry_dir, 'offsets.npy'), mmap_mode='r'
+        )
+        with open(os.path.join(entry_dir, 'calls.bin'), 'rb') as f:
+            if os.fstat(f.fileno()).st_size > 0:
+                buffer: bytes | mmap.mmap = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            else:
+                buffer = b''
+    except FileNotFoundError:
+        return None
+
+    attacks: list[flood.VegetaAttack] = []
+    start = 0
+    for cached in cached_attacks:
+        end = start + cached['n_calls']
+        calls: typing.Sequence[typing.Any] = payload_templates.PayloadCalls(
+            buffer, offsets[0, start:end], offsets[1, start:end]
+        )
+        if cached['call_format'] == 'json':
+            calls = [orjson.loads(call) for call in calls]
+        attacks.append(
+            {
+                'rate': cached['rate'],
+                'duration': cached['duration'],
+                'calls': calls,
+                'vegeta_args': cached['vegeta_args'],
+                'concurrency': cached['concurrency'],
+                'client_config': None,
+                'schedule': None,
+            }
+        )
+        start = end
+    return attacks
+
+
+def save_cached_attacks(
+    cache_dir: str,
+    key: str,
+    attacks: typing.Sequence[flood.VegetaAttack],
+) -> bool:
+    """save attacks to cache, returning whether they were cached"""
+    import os
+    import shutil
+    import tempfile
+    from array import array
+
+    import numpy as np
+    import orjson
+
+    from flood.tests.load_tests import lazy_calls
+
+    if any(
+        isinstance(attack['calls'], lazy_calls.LazyCalls) for attack in attacks
+    ):
+        return False
+
+    # write to temporary dir then rename, so entries are never partial
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp_')
+    try:
+        cached_attacks: list[_CachedAttack] = []
+        ends = array('q')
+        position = 0
+        with open(os.path.join(tmp_dir, 'calls.bin'), 'wb') as f:
+            for attack in attacks:
+                call_format = _get_call_format(attack['calls'])
+                for call in attack['calls']:
+                    if not isinstance(call, bytes):
+                        call = orjson.dumps(call)
+                    f.write(call)
+                    position += len(call)
+                    ends.append(position)
+                cached_attacks.append(
+                    {
+                        'rate': attack['rate'],
+                        'duration': attack['duration'],
+                        'vegeta_args': attack['vegeta_args'],
+                        'concurrency': attack['concurrency'],
+                        'n_calls': len(attack['calls']),
+                        'call_format': call_format,
+                    }
+                )
+        np.save(os.path.join(tmp_dir, 'offsets.npy'), _get_offsets(ends))
+        with open(os.path.join(tmp_dir, 'attacks.json'), 'wb') as f:
+            f.write(orjson.dumps(cached_attacks))
+
+        try:
+            os.rename(tmp_dir, os.path.join(cache_dir, key))
+        except OSError:
+            # entry already written by a concurrent run
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return True
+
+
+def _get_call_format(
+    calls: typing.Sequence[typing.Any],
+) -> typing.Literal['body', 'json']:
+    """json-rpc calls are cached as bodies, other calls as json"""
+    for call in calls:
+        if isinstance(call, bytes):
+            continue
+        if not isinstance(call, dict) or 'url' in call:
+            return 'json'
+    return 'body'
+
+
+def _get_offsets(ends: typing.Sequence[int]) -> npt.NDArray[np.int64]:
+    import numpy as np
+
+    offsets = np.zeros((2, len(ends)), dtype=np.int64)
+    offsets[1] = ends
+    offsets[0, 1:] = offsets[1, :-1]
+    return offsets
@@ -14,14 +14,17 @@ def generate_test_eth_get_code(
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_code(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_code,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
@@ -40,14 +43,17 @@ def generate_test_eth_get_storage_at(
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_storage_at(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_storage_at,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
@@ -66,14 +72,17 @@ def generate_test_eth_call(
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_call(
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_call,
         n_calls=n_calls,
         network=network,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return load_tests.create_load_test(
         calls=calls,
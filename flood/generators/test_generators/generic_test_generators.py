@@ -34,6 +34,16 @@ def get_multi_test_generators() -> (
 
 def get_test_generator(test_name: str) -> flood.LoadTestGenerator:
     """get particular single test generator"""
+    from . import mix_test_generators
+
+    if mix_test_generators.is_mix_test_name(test_name):
+        import functools
+
+        weights = mix_test_generators.parse_mix_weights(test_name)
+        return functools.partial(
+            mix_test_generators.generate_mix_test, weights=weights
+        )
+
     function_name = get_test_generator_function_name(test_name)
     print(f"Looking for function: {function_name}")  # Debug line
     if hasattr(flood.generators, function_name):
@@ -69,13 +79,58 @@ def generate_test(
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     network: str,
     flood_version: str,
+    concurrencies: typing.Sequence[int] | None = None,
+    batch_size: int | None = None,
+    cache_mode: flood.CacheMode | None = None,
+    working_set_size: int | None = None,
+    distribution: flood.DistributionShorthand | None = None,
+    n_unique_calls: typing.Sequence[int] | None = None,
+    cache_dir: str | None = None,
 ) -> flood.LoadTest:
+    """generate test at rates, or closed-loop test at concurrencies
+
+    if batch_size is given, each request is a json-rpc batch of that many calls
+
+    if cache_mode is 'cold', no call repeats within an attack. if cache_mode
+    is 'warm', every attack replays the same working_set_size distinct calls.
+    the number of distinct calls of each attack is recorded in n_unique_calls,
+    which is ignored as an input
+
+    distribution sets how call parameters are drawn, e.g. 'zipf:1.2' or
+    'recency:1000', see flood.generators.distributions
+
+    if cache_dir is given, generated calls are cached there and reused by later
+    generations with the same parameters. if random_seed is None, a seed is
+    drawn from the clock and recorded in test_parameters
+    """
+    from flood.tests import load_tests
+    from . import call_set_cache
+
     if test_name is None:
         raise Exception('must specify test_name')
+
+    # draw a seed up front, so that the test can be regenerated and cached
+    if random_seed is None:
+        import time
+
+        random_seed = int(time.time())
     
     # Convert duration to durations if needed
     if duration is not None and durations is None:
         durations = [duration]
+
+    # closed-loop tests are generated with enough calls for each concurrency
+    generator_rates: typing.Sequence[int] | None
+    if concurrencies is not None:
+        if rates is not None:
+            raise Exception('specify only one of rates or concurrencies')
+        generator_rates = load_tests.get_closed_loop_call_rates(concurrencies)
+    else:
+        generator_rates = rates
+    if batch_size is not None and generator_rates is not None:
+        generator_rates = [rate * batch_size for rate in generator_rates]
+    if durations is not None and len(durations) == 1 and generator_rates:
+        durations = list(durations) * len(generator_rates)
     
     test_generator = get_test_generator(test_name)
     test_parameters: flood.TestGenerationParameters = {
@@ -86,14 +141,69 @@ def generate_test(
         'durations': durations,
         'vegeta_args': vegeta_args,
         'network': network,
+        'concurrencies': concurrencies,
+        'batch_size': batch_size,
+        'cache_mode': cache_mode,
+        'working_set_size': working_set_size,
+        'distribution': distribution,
+        'n_unique_calls': None,
     }
-    attacks = test_generator(
-        rates=rates,
-        durations=durations,
-        vegeta_args=vegeta_args,
-        network=network,
-        random_seed=random_seed,
-    )
+
+    # load generated calls from cache if available
+    cache_key = None
+    if cache_dir is not None:
+        cache_key = call_set_cache.get_call_cache_key(
+            test_name=test_name,
+            random_seed=random_seed,
+            rates=generator_rates,
+            durations=durations,
+            vegeta_args=vegeta_args,
+            network=network,
+            distribution=distribution,
+        )
+    attacks = None
+    if cache_dir is not None and cache_key is not None:
+        attacks = call_set_cache.load_cached_attacks(cache_dir, cache_key)
+    if attacks is None:
+        attacks = test_generator(
+            rates=generator_rates,
+            durations=durations,
+            vegeta_args=vegeta_args,
+            network=network,
+            random_seed=random_seed,
+            distribution=distribution,
+        )
+        if cache_dir is not None and cache_key is not None:
+            call_set_cache.save_cached_attacks(cache_dir, cache_key, attacks)
+
+    if cache_mode is not None:
+
+        def generate_calls(seed: int) -> typing.Iterable[flood.Call]:
+            more_attacks = test_generator(
+                rates=generator_rates,
+                durations=durations,
+                vegeta_args=vegeta_args,
+                network=network,
+                random_seed=seed,
+                distribution=distribution,
+            )
+            return (call for attack in more_attacks for call in attack['calls'])
+
+        attacks, test_parameters['n_unique_calls'] = (
+            load_tests.convert_to_cache_mode(
+                attacks,
+                cache_mode,
+                working_set_size=working_set_size,
+                random_seed=random_seed,
+                generate_calls=generate_calls,
+            )
+        )
+    elif working_set_size is not None:
+        raise Exception('working_set_size requires a cache_mode')
+    if batch_size is not None:
+        attacks = load_tests.convert_to_batches(attacks, batch_size)
+    if concurrencies is not None:
+        attacks = load_tests.convert_to_closed_loop(attacks, concurrencies)
     return {'attacks': attacks, 'test_parameters': test_parameters}
 
 
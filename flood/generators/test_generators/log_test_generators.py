@@ -15,14 +15,18 @@ def generate_test_eth_get_logs(
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     contract_address: str | None = None,
     block_range_size: int | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
+    if not flood.generators.is_uniform_distribution(distribution):
+        raise Exception('eth_getLogs block ranges are always sampled uniformly')
     n_calls = load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = flood.generators.generate_calls_eth_get_logs(
-        n_calls,
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_eth_get_logs,
+        n_calls=n_calls,
         network=network,
         random_seed=random_seed,
         contract_address=contract_address,
@@ -0,0 +1,153 @@
+"""tests that mix calls of several methods into each attack
+
+a mix test is named by its methods and their weights, for example
+'mix:eth_call=60,eth_getLogs=20,eth_getBalance=10,trace_transaction=10'
+
+each call of a mix test is drawn from a method with probability proportional
+to its weight, so calls of different methods are interleaved throughout each
+attack. calls of each method come from the method's call generator. methods
+can be named by json-rpc method, or by call generator, e.g. eth_get_logs
+
+deep metrics of mix tests are broken down by method, in addition to the
+usual response categories
+"""
+from __future__ import annotations
+
+import typing
+
+import flood
+
+mix_test_prefix = 'mix:'
+
+# methods whose call generators are not named after the json-rpc method
+_mix_method_aliases = {
+    'eth_get_balance': 'eth_get_eth_balance',
+}
+
+
+def is_mix_test_name(test_name: str) -> bool:
+    return test_name.startswith(mix_test_prefix)
+
+
+def parse_mix_weights(test_name: str) -> typing.Mapping[str, float]:
+    """parse mix test name into weights of each method, summing to 1"""
+    if not is_mix_test_name(test_name):
+        raise Exception('mix test name should start with ' + mix_test_prefix)
+
+    weights: dict[str, float] = {}
+    for item in test_name[len(mix_test_prefix) :].split(','):
+        method, _, weight = item.partition('=')
+        method = method.strip()
+        if method == '' or weight == '':
+            raise Exception('mix methods should be given as method=weight')
+        if method in weights:
+            raise Exception('method appears twice in mix: ' + method)
+        weights[method] = float(weight)
+        if weights[method] < 0:
+            raise Exception('mix weights must be nonnegative')
+        get_mix_call_generator(method)
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise Exception('mix weights must have a positive sum')
+    return {method: weight / total for method, weight in weights.items()}
+
+
+def get_mix_call_generator(
+    method: str,
+) -> typing.Callable[..., typing.Sequence[flood.Call]]:
+    """get call generator of method, e.g. eth_getLogs or eth_get_logs"""
+    from . import generic_test_generators
+
+    name = generic_test_generators._camel_case_to_snake_case(method)
+    name = _mix_method_aliases.get(name, name)
+    generator = getattr(flood.generators, 'generate_calls_' + name, None)
+    if generator is None:
+        raise Exception('no call generator for method: ' + method)
+    return generator  # type: ignore
+
+
+def generate_calls_mix(
+    n_calls: int,
+    *,
+    weights: typing.Mapping[str, float],
+    network: str,
+    random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
+) -> typing.Sequence[flood.Call]:
+    """generate calls of methods interleaved at random according to weights
+
+    calls are json-rpc request bodies with ids numbered from 1
+    """
+    import numpy as np
+    import orjson
+
+    from flood.tests.load_tests import load_test_construction
+
+    rng = flood.generators.get_rng(random_seed=random_seed)
+    methods = list(weights.keys())
+    probabilities = np.array([weights[method] for method in methods])
+    choices = rng.choice(
+        len(methods), size=n_calls, p=probabilities / probabilities.sum()
+    )
+
+    # only passed if given, since not every call generator takes one
+    generator_kwargs: dict[str, typing.Any] = {}
+    if distribution is not None:
+        generator_kwargs['distribution'] = distribution
+
+    calls: list[typing.Any] = [None] * n_calls
+    for m, method in enumerate(methods):
+        positions = np.flatnonzero(choices == m).tolist()
+        if len(positions) == 0:
+            continue
+        generate_calls = get_mix_call_generator(method)
+        method_calls = generate_calls(
+            n_calls=len(positions),
+            network=network,
+            random_seed=int(rng.integers(2**32)),
+            **generator_kwargs,
+        )
+        for position, call in zip(positions, method_calls):
+            decoded = load_test_construction._decode_call(call)
+            if not isinstance(decoded, dict) or 'url' in decoded:
+                raise Exception('mix tests only support json-rpc methods')
+            calls[position] = orjson.dumps(dict(decoded, id=position + 1))
+    return calls
+
+
+def generate_mix_test(
+    *,
+    weights: typing.Mapping[str, float],
+    rates: typing.Sequence[int],
+    duration: int | None = None,
+    durations: typing.Sequence[int] | None = None,
+    network: str,
+    vegeta_args: flood.VegetaArgsShorthand | None = None,
+    random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
+) -> typing.Sequence[flood.VegetaAttack]:
+    """generate attacks of calls mixed according to weights
+
+    calls are generated up front rather than lazily, so that deep metrics can
+    tell which method each response belongs to
+    """
+    from flood.tests import load_tests
+
+    n_calls = load_tests.estimate_call_count(
+        rates=rates, duration=duration, durations=durations
+    )
+    calls = generate_calls_mix(
+        n_calls,
+        weights=weights,
+        network=network,
+        random_seed=random_seed,
+        distribution=distribution,
+    )
+    return load_tests.create_load_test(
+        calls=calls,
+        rates=rates,
+        duration=duration,
+        durations=durations,
+        vegeta_args=vegeta_args,
+    )
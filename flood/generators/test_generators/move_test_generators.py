@@ -21,13 +21,16 @@ def generate_test_move_get_account(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_get_account(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_get_account,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
@@ -45,13 +48,16 @@ def generate_test_move_get_account_resources(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_get_account_resources(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_get_account_resources,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
@@ -69,13 +75,16 @@ def generate_test_move_get_transactions(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_get_transactions(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_get_transactions,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
@@ -93,13 +102,16 @@ def generate_test_move_get_ledger_info(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_get_ledger_info(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_get_ledger_info,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
@@ -117,13 +129,16 @@ def generate_test_move_get_block_by_height(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_get_block_by_height(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_get_block_by_height,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
@@ -141,13 +156,16 @@ def generate_test_move_simulate_transaction(
     network: str,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
     random_seed: flood.RandomSeed | None = None,
+    distribution: flood.DistributionShorthand | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
     n_calls = flood.tests.load_tests.estimate_call_count(
         rates=rates, duration=duration, durations=durations
     )
-    calls = generate_calls_move_simulate_transaction(
+    calls = flood.tests.load_tests.generate_lazy_calls(
+        generate_calls_move_simulate_transaction,
         n_calls=n_calls,
         random_seed=random_seed,
+        distribution=distribution,
     )
     return flood.tests.load_tests.create_load_test(
         calls=calls,
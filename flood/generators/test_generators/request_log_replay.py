@@ -0,0 +1,285 @@
+"""replay production json-rpc request logs with their original timing
+
+request logs are newline-delimited json, optionally gzip-compressed. each line
+is a log record with a send time and a json-rpc request, e.g.
+{"timestamp": 1700000000.25, "request": {"method": "eth_call", ...}}
+or a bare json-rpc request that has the send time as one of its fields
+
+logs are ingested once into a call store, in the layout of the call set
+cache, which is memory-mapped when loaded:
+- calls.bin: json request bodies of every call, concatenated
+- offsets.npy: start and end of each call in calls.bin
+- send_times.npy: send time of each call in seconds, sorted
+- log.json: number of calls and of lines that were skipped
+
+calls of batch requests are replayed as individual calls at the send time of
+their batch. calls are renumbered with unique ids. lines that are not json or
+that have no method or send time are skipped
+
+replay attacks send each call at its original offset from the first call,
+optionally sped up, rather than at a constant rate
+"""
+from __future__ import annotations
+
+import typing
+
+import flood
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    from flood.generators.object_generators import payload_templates
+
+    TimestampUnit = typing.Literal['s', 'ms', 'us', 'ns']
+
+    class _RequestLogSummary(typing.TypedDict):
+        source: str
+        n_calls: int
+        n_skipped_lines: int
+
+
+_timestamp_scales = {'s': 1.0, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9}
+
+
+def ingest_request_log(
+    log_path: str,
+    store_dir: str,
+    *,
+    timestamp_key: str = 'timestamp',
+    request_key: str = 'request',
+    timestamp_unit: TimestampUnit = 's',
+) -> str:
+    """ingest ndjson request log into call store, streaming line by line
+
+    timestamps can be numbers in timestamp_unit or iso 8601 strings
+    """
+    import os
+    import shutil
+    import tempfile
+    from array import array
+
+    import numpy as np
+    import orjson
+
+    from . import call_set_cache
+
+    if os.path.exists(store_dir):
+        raise Exception('call store already exists: ' + store_dir)
+    scale = _timestamp_scales[timestamp_unit]
+
+    # write to temporary dir then rename, so stores are never partial
+    parent_dir = os.path.dirname(os.path.abspath(store_dir))
+    os.makedirs(parent_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent_dir, prefix='.tmp_')
+    try:
+        ends = array('q')
+        send_times = array('d')
+        n_skipped = 0
+        position = 0
+        with _open_log(log_path) as log, open(
+            os.path.join(tmp_dir, 'calls.bin'), 'wb'
+        ) as f:
+            for line in log:
+                if line.strip() == b'':
+                    continue
+                parsed = _parse_log_line(
+                    line,
+                    timestamp_key=timestamp_key,
+                    request_key=request_key,
+                    scale=scale,
+                )
+                if parsed is None:
+                    n_skipped += 1
+                    continue
+                send_time, requests = parsed
+                for request in requests:
+                    request['id'] = len(ends) + 1
+                    body = orjson.dumps(request)
+                    f.write(body)
+                    position += len(body)
+                    ends.append(position)
+                    send_times.append(send_time)
+        if len(ends) == 0:
+            raise Exception('no requests found in ' + log_path)
+
+        # logs of several proxies may be out of order
+        offsets = call_set_cache._get_offsets(ends)
+        times = np.frombuffer(send_times, dtype=np.float64)
+        order = np.argsort(times, kind='stable')
+        np.save(os.path.join(tmp_dir, 'offsets.npy'), offsets[:, order])
+        np.save(os.path.join(tmp_dir, 'send_times.npy'), times[order])
+        summary: _RequestLogSummary = {
+            'source': os.path.abspath(log_path),
+            'n_calls': len(ends),
+            'n_skipped_lines': n_skipped,
+        }
+        with open(os.path.join(tmp_dir, 'log.json'), 'wb') as f:
+            f.write(orjson.dumps(summary))
+
+        os.rename(tmp_dir, store_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return store_dir
+
+
+def load_request_log(
+    store_dir: str,
+) -> tuple[payload_templates.PayloadCalls, npt.NDArray[np.float64]]:
+    """load calls and send times of ingested request log"""
+    import mmap
+    import os
+
+    import numpy as np
+
+    from flood.generators.object_generators import payload_templates
+
+    offsets = np.load(os.path.join(store_dir, 'offsets.npy'), mmap_mode='r')
+    send_times = np.load(
+        os.path.join(store_dir, 'send_times.npy'), mmap_mode='r'
+    )
+    with open(os.path.join(store_dir, 'calls.bin'), 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    calls = payload_templates.PayloadCalls(buffer, offsets[0], offsets[1])
+    return calls, send_times
+
+
+def generate_replay_test(
+    *,
+    log_path: str,
+    speeds: typing.Sequence[float] | None = None,
+    store_dir: str | None = None,
+    timestamp_key: str = 'timestamp',
+    request_key: str = 'request',
+    timestamp_unit: TimestampUnit = 's',
+) -> flood.LoadTest:
+    """generate test replaying request log once at each of speeds
+
+    log_path can be an ndjson log or a call store. logs are ingested into
+    store_dir, by default next to the log, unless already ingested there
+    """
+    import os
+
+    from flood.tests import load_tests
+
+    if os.path.isfile(os.path.join(log_path, 'calls.bin')):
+        store_dir = log_path
+    else:
+        if store_dir is None:
+            store_dir = log_path + '.calls'
+        if not os.path.isdir(store_dir):
+            ingest_request_log(
+                log_path,
+                store_dir,
+                timestamp_key=timestamp_key,
+                request_key=request_key,
+                timestamp_unit=timestamp_unit,
+            )
+
+    calls, send_times = load_request_log(store_dir)
+    attacks = load_tests.create_load_test(
+        calls=calls, send_times=send_times, speeds=speeds
+    )
+    return {
+        'attacks': attacks,
+        'test_parameters': {
+            'flood_version': flood.get_flood_version(),
+            'test_name': 'replay:' + log_path,
+            'random_seed': None,
+            'rates': [attack['rate'] for attack in attacks],
+            'durations': [attack['duration'] for attack in attacks],
+            'vegeta_args': None,
+            'network': '',
+            'concurrencies': None,
+            'batch_size': None,
+            'cache_mode': None,
+            'working_set_size': None,
+            'distribution': None,
+            'n_unique_calls': None,
+        },
+    }
+
+
+#
+# # parsing
+#
+
+
+def _open_log(log_path: str) -> typing.IO[bytes]:
+    """open log for streaming, decompressing gzip logs"""
+    import gzip
+
+    with open(log_path, 'rb') as f:
+        is_gzip = f.read(2) == b'\x1f\x8b'
+    if is_gzip:
+        return gzip.open(log_path, 'rb')  # type: ignore
+    else:
+        return open(log_path, 'rb')
+
+
+def _parse_log_line(
+    line: bytes,
+    *,
+    timestamp_key: str,
+    request_key: str,
+    scale: float,
+) -> tuple[float, list[dict[str, typing.Any]]] | None:
+    """parse log line into (send time, requests), or None if invalid"""
+    import orjson
+
+    try:
+        record = orjson.loads(line)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    send_time = _parse_timestamp(record.get(timestamp_key), scale)
+    if send_time is None:
+        return None
+
+    request = record.get(request_key, record)
+    if isinstance(request, dict):
+        items = [request]
+    elif isinstance(request, list):
+        items = request
+    else:
+        return None
+
+    # keep only fields of the request, dropping other fields of the record
+    requests = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(
+            item.get('method'), str
+        ):
+            return None
+        cleaned = {'jsonrpc': item.get('jsonrpc', '2.0'), 'id': None}
+        cleaned['method'] = item['method']
+        if 'params' in item:
+            cleaned['params'] = item['params']
+        requests.append(cleaned)
+    if len(requests) == 0:
+        return None
+    return send_time, requests
+
+
+def _parse_timestamp(value: typing.Any, scale: float) -> float | None:
+    """parse timestamp into seconds"""
+    if isinstance(value, bool):
+        return None
+    elif isinstance(value, (int, float)):
+        return value * scale
+    elif isinstance(value, str):
+        import datetime
+
+        try:
+            parsed = datetime.datetime.fromisoformat(
+                value.replace('Z', '+00:00')
+            )
+        except ValueError:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed.timestamp()
+    else:
+        return None
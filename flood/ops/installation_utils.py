@@ -16,8 +16,10 @@ def get_flood_version() -> str:
 
 
 def get_local_installation() -> flood.FloodInstallation:
-    result = subprocess.check_output(['which', 'vegeta'])
-    vegeta_path = result.decode().rstrip()
+    import shutil
+
+    # vegeta is only required by the vegeta engine
+    vegeta_path = shutil.which('vegeta')
 
     flood_version = flood.__version__
 
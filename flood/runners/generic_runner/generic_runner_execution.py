@@ -103,11 +103,20 @@ def _get_output_dir(output_dir: str | None) -> str:
 def _load_old_test_data(
     test_name: str, nodes: flood.NodesShorthand | None
 ) -> tuple[str, str, flood.LoadTest, flood.NodesShorthand]:
+    import os
+
     path_spec = test_name
+    if os.path.isfile(path_spec):
+        test_dir = os.path.dirname(path_spec)
+    else:
+        test_dir = path_spec
 
     try:
         test_payload = flood.load_single_run_test_payload(path_spec)
-        test = generators.generate_test(**test_payload['test_parameters'])
+        test = generators.generate_test(
+            **test_payload['test_parameters'],
+            cache_dir=generators.get_call_cache_dir(test_dir),
+        )
         test_name = test_payload['name']
     except Exception:
         raise Exception('invalid test path: ' + str(path_spec))
@@ -13,45 +13,146 @@ def run(
     nodes: typing.Sequence[str] | None = None,
     metrics: typing.Sequence[str] | None = None,
     random_seed: int | None = None,
+    distribution: flood.DistributionShorthand | None = None,
     verbose: bool = True,
     rates: typing.Sequence[int] | None = None,
     duration: int | None = None,
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgsShorthand | None = None,
+    engine: flood.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
+    concurrencies: typing.Sequence[int] | None = None,
+    batch_size: int | None = None,
+    cache_mode: flood.CacheMode | None = None,
+    working_set_size: int | None = None,
+    slo_success: float | None = None,
+    slo_p99: float | None = None,
+    sweep_connections: typing.Sequence[int] | None = None,
+    sweep_workers: typing.Sequence[int] | None = None,
+    sweep_keepalives: typing.Sequence[bool] | None = None,
+    n_subscribers: int | None = None,
+    subscriber_ramp: float | None = None,
+    late_threshold: float | None = None,
     output_dir: str | None = None,
+    include_deep_output: typing.Sequence[flood.DeepOutput] | None = None,
+    deep_check: bool = False,
     dry: bool = False,
     debug: bool = False,
     figures: bool = True,
     **kwargs
 ) -> None:
+
+    from flood.tests.load_tests import load_test_construction
+    from flood.tests.load_tests import subscription_tests
+
+    if test_name in subscription_tests.subscription_test_names:
+        if mode is not None or rates is not None or concurrencies is not None:
+            raise Exception('subscription tests do not use rates or modes')
+        _run_subscription_test(
+            test_name=test_name,
+            nodes=nodes,
+            verbose=verbose,
+            duration=duration,
+            n_subscribers=n_subscribers,
+            subscriber_ramp=subscriber_ramp,
+            late_threshold=late_threshold,
+            output_dir=output_dir,
+        )
+        return
+
+    # deep checks need deep metrics
+    if deep_check:
+        if include_deep_output is None:
+            include_deep_output = []
+        if 'metrics' not in include_deep_output:
+            include_deep_output = list(include_deep_output) + ['metrics']
+
+    if mode == 'search':
+        if concurrencies is not None:
+            raise Exception('search mode does not support concurrencies')
+        if cache_mode is not None:
+            raise Exception('search mode does not support cache modes')
+        _run_capacity_search(
+            test_name=test_name,
+            nodes=nodes,
+            random_seed=random_seed,
+            distribution=distribution,
+            verbose=verbose,
+            rates=rates,
+            duration=duration,
+            vegeta_args=vegeta_args,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            batch_size=batch_size,
+            slo_success=slo_success,
+            slo_p99=slo_p99,
+            output_dir=output_dir,
+            figures=figures,
+        )
+        return
+
+    if mode == 'sweep':
+        if concurrencies is not None:
+            raise Exception('sweep mode does not support concurrencies')
+        if cache_mode is not None:
+            raise Exception('sweep mode does not support cache modes')
+        _run_client_sweep(
+            test_name=test_name,
+            nodes=nodes,
+            random_seed=random_seed,
+            distribution=distribution,
+            verbose=verbose,
+            rates=rates,
+            duration=duration,
+            vegeta_args=vegeta_args,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            batch_size=batch_size,
+            sweep_connections=sweep_connections,
+            sweep_workers=sweep_workers,
+            sweep_keepalives=sweep_keepalives,
+            output_dir=output_dir,
+        )
+        return
     
     # Handle rates and durations properly
-    if rates is None:
-        rates = [100]  # default rate
+    # (closed-loop tests use concurrencies in place of rates)
+    if concurrencies is not None:
+        if rates is not None:
+            raise Exception('specify only one of rates or concurrencies')
+        levels = list(concurrencies)
+    else:
+        if rates is None:
+            rates = [100]  # default rate
+        levels = list(rates)
     
     if duration is not None and durations is None:
         # If single duration provided, repeat it for each rate
-        durations = [duration] * len(rates)
+        durations = [duration] * len(levels)
     elif duration is None and durations is None:
         # If no duration provided, use default for each rate
-        durations = [30] * len(rates)
+        durations = [30] * len(levels)
     elif duration is None and durations is not None:
         # durations already provided, use as-is
         pass
     else:
         # Both duration and durations provided, prefer durations
-        durations = [duration] * len(rates)
+        durations = [duration] * len(levels)
     
     # Ensure rates and durations have same length
-    if len(rates) != len(durations):
+    if len(levels) != len(durations):
         if len(durations) == 1:
             # Repeat single duration for all rates
-            durations = durations * len(rates)
-        elif len(rates) == 1:
+            durations = durations * len(levels)
+        elif len(levels) == 1:
             # Repeat single rate for all durations
-            rates = rates * len(durations)
+            levels = levels * len(durations)
         else:
-            raise ValueError(f"Different number of rates ({len(rates)}) vs durations ({len(durations)})")
+            raise ValueError(f"Different number of rates ({len(levels)}) vs durations ({len(durations)})")
+    if concurrencies is not None:
+        concurrencies = levels
+    else:
+        rates = levels
     
     try:
         # Create the test
@@ -61,8 +162,14 @@ def run(
             durations=durations,
             vegeta_args=vegeta_args,
             random_seed=random_seed,
+            distribution=distribution,
             network='',
             flood_version=flood.get_flood_version(),
+            concurrencies=concurrencies,
+            batch_size=batch_size,
+            cache_mode=cache_mode,
+            working_set_size=working_set_size,
+            cache_dir=flood.generators.get_call_cache_dir(output_dir),
         )
         
         # Handle dry run
@@ -110,7 +217,9 @@ def run(
                 if hasattr(first_attack, 'calls') and first_attack.calls:
                     sample_call = first_attack.calls[0]
                 elif isinstance(first_attack, dict) and 'calls' in first_attack:
-                    sample_call = first_attack['calls'][0]
+                    sample_call = load_test_construction._decode_call(
+                        first_attack['calls'][0]
+                    )
                 else:
                     sample_call = None
                 
@@ -131,6 +240,13 @@ def run(
                             total_calls += len(attack['calls'])
                     
                     print(f"   Total calls across all attacks: {total_calls}")
+                    n_unique_calls = test['test_parameters']['n_unique_calls']
+                    if n_unique_calls is not None:
+                        print(f"   Cache mode: {cache_mode}")
+                        print(
+                            "   Distinct calls per attack: "
+                            + str(list(n_unique_calls))
+                        )
                 else:
                     print(f"   No sample calls available")
             else:
@@ -142,6 +258,9 @@ def run(
             tests={'test': test},
             nodes=parsed_nodes,
             verbose=verbose,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            include_deep_output=include_deep_output,
         )
         
         # Save results if output_dir is specified
@@ -171,14 +290,22 @@ def run(
                 
                 if isinstance(node_results, dict):
                     # Extract key metrics
-                    target_rates = node_results.get('target_rate', rates)
+                    target_rates: typing.Sequence[int | None]
+                    if concurrencies is not None:
+                        target_rates = node_results.get('concurrency', levels)
+                    else:
+                        target_rates = node_results.get('target_rate', levels)
                     actual_rates = node_results.get('actual_rate', [])
                     throughput = node_results.get('throughput', [])
                     success_rates = node_results.get('success', [])
                     status_codes = node_results.get('status_codes', [])
                     errors = node_results.get('errors', [])
                     
-                    print(f"{'Target RPS':<12} {'Actual RPS':<12} {'Success RPS':<12} {'Success %':<10} {'Duration':<10}")
+                    if concurrencies is not None:
+                        target_header = 'Concurrency'
+                    else:
+                        target_header = 'Target RPS'
+                    print(f"{target_header:<12} {'Actual RPS':<12} {'Success RPS':<12} {'Success %':<10} {'Duration':<10}")
                     print("-" * 60)
                     
                     for i in range(len(target_rates)):
@@ -216,6 +343,14 @@ def run(
                     print(f"Raw result: {node_results}")
                 print()
             
+            flood.tests.load_tests.print_generator_saturation(results)
+            if deep_check:
+                if metrics is None:
+                    metrics = ['success', 'throughput', 'p90']
+                single_runner_summary._print_deep_inspection(
+                    results=results, metrics=metrics
+                )
+            print()
             print("="*50)
             if all(throughput[i] == 0 for i in range(len(throughput))):
                 print("❌ Load test completed with errors!")
@@ -250,3 +385,300 @@ def run(
         else:
             print(f"Error: {e}")
 
+
+def _run_capacity_search(
+    *,
+    test_name: str,
+    nodes: typing.Sequence[str] | None,
+    random_seed: int | None,
+    distribution: flood.DistributionShorthand | None,
+    verbose: bool,
+    rates: typing.Sequence[int] | None,
+    duration: int | None,
+    vegeta_args: flood.VegetaArgsShorthand | None,
+    engine: flood.LoadTestEngine | None,
+    vegeta_processes: int | None,
+    batch_size: int | None,
+    slo_success: float | None,
+    slo_p99: float | None,
+    output_dir: str | None,
+    figures: bool,
+) -> None:
+    """search for max sustainable rate of each node
+
+    rates, if given, are [initial_rate] or [initial_rate, max_rate]
+    """
+    from flood.tests.load_tests import capacity_search
+
+    if rates is not None and len(rates) not in (1, 2):
+        raise Exception('search mode takes [initial_rate] or [initial, max]')
+    slo = typing.cast(
+        'flood.CapacitySearchSlo', dict(capacity_search.default_search_slo)
+    )
+    if slo_success is not None:
+        slo['min_success'] = slo_success
+    if slo_p99 is not None:
+        slo['max_p99'] = slo_p99
+
+    if nodes is None:
+        nodes = ['localhost:8545']
+    parsed_nodes = flood.user_io.parse_nodes(
+        nodes, verbose=verbose, request_metadata=True
+    )
+
+    if rates is not None:
+        initial_rate: int | None = rates[0]
+        max_rate = rates[1] if len(rates) > 1 else None
+    else:
+        initial_rate = None
+        max_rate = None
+
+    t_run_start = time.time()
+    results = {}
+    summaries = {}
+    for node_name, node in parsed_nodes.items():
+        results[node_name], summaries[node_name] = (
+            capacity_search.run_capacity_search(
+                node=node,
+                test_name=test_name,
+                slo=slo,
+                initial_rate=initial_rate,
+                max_rate=max_rate,
+                duration=duration,
+                random_seed=random_seed,
+                distribution=distribution,
+                vegeta_args=vegeta_args,
+                verbose=verbose,
+                engine=engine,
+                vegeta_processes=vegeta_processes,
+                batch_size=batch_size,
+            )
+        )
+    t_run_end = time.time()
+
+    if output_dir:
+        single_runner_io._save_single_run_results(
+            output_dir=output_dir,
+            nodes=parsed_nodes,
+            results=results,
+            figures=figures,
+            test_name=test_name,
+            t_run_start=t_run_start,
+            t_run_end=t_run_end,
+            capacity_search=summaries,
+        )
+
+    print()
+    print(
+        'SLO: success >= '
+        + str(slo['min_success'])
+        + ', p99 <= '
+        + str(slo['max_p99'])
+    )
+    for node_name, summary in summaries.items():
+        trail = ', '.join(
+            str(probe['rate']) + ('✓' if probe['passed'] else '✗')
+            for probe in summary['probes']
+        )
+        print(node_name + ': capacity = ' + str(summary['capacity']) + ' rps')
+        print('    probes: ' + trail)
+    if output_dir:
+        print()
+        print('Results saved to: ' + output_dir)
+
+
+def _run_client_sweep(
+    *,
+    test_name: str,
+    nodes: typing.Sequence[str] | None,
+    random_seed: int | None,
+    distribution: flood.DistributionShorthand | None,
+    verbose: bool,
+    rates: typing.Sequence[int] | None,
+    duration: int | None,
+    vegeta_args: flood.VegetaArgsShorthand | None,
+    engine: flood.LoadTestEngine | None,
+    vegeta_processes: int | None,
+    batch_size: int | None,
+    sweep_connections: typing.Sequence[int] | None,
+    sweep_workers: typing.Sequence[int] | None,
+    sweep_keepalives: typing.Sequence[bool] | None,
+    output_dir: str | None,
+) -> None:
+    """run the same attack under each client config against each node"""
+    from flood.tests.load_tests import client_sweep
+
+    if rates is None or len(rates) != 1:
+        raise Exception('sweep mode takes a single target rate')
+    rate = rates[0]
+
+    if nodes is None:
+        nodes = ['localhost:8545']
+    parsed_nodes = flood.user_io.parse_nodes(
+        nodes, verbose=verbose, request_metadata=True
+    )
+
+    t_run_start = time.time()
+    results = {}
+    summaries = {}
+    for node_name, node in parsed_nodes.items():
+        results[node_name], summaries[node_name] = (
+            client_sweep.run_client_sweep(
+                node=node,
+                test_name=test_name,
+                rate=rate,
+                duration=duration,
+                max_connections=sweep_connections,
+                workers=sweep_workers,
+                keepalives=sweep_keepalives,
+                random_seed=random_seed,
+                distribution=distribution,
+                vegeta_args=vegeta_args,
+                verbose=verbose,
+                engine=engine,
+                vegeta_processes=vegeta_processes,
+                batch_size=batch_size,
+            )
+        )
+    t_run_end = time.time()
+
+    if output_dir:
+        single_runner_io._save_single_run_results(
+            output_dir=output_dir,
+            nodes=parsed_nodes,
+            results=results,
+            figures=False,
+            test_name=test_name,
+            t_run_start=t_run_start,
+            t_run_end=t_run_end,
+            client_sweep=summaries,
+        )
+
+    print()
+    print('target rate: ' + str(rate) + ' rps')
+    for node_name, summary in summaries.items():
+        print(node_name + ':')
+        for result in summary['results']:
+            metrics = [
+                name + ' = ' + ('-' if value is None else format(value, fmt))
+                for name, value, fmt in [
+                    ('throughput', result['throughput'], '.1f'),
+                    ('p50', result['p50'], '.4f'),
+                    ('p99', result['p99'], '.4f'),
+                ]
+            ]
+            print(
+                '    '
+                + ('✓ ' if result['achieved_rate'] else '✗ ')
+                + client_sweep.format_client_config(result['client_config'])
+                + ': '
+                + ', '.join(metrics)
+            )
+        if summary['best'] is not None:
+            best = client_sweep.format_client_config(summary['best'])
+            print('    best: ' + best)
+        else:
+            print('    best: no client config achieved the target rate')
+    if output_dir:
+        print()
+        print('Results saved to: ' + output_dir)
+
+
+def _run_subscription_test(
+    *,
+    test_name: str,
+    nodes: typing.Sequence[str] | None,
+    verbose: bool,
+    duration: int | None,
+    n_subscribers: int | None,
+    subscriber_ramp: float | None,
+    late_threshold: float | None,
+    output_dir: str | None,
+) -> None:
+    """run eth_subscribe fan-out test against each websocket node"""
+    from flood.tests.load_tests import subscription_tests
+
+    subscription = subscription_tests.subscription_test_names[test_name]
+    if duration is None:
+        duration = 30
+    if n_subscribers is None:
+        n_subscribers = subscription_tests.default_n_subscribers
+    if late_threshold is None:
+        late_threshold = subscription_tests.default_late_threshold
+
+    if nodes is None:
+        nodes = ['ws://localhost:8546']
+    parsed_nodes = flood.user_io.parse_nodes(
+        nodes, verbose=verbose, request_metadata=False
+    )
+    for node in parsed_nodes.values():
+        if node['remote'] is not None:
+            raise Exception('subscription tests do not support remote nodes')
+        if not node['url'].startswith(('ws://', 'wss://')):
+            raise Exception('subscription tests require ws:// or wss:// urls')
+
+    t_run_start = time.time()
+    outputs = {}
+    for node_name, node in parsed_nodes.items():
+        outputs[node_name] = subscription_tests.run_subscription_test(
+            url=node['url'],
+            subscription=subscription,
+            n_subscribers=n_subscribers,
+            duration=duration,
+            ramp_rate=subscriber_ramp,
+            late_threshold=late_threshold,
+            verbose=verbose,
+        )
+    t_run_end = time.time()
+
+    if output_dir:
+        single_runner_io._save_single_run_results(
+            output_dir=output_dir,
+            nodes=parsed_nodes,
+            results={},
+            figures=False,
+            test_name=test_name,
+            t_run_start=t_run_start,
+            t_run_end=t_run_end,
+            subscription_test=outputs,
+        )
+
+    print()
+    for node_name, output in outputs.items():
+        print(node_name + ':')
+        print(
+            '    subscribed: '
+            + str(output['n_subscribed'])
+            + ' / '
+            + str(output['target_subscribers'])
+            + ' (connection errors: '
+            + str(output['n_connection_errors'])
+            + ', subscription errors: '
+            + str(output['n_subscription_errors'])
+            + ', disconnects: '
+            + str(output['n_disconnects'])
+            + ')'
+        )
+        print(
+            '    notifications: '
+            + str(output['n_notifications'])
+            + ', deliveries: '
+            + str(output['n_deliveries'])
+            + ', late: '
+            + str(output['n_late'])
+            + ', dropped: '
+            + str(output['n_dropped'])
+        )
+        delays = [
+            name + ' = ' + ('-' if value is None else '%.4fs' % value)
+            for name, value in [
+                ('p50', output['delay_p50']),
+                ('p90', output['delay_p90']),
+                ('p99', output['delay_p99']),
+                ('max', output['delay_max']),
+            ]
+        ]
+        print('    delivery delay: ' + ', '.join(delays))
+    if output_dir:
+        print()
+        print('Results saved to: ' + output_dir)
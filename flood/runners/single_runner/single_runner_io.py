@@ -69,6 +69,11 @@ def _save_single_run_results(
     test_name: str,
     t_run_start: float,
     t_run_end: float,
+    capacity_search: typing.Mapping[str, flood.CapacitySearchOutput]
+    | None = None,
+    client_sweep: typing.Mapping[str, flood.ClientSweepOutput] | None = None,
+    subscription_test: typing.Mapping[str, flood.SubscriptionTestOutput]
+    | None = None,
 ) -> flood.SingleRunResultsPayload:
     import os
     import sys
@@ -91,6 +96,9 @@ def _save_single_run_results(
         't_run_end': t_run_end,
         'nodes': nodes,
         'results': results,
+        'capacity_search': capacity_search,
+        'client_sweep': client_sweep,
+        'subscription_test': subscription_test,
     }
     with open(path, 'wb') as f:
         f.write(orjson.dumps(payload))
@@ -204,55 +204,67 @@ def _print_single_run_conclusion_text(
     flood.user_io.print_metric_tables(
         results=results, metrics=metrics, indent=4
     )
+    flood.tests.load_tests.print_generator_saturation(results)
 
     # deep inspection tables
     if deep_check:
-        print()
-        print()
-        flood.user_io.print_header('Deep inspection of responses...')
+        _print_deep_inspection(results=results, metrics=metrics)
 
-        # extract data per category
-        deep_results_by_category: typing.MutableMapping[
-            flood.ResponseCategory,
-            typing.MutableMapping[str, flood.LoadTestDeepOutput],
-        ]
-        deep_results_by_category = {}
-        for result_name, result in results.items():
-            deep_metrics = result['deep_metrics']
-            if deep_metrics is not None:
-                for category, category_results in deep_metrics.items():
-                    deep_results_by_category.setdefault(category, {})
-                    deep_results_by_category[category][
-                        result_name
-                    ] = category_results
-            else:
-                raise Exception('deep metrics not available')
 
+def _print_deep_inspection(
+    *,
+    results: typing.Mapping[str, flood.LoadTestOutput],
+    metrics: typing.Sequence[str],
+) -> None:
+    """print deep metrics of each response category and call method"""
+    print()
+    print()
+    flood.user_io.print_header('Deep inspection of responses...')
+
+    # extract data per category
+    deep_results_by_category: typing.MutableMapping[
+        flood.ResponseCategory,
+        typing.MutableMapping[str, flood.LoadTestDeepOutput],
+    ]
+    deep_results_by_category = {}
+    for result_name, result in results.items():
+        deep_metrics = result['deep_metrics']
+        if deep_metrics is not None:
+            for category, category_results in deep_metrics.items():
+                deep_results_by_category.setdefault(category, {})
+                deep_results_by_category[category][
+                    result_name
+                ] = category_results
+        else:
+            raise Exception('deep metrics not available')
+
+    print()
+    flood.user_io.print_metric_tables(
+        results=deep_results_by_category['failed'],
+        metrics=['n_invalid_json_errors'],
+        indent=4,
+    )
+    print()
+    flood.user_io.print_metric_tables(
+        results=deep_results_by_category['failed'],
+        metrics=['n_rpc_errors'],
+        indent=4,
+    )
+
+    metric_names = [m for m in metrics if m not in ['success', 'throughput']]
+    for category, result_category_results in deep_results_by_category.items():
+        if category in ['all', 'successful', 'failed']:
+            category_metric_names = metric_names
+        else:
+            # methods of mixed tests include their errors
+            category_metric_names = metric_names + [
+                'success',
+                'n_rpc_errors',
+            ]
         print()
         flood.user_io.print_metric_tables(
-            results=deep_results_by_category['failed'],
-            metrics=['n_invalid_json_errors'],
-            indent=4,
-        )
-        print()
-        flood.user_io.print_metric_tables(
-            results=deep_results_by_category['failed'],
-            metrics=['n_rpc_errors'],
+            results=result_category_results,
+            metrics=category_metric_names,
+            suffix=', ' + category + ' calls',
             indent=4,
         )
-
-        metric_names = [
-            m for m in metrics if m not in ['success', 'throughput']
-        ]
-        for (
-            category,
-            result_category_results,
-        ) in deep_results_by_category.items():
-            print()
-            flood.user_io.print_metric_tables(
-                results=result_category_results,
-                metrics=metric_names,
-                suffix=', ' + category + ' calls',
-                indent=4,
-            )
-
@@ -10,7 +10,21 @@ if typing.TYPE_CHECKING:
     # # generic types
     #
 
-    Call = typing.Mapping[str, typing.Mapping[str, typing.Any]]
+    # json-rpc call already encoded as a request body
+    EncodedCall = bytes
+
+    Call = typing.Union[
+        typing.Mapping[str, typing.Mapping[str, typing.Any]], EncodedCall
+    ]
+
+    # id: decimal call id, hex: int encoded as 0x string, str: raw string
+    PayloadSlot = typing.Literal['id', 'hex', 'str']
+
+    class PayloadTemplate(typing.TypedDict):
+        method: str
+        # constant bytes between slots, one more than the number of slots
+        pieces: typing.Sequence[bytes]
+        slots: typing.Sequence[PayloadSlot]
 
     MethodCalls = typing.Mapping[str, typing.Sequence[typing.Any]]
 
@@ -46,6 +60,18 @@ if typing.TYPE_CHECKING:
 
     RandomSeed = typing.Union[int, np.random._generator.Generator]
 
+    DistributionName = typing.Literal['uniform', 'zipf', 'recency']
+
+    class Distribution(typing.TypedDict):
+        name: DistributionName
+        # zipf: probability of rank k is proportional to (k + 1) ** -exponent
+        exponent: float | None
+        # recency: probability of rank k halves every half_life ranks
+        half_life: float | None
+
+    # e.g. 'uniform', 'zipf', 'zipf:1.2', 'recency', or 'recency:1000'
+    DistributionShorthand = typing.Union[str, Distribution]
+
     #
     # # latency test types
     #
@@ -80,6 +106,16 @@ if typing.TYPE_CHECKING:
         duration: int
         calls: typing.Sequence[typing.Any]
         vegeta_args: VegetaArgs
+        # closed-loop attacks use a fixed number of workers instead of a rate
+        concurrency: int | None
+        client_config: ClientConfig | None
+        # replay attacks send each call at its offset in seconds from start
+        schedule: typing.Sequence[float] | None
+
+    class ClientConfig(typing.TypedDict):
+        max_connections: int | None
+        workers: int | None
+        keepalive: bool
 
     VegetaArgs = typing.Union[str, None]
     MultiVegetaArgs = typing.Sequence[VegetaArgs]
@@ -93,6 +129,13 @@ if typing.TYPE_CHECKING:
         durations: typing.Sequence[int] | None
         vegeta_args: VegetaArgsShorthand | None
         network: str
+        concurrencies: typing.Sequence[int] | None
+        batch_size: int | None
+        cache_mode: CacheMode | None
+        working_set_size: int | None
+        distribution: DistributionShorthand | None
+        # number of distinct calls in each attack, recorded for cache modes
+        n_unique_calls: typing.Sequence[int] | None
 
     # LoadTest = typing.Sequence[VegetaAttack]
     class LoadTest(typing.TypedDict):
@@ -105,7 +148,13 @@ if typing.TYPE_CHECKING:
         calls: typing.Sequence[typing.Sequence[typing.Any]]
         vegeta_args: typing.Sequence[typing.Any]
 
-    LoadTestMode = typing.Literal['stress', 'spike', 'soak']
+    LoadTestMode = typing.Literal['stress', 'spike', 'soak', 'search', 'sweep']
+
+    # cold: no call repeats within an attack, warm: attacks replay working set
+    CacheMode = typing.Literal['cold', 'warm']
+
+    LoadTestEngine = typing.Literal['vegeta', 'asyncio', 'websocket']
+    LoadTestEngineFunction = typing.Callable[..., 'LoadTestOutputDatum']
 
     LoadTestGenerator = typing.Callable[..., typing.Sequence[VegetaAttack]]
     MultiLoadTestGenerator = typing.Callable[..., typing.Mapping[str, LoadTest]]
@@ -136,11 +185,16 @@ if typing.TYPE_CHECKING:
 
     class LoadTestOutputDatum(typing.TypedDict):
         target_rate: int
+        concurrency: int | None
+        client_config: ClientConfig | None
         actual_rate: float | None
         target_duration: int
         actual_duration: float | None
         requests: int
         throughput: float | None
+        batch_size: int | None
+        call_rate: float | None
+        call_throughput: float | None
         success: float | None
         min: float | None
         mean: float | None
@@ -155,6 +209,20 @@ if typing.TYPE_CHECKING:
         last_request_timestamp: str | None
         last_response_timestamp: str | None
         final_wait_time: float | None
+        p50_corrected: float | None
+        p90_corrected: float | None
+        p95_corrected: float | None
+        p99_corrected: float | None
+        max_corrected: float | None
+        mean_in_flight: float | None
+        max_in_flight: int | None
+        client_cpu_mean: float | None
+        client_cpu_max: float | None
+        client_sockets_max: int | None
+        client_sched_lag_max: float | None
+        generator_saturated: bool
+        saturation_reasons: typing.Sequence[str]
+        latency_histogram: LatencyHistogram | None
         # additional deep keys
         deep_raw_output: str | None
         deep_metrics: typing.Mapping[
@@ -162,9 +230,25 @@ if typing.TYPE_CHECKING:
         ] | None
         deep_rpc_error_pairs: typing.Sequence[ErrorPair] | None
 
-    ResponseCategory = typing.Literal['all', 'successful', 'failed']
+    # tests that mix methods also have a category for each method
+    ResponseCategory = typing.Union[
+        typing.Literal['all', 'successful', 'failed'], str
+    ]
     ErrorPair = tuple[typing.Any, typing.Any]
 
+    class LatencyHistogram(typing.TypedDict):
+        precision_bits: int
+        buckets: typing.Sequence[int]
+        counts: typing.Sequence[int]
+        n: int
+        min: int | None
+        max: int | None
+        sum: int
+
+    class InFlightMetrics(typing.TypedDict):
+        mean_in_flight: float | None
+        max_in_flight: int | None
+
     class LoadTestDeepOutputDatum(typing.TypedDict):
         target_rate: int
         actual_rate: float | None
@@ -186,17 +270,30 @@ if typing.TYPE_CHECKING:
         last_request_timestamp: str | None
         last_response_timestamp: str | None
         final_wait_time: float | None
+        p50_corrected: float | None
+        p90_corrected: float | None
+        p95_corrected: float | None
+        p99_corrected: float | None
+        max_corrected: float | None
         # additional deep keys:
         n_invalid_json_errors: int
         n_rpc_errors: int
+        n_calls: int
+        n_successful_calls: int | None
+        call_throughput: float | None
 
     class LoadTestOutput(typing.TypedDict):
         target_rate: typing.Sequence[int]
+        concurrency: typing.Sequence[int | None]
+        client_config: typing.Sequence[ClientConfig | None]
         actual_rate: typing.Sequence[float | None]
         target_duration: typing.Sequence[int]
         actual_duration: typing.Sequence[float | None]
         requests: typing.Sequence[int]
         throughput: typing.Sequence[float | None]
+        batch_size: typing.Sequence[int | None]
+        call_rate: typing.Sequence[float | None]
+        call_throughput: typing.Sequence[float | None]
         success: typing.Sequence[float | None]
         min: typing.Sequence[float | None]
         mean: typing.Sequence[float | None]
@@ -211,6 +308,20 @@ if typing.TYPE_CHECKING:
         last_request_timestamp: typing.Sequence[str | None]
         last_response_timestamp: typing.Sequence[str | None]
         final_wait_time: typing.Sequence[float | None]
+        p50_corrected: typing.Sequence[float | None]
+        p90_corrected: typing.Sequence[float | None]
+        p95_corrected: typing.Sequence[float | None]
+        p99_corrected: typing.Sequence[float | None]
+        max_corrected: typing.Sequence[float | None]
+        mean_in_flight: typing.Sequence[float | None]
+        max_in_flight: typing.Sequence[int | None]
+        client_cpu_mean: typing.Sequence[float | None]
+        client_cpu_max: typing.Sequence[float | None]
+        client_sockets_max: typing.Sequence[int | None]
+        client_sched_lag_max: typing.Sequence[float | None]
+        generator_saturated: typing.Sequence[bool]
+        saturation_reasons: typing.Sequence[typing.Sequence[str]]
+        latency_histogram: typing.Sequence[LatencyHistogram | None]
         # additional deep keys
         deep_raw_output: typing.Sequence[str | None] | None
         deep_metrics: typing.Mapping[
@@ -241,9 +352,73 @@ if typing.TYPE_CHECKING:
         last_request_timestamp: typing.Sequence[str | None]
         last_response_timestamp: typing.Sequence[str | None]
         final_wait_time: typing.Sequence[float | None]
+        p50_corrected: typing.Sequence[float | None]
+        p90_corrected: typing.Sequence[float | None]
+        p95_corrected: typing.Sequence[float | None]
+        p99_corrected: typing.Sequence[float | None]
+        max_corrected: typing.Sequence[float | None]
         # additional deep keys:
         n_invalid_json_errors: typing.Sequence[int]
         n_rpc_errors: typing.Sequence[int]
+        n_calls: typing.Sequence[int]
+        n_successful_calls: typing.Sequence[int | None]
+        call_throughput: typing.Sequence[float | None]
+
+    class CapacitySearchSlo(typing.TypedDict):
+        min_success: float | None
+        max_p99: float | None
+
+    class CapacitySearchProbe(typing.TypedDict):
+        rate: int
+        passed: bool
+        actual_rate: float | None
+        success: float | None
+        p99: float | None
+
+    class CapacitySearchOutput(typing.TypedDict):
+        capacity: int | None
+        slo: CapacitySearchSlo
+        probes: typing.Sequence[CapacitySearchProbe]
+
+    class ClientSweepResult(typing.TypedDict):
+        client_config: ClientConfig
+        achieved_rate: bool
+        actual_rate: float | None
+        throughput: float | None
+        success: float | None
+        p50: float | None
+        p99: float | None
+
+    class ClientSweepOutput(typing.TypedDict):
+        target_rate: int
+        best: ClientConfig | None
+        results: typing.Sequence[ClientSweepResult]
+
+    SubscriptionType = typing.Literal['newHeads', 'logs']
+
+    class SubscriptionTestOutput(typing.TypedDict):
+        subscription: SubscriptionType
+        target_subscribers: int
+        ramp_rate: float | None
+        duration: float
+        late_threshold: float
+        n_connected: int
+        n_subscribed: int
+        n_connection_errors: int
+        n_subscription_errors: int
+        n_disconnects: int
+        n_notifications: int
+        n_deliveries: int
+        n_late: int
+        n_dropped: int
+        delay_p50: float | None
+        delay_p90: float | None
+        delay_p99: float | None
+        delay_max: float | None
+        errors: typing.Mapping[str, int]
+        connect_latency_histogram: LatencyHistogram
+        subscribe_latency_histogram: LatencyHistogram
+        delay_histogram: LatencyHistogram
 
     RunType = typing.Literal['single_test']  # noqa: F821
     DeepOutput = typing.Literal['raw', 'metrics']
@@ -263,6 +438,9 @@ if typing.TYPE_CHECKING:
         t_run_end: float
         nodes: Nodes
         results: typing.Mapping[str, LoadTestOutput]
+        capacity_search: typing.Mapping[str, CapacitySearchOutput] | None
+        client_sweep: typing.Mapping[str, ClientSweepOutput] | None
+        subscription_test: typing.Mapping[str, SubscriptionTestOutput] | None
 
     # runner outputs
 
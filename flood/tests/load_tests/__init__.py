@@ -1,6 +1,17 @@
+from .asyncio_engine import *
+from .cache_modes import *
+from .capacity_search import *
+from .client_monitor import *
+from .client_sweep import *
 from .deep_utils import *
+from .latency_histograms import *
+from .lazy_calls import *
 from .load_test_construction import *
+from .load_test_engines import *
 from .load_test_plots import *
 from .load_test_reports import *
 from .load_test_runs import *
+from .subscription_tests import *
 from .vegeta import *
+from .vegeta_gob import *
+from .websocket_engine import *
@@ -0,0 +1,558 @@
+"""in-process asyncio load testing engine
+
+an alternative to the vegeta subprocess that requires no external binary:
+- open-loop pacer that sends requests on schedule regardless of responses
+- closed-loop workers that each send a request once their last one completes
+- pool of keep-alive HTTP/1.1 connections shared across in-flight requests
+- per-request timing, fed directly into the standard metrics computation
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+from . import deep_utils
+from . import lazy_calls
+from . import load_test_engines
+
+if typing.TYPE_CHECKING:
+    import asyncio
+    import polars as pl
+
+    class _ConnectionPool(typing.TypedDict):
+        scheme: str
+        host: str
+        hostname: str
+        port: int
+        idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]]
+        semaphore: asyncio.Semaphore | None
+
+    class _ResponseRecords(typing.TypedDict):
+        timestamp: list[int]
+        status_code: list[int]
+        latency: list[int]
+        bytes_out: list[int]
+        bytes_in: list[int]
+        error: list[str | None]
+        response: list[bytes]
+        index: list[int]
+
+
+default_timeout = 30
+default_max_connections: int | None = None
+
+
+def run_asyncio_attack(
+    *,
+    url: str,
+    rate: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    vegeta_args: str | None = None,
+    verbose: bool = False,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    vegeta_processes: int | None = None,
+    concurrency: int | None = None,
+    client_config: spec.ClientConfig | None = None,
+    schedule: typing.Sequence[float] | None = None,
+    max_connections: int | None = default_max_connections,
+    timeout: float = default_timeout,
+) -> spec.LoadTestOutputDatum:
+    import asyncio
+
+    if vegeta_args is not None:
+        raise Exception('vegeta_args not supported by asyncio engine')
+    if vegeta_processes is not None:
+        raise Exception('vegeta_processes not supported by asyncio engine')
+    if client_config is not None:
+        raise Exception('client_config only supported by vegeta engine')
+    if include_deep_output is None:
+        include_deep_output = []
+    if 'raw' in include_deep_output:
+        raise Exception('raw deep output only supported by vegeta engine')
+
+    if verbose:
+        print('running asyncio attack...')
+        if concurrency is not None:
+            print('- concurrency:', concurrency)
+        elif schedule is not None:
+            print('- replaying', len(schedule), 'calls')
+        else:
+            print('- rate:', rate)
+        print('- duration:', duration)
+        print('- max connections:', max_connections)
+
+    if concurrency is not None:
+        records = asyncio.run(
+            _async_closed_loop_attack(
+                url=url,
+                concurrency=concurrency,
+                calls=calls,
+                duration=duration,
+                max_connections=max_connections,
+                timeout=timeout,
+            )
+        )
+    else:
+        records = asyncio.run(
+            _async_attack(
+                url=url,
+                rate=rate,
+                calls=calls,
+                duration=duration,
+                max_connections=max_connections,
+                timeout=timeout,
+                schedule=schedule,
+            )
+        )
+    df = _records_to_dataframe(records, n_calls=len(calls))
+    if schedule is not None:
+        df = deep_utils._add_scheduled_timestamps(df, rate, schedule=schedule)
+
+    return deep_utils._create_report_from_dataframe(
+        df=df,
+        target_rate=rate,
+        target_duration=duration,
+        include_deep_output=include_deep_output,
+        calls=calls,
+        concurrency=concurrency,
+    )
+
+
+def _records_to_dataframe(
+    records: _ResponseRecords, n_calls: int
+) -> pl.DataFrame:
+    """convert response records to same schema as raw vegeta dataframe
+
+    requests are indexed in the order their calls were taken, reusing calls
+    in order, so call_index is the position of the call each request sent
+    """
+    import polars as pl
+
+    df = pl.DataFrame(
+        records,
+        schema={
+            'timestamp': pl.Int64,
+            'status_code': pl.Int64,
+            'latency': pl.Int64,
+            'bytes_out': pl.Int64,
+            'bytes_in': pl.Int64,
+            'error': pl.Utf8,
+            'response': pl.Binary,
+            'index': pl.Int64,
+        },
+    )
+    return df.with_columns(
+        (pl.col('index') % max(1, n_calls)).alias('call_index')
+    )
+
+
+#
+# # pacing
+#
+
+
+async def _async_attack(
+    *,
+    url: str,
+    rate: int,
+    calls: typing.Iterable[typing.Any],
+    duration: int,
+    max_connections: int | None,
+    timeout: float,
+    schedule: typing.Sequence[float] | None = None,
+) -> _ResponseRecords:
+    """send calls at a fixed rate or schedule, independent of response times"""
+    records = _create_records()
+    pool = _create_connection_pool(url=url, max_connections=max_connections)
+
+    async def send(call: typing.Any, index: int) -> None:
+        await _send_call(
+            call=call,
+            index=index,
+            url=url,
+            pool=pool,
+            records=records,
+            timeout=timeout,
+        )
+
+    await _pace_calls(
+        rate=rate,
+        calls=calls,
+        duration=duration,
+        send=send,
+        schedule=schedule,
+    )
+    _close_connection_pool(pool)
+
+    return records
+
+
+async def _async_closed_loop_attack(
+    *,
+    url: str,
+    concurrency: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    max_connections: int | None,
+    timeout: float,
+) -> _ResponseRecords:
+    """keep concurrency requests in flight until duration elapses"""
+    records = _create_records()
+    if len(calls) == 0:
+        return records
+    pool = _create_connection_pool(url=url, max_connections=max_connections)
+
+    async def send(call: typing.Any, index: int) -> None:
+        await _send_call(
+            call=call,
+            index=index,
+            url=url,
+            pool=pool,
+            records=records,
+            timeout=timeout,
+        )
+
+    await _run_closed_loop(
+        concurrency=concurrency, calls=calls, duration=duration, send=send
+    )
+    _close_connection_pool(pool)
+
+    return records
+
+
+async def _pace_calls(
+    *,
+    rate: int,
+    calls: typing.Iterable[typing.Any],
+    duration: int,
+    send: typing.Callable[[typing.Any, int], typing.Awaitable[None]],
+    schedule: typing.Sequence[float] | None = None,
+) -> None:
+    """call send(call, index) at a fixed rate, without awaiting responses
+
+    if schedule is given, call i is sent schedule[i] seconds after the start
+    instead, and every call is sent once
+
+    returns once every sent call has completed
+    """
+    import asyncio
+    import time
+
+    if schedule is not None:
+        import numpy as np
+
+        offsets = np.asarray(schedule, dtype=np.float64)
+        n_calls = len(offsets)
+    else:
+        n_calls = rate * duration
+    calls_iter = iter(calls)
+    in_flight: set[asyncio.Future[None]] = set()
+
+    t_start = time.perf_counter()
+    n_sent = 0
+    while n_sent < n_calls:
+        # launch every request whose scheduled send time has passed
+        elapsed = time.perf_counter() - t_start
+        if schedule is not None:
+            n_due = int(np.searchsorted(offsets, elapsed, side='right'))
+        else:
+            n_due = int(elapsed * rate) + 1
+        while n_sent < min(n_due, n_calls):
+            call = next(calls_iter, None)
+            if call is None:
+                n_calls = n_sent
+                break
+            task = asyncio.ensure_future(send(call, n_sent))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            n_sent += 1
+
+        # sleep until next scheduled send time
+        if schedule is None:
+            t_next = t_start + n_sent / rate
+        elif n_sent < n_calls:
+            t_next = t_start + offsets[n_sent]
+        else:
+            t_next = t_start
+        await asyncio.sleep(max(0.0, t_next - time.perf_counter()))
+
+    if len(in_flight) > 0:
+        await asyncio.gather(*in_flight)
+
+
+async def _run_closed_loop(
+    *,
+    concurrency: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    send: typing.Callable[[typing.Any, int], typing.Awaitable[None]],
+) -> None:
+    """run concurrency workers that each await send(call, index) in a loop
+
+    calls are reused if they run out before the duration has elapsed
+    """
+    import asyncio
+    import itertools
+    import time
+
+    calls_iter = lazy_calls.cycle_calls(calls)
+    indices = itertools.count()
+    t_end = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < t_end:
+            await send(next(calls_iter), next(indices))
+
+    await asyncio.gather(*[worker() for i in range(concurrency)])
+
+
+def _create_records() -> _ResponseRecords:
+    return {
+        'timestamp': [],
+        'status_code': [],
+        'latency': [],
+        'bytes_out': [],
+        'bytes_in': [],
+        'error': [],
+        'response': [],
+        'index': [],
+    }
+
+
+def _add_record(
+    records: _ResponseRecords,
+    *,
+    timestamp: int,
+    status_code: int,
+    latency: int,
+    bytes_out: int,
+    response: bytes,
+    error: str | None,
+    index: int,
+) -> None:
+    records['timestamp'].append(timestamp)
+    records['status_code'].append(status_code)
+    records['latency'].append(latency)
+    records['bytes_out'].append(bytes_out)
+    records['bytes_in'].append(len(response))
+    records['error'].append(error)
+    records['response'].append(response)
+    records['index'].append(index)
+
+
+#
+# # requests
+#
+
+
+async def _send_call(
+    *,
+    call: typing.Any,
+    index: int,
+    url: str,
+    pool: _ConnectionPool,
+    records: _ResponseRecords,
+    timeout: float,
+) -> None:
+    import asyncio
+    import time
+
+    request_data = load_test_engines._get_call_http_request(call, url)
+    method, target_url, header, body = request_data
+    request = _encode_http_request(
+        method=method,
+        url=target_url,
+        host=pool['host'],
+        header=header,
+        body=body,
+    )
+
+    status_code = 0
+    response = b''
+    error = None
+    timestamp = time.time_ns()
+    t_start = time.perf_counter_ns()
+    try:
+        if pool['semaphore'] is not None:
+            async with pool['semaphore']:
+                status_code, response = await asyncio.wait_for(
+                    _exchange(pool, request), timeout=timeout
+                )
+        else:
+            status_code, response = await asyncio.wait_for(
+                _exchange(pool, request), timeout=timeout
+            )
+    except asyncio.TimeoutError:
+        error = 'timeout exceeded after ' + str(timeout) + 's'
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    latency = time.perf_counter_ns() - t_start
+
+    _add_record(
+        records,
+        timestamp=timestamp,
+        status_code=status_code,
+        latency=latency,
+        bytes_out=len(body),
+        response=response,
+        error=error,
+        index=index,
+    )
+
+
+async def _exchange(pool: _ConnectionPool, request: bytes) -> tuple[int, bytes]:
+    """send request over a pooled connection and read its response"""
+    if len(pool['idle']) > 0:
+        reader, writer = pool['idle'].pop()
+    else:
+        reader, writer = await _open_connection(pool)
+
+    try:
+        writer.write(request)
+        await writer.drain()
+        status_code, body, keep_alive = await _read_http_response(reader)
+    except BaseException:
+        writer.close()
+        raise
+
+    if keep_alive:
+        pool['idle'].append((reader, writer))
+    else:
+        writer.close()
+
+    return status_code, body
+
+
+def _encode_http_request(
+    *,
+    method: str,
+    url: str,
+    host: str,
+    header: typing.Mapping[str, typing.Sequence[str]],
+    body: bytes,
+) -> bytes:
+    import urllib.parse
+
+    parsed = urllib.parse.urlsplit(url)
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+
+    lines = [method + ' ' + path + ' HTTP/1.1', 'Host: ' + host]
+    for key, values in header.items():
+        for value in values:
+            lines.append(key + ': ' + value)
+    lines.append('Content-Length: ' + str(len(body)))
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode() + body
+
+
+async def _read_http_response(
+    reader: asyncio.StreamReader,
+) -> tuple[int, bytes, bool]:
+    """read a single response, returning (status_code, body, keep_alive)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('connection closed by server')
+    version, status, *_ = status_line.decode('latin-1').split(' ', 2)
+    status_code = int(status)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        key, _, value = line.decode('latin-1').partition(':')
+        headers[key.strip().lower()] = value.strip()
+
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        keep_alive = connection != 'close'
+    else:
+        keep_alive = connection == 'keep-alive'
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                # consume trailers
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    elif status_code in (204, 304) or 100 <= status_code < 200:
+        body = b''
+    else:
+        body = await reader.read()
+        keep_alive = False
+
+    return status_code, body, keep_alive
+
+
+#
+# # connections
+#
+
+
+def _create_connection_pool(
+    url: str, max_connections: int | None
+) -> _ConnectionPool:
+    import asyncio
+    import urllib.parse
+
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ('http', 'https'):
+        raise Exception('asyncio engine only supports http and https urls')
+    if parsed.hostname is None:
+        raise Exception('could not parse host from url: ' + url)
+    if parsed.port is not None:
+        port = parsed.port
+    elif parsed.scheme == 'https':
+        port = 443
+    else:
+        port = 80
+
+    if max_connections is not None:
+        semaphore: asyncio.Semaphore | None = asyncio.Semaphore(max_connections)
+    else:
+        semaphore = None
+
+    return {
+        'scheme': parsed.scheme,
+        'host': parsed.netloc.rsplit('@', 1)[-1],
+        'hostname': parsed.hostname,
+        'port': port,
+        'idle': [],
+        'semaphore': semaphore,
+    }
+
+
+async def _open_connection(
+    pool: _ConnectionPool,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    import asyncio
+
+    hostname = pool['hostname']
+    if pool['scheme'] == 'https':
+        import ssl
+
+        return await asyncio.open_connection(
+            hostname,
+            pool['port'],
+            ssl=ssl.create_default_context(),
+            server_hostname=hostname,
+        )
+    else:
+        return await asyncio.open_connection(hostname, pool['port'])
+
+
+def _close_connection_pool(pool: _ConnectionPool) -> None:
+    for reader, writer in pool['idle']:
+        writer.close()
+    pool['idle'].clear()
@@ -0,0 +1,180 @@
+"""cache-busting and cache-warm attacks
+
+generated calls draw their parameters at random, so fast or long attacks
+repeat some parameters and their results mix cache hits and misses. a cache
+mode controls repetition explicitly:
+- cold: no call repeats within an attack. each attack takes its calls from a
+  seeded permutation of the distinct calls of the test, continuing where the
+  previous attack stopped, so attacks also avoid calls sent by earlier
+  attacks for as long as there are enough distinct calls. generated calls
+  draw parameters with replacement, so if an attack needs more distinct calls
+  than the test has, more calls are generated from new seeds
+- warm: every attack cycles through the same working set of distinct calls,
+  which the node can cache after their first pass
+
+calls are distinct if they differ in method or parameters, ids are ignored.
+cold attacks are generated eagerly, because finding the distinct calls of a
+test reads every call of the test
+"""
+from __future__ import annotations
+
+import typing
+
+import flood
+from . import lazy_calls
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+
+def convert_to_cache_mode(
+    attacks: typing.Sequence[flood.VegetaAttack],
+    cache_mode: flood.CacheMode,
+    *,
+    working_set_size: int | None = None,
+    random_seed: flood.RandomSeed | None = None,
+    generate_calls: typing.Callable[[int], typing.Iterable[flood.Call]]
+    | None = None,
+) -> tuple[typing.Sequence[flood.VegetaAttack], typing.Sequence[int]]:
+    """convert attacks to cache mode, returning attacks and distinct calls
+
+    returns the number of distinct calls in each converted attack
+
+    in cold mode, generate_calls(random_seed) is used to generate more calls
+    if an attack needs more distinct calls than the attacks contain
+    """
+    if cache_mode == 'cold':
+        if working_set_size is not None:
+            raise Exception('working_set_size only used in warm mode')
+        return _convert_to_cold(
+            attacks, random_seed=random_seed, generate_calls=generate_calls
+        )
+    elif cache_mode == 'warm':
+        if working_set_size is None:
+            raise Exception('warm mode requires working_set_size')
+        if working_set_size < 1:
+            raise Exception('working_set_size must be at least 1')
+        return _convert_to_warm(attacks, working_set_size)
+    else:
+        raise Exception('invalid cache mode: ' + str(cache_mode))
+
+
+def _convert_to_cold(
+    attacks: typing.Sequence[flood.VegetaAttack],
+    *,
+    random_seed: flood.RandomSeed | None,
+    generate_calls: typing.Callable[[int], typing.Iterable[flood.Call]]
+    | None,
+) -> tuple[typing.Sequence[flood.VegetaAttack], typing.Sequence[int]]:
+    rng = flood.generators.get_rng(random_seed=random_seed)
+    pool = get_distinct_calls(
+        call for attack in attacks for call in attack['calls']
+    )
+    n_needed = max((len(attack['calls']) for attack in attacks), default=0)
+    if generate_calls is not None and len(pool) < n_needed:
+        pool = _extend_distinct_calls(pool, n_needed, generate_calls, rng)
+    order = rng.permutation(len(pool))
+    position = 0
+
+    cold_attacks: list[flood.VegetaAttack] = []
+    n_unique_calls = []
+    for attack in attacks:
+        n_calls = len(attack['calls'])
+        if n_calls > len(pool):
+            raise Exception(
+                'cold attack needs '
+                + str(n_calls)
+                + ' distinct calls but test only has '
+                + str(len(pool))
+                + ', lower rate or duration or use warm mode'
+            )
+        if position + n_calls > len(pool):
+            # calls not yet sent cannot fill the attack, start a new pass
+            order = rng.permutation(len(pool))
+            position = 0
+        calls = [pool[i] for i in order[position : position + n_calls]]
+        position += n_calls
+        cold_attacks.append(dict(attack, calls=calls))  # type: ignore
+        n_unique_calls.append(n_calls)
+    return cold_attacks, n_unique_calls
+
+
+def _convert_to_warm(
+    attacks: typing.Sequence[flood.VegetaAttack],
+    working_set_size: int,
+) -> tuple[typing.Sequence[flood.VegetaAttack], typing.Sequence[int]]:
+    working_set = get_distinct_calls(
+        (call for attack in attacks for call in attack['calls']),
+        limit=working_set_size,
+    )
+    if len(working_set) == 0:
+        raise Exception('no calls to form working set')
+
+    def get_chunk(index: int) -> typing.Sequence[flood.Call]:
+        return working_set
+
+    warm_attacks: list[flood.VegetaAttack] = []
+    n_unique_calls = []
+    for attack in attacks:
+        n_calls = len(attack['calls'])
+        calls = lazy_calls.LazyCalls(get_chunk, n_calls, len(working_set))
+        warm_attacks.append(dict(attack, calls=calls))  # type: ignore
+        n_unique_calls.append(min(n_calls, len(working_set)))
+    return warm_attacks, n_unique_calls
+
+
+def get_distinct_calls(
+    calls: typing.Iterable[flood.Call],
+    *,
+    limit: int | None = None,
+) -> list[flood.Call]:
+    """get first occurrence of each distinct call, up to limit calls"""
+    seen: set[bytes] = set()
+    distinct: list[flood.Call] = []
+    for call in calls:
+        if limit is not None and len(distinct) >= limit:
+            break
+        key = _get_call_key(call)
+        if key not in seen:
+            seen.add(key)
+            distinct.append(call)
+    return distinct
+
+
+def _extend_distinct_calls(
+    pool: list[flood.Call],
+    n_needed: int,
+    generate_calls: typing.Callable[[int], typing.Iterable[flood.Call]],
+    rng: np.random.Generator,
+    max_rounds: int = 10,
+) -> list[flood.Call]:
+    """add distinct calls generated from new seeds until pool has n_needed
+
+    stops early if a round adds no calls, since the parameter space of the
+    test is then exhausted
+    """
+    seen = {_get_call_key(call) for call in pool}
+    pool = list(pool)
+    for _ in range(max_rounds):
+        n_before = len(pool)
+        for call in generate_calls(int(rng.integers(2**32))):
+            key = _get_call_key(call)
+            if key not in seen:
+                seen.add(key)
+                pool.append(call)
+        if len(pool) >= n_needed or len(pool) == n_before:
+            break
+    return pool
+
+
+def _get_call_key(call: flood.Call) -> bytes:
+    """get key of call's method and parameters, ignoring its id"""
+    import orjson
+
+    from . import load_test_construction
+
+    decoded = load_test_construction._decode_call(call)
+    if isinstance(decoded, dict) and 'url' not in decoded:
+        return orjson.dumps([decoded.get('method'), decoded.get('params')])
+    else:
+        return orjson.dumps(decoded, option=orjson.OPT_SORT_KEYS)
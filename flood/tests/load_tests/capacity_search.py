@@ -0,0 +1,241 @@
+"""search for the maximum rate that a node can sustain within an SLO
+
+rates are probed adaptively instead of following a fixed schedule:
+1. exponential ramp: double the rate until a probe violates the SLO
+2. bisection: narrow the gap between the highest passing rate and the lowest
+   failing rate until it is within tolerance
+
+calls are generated separately for each probe, so only the calls of the
+current probe are held in memory
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+
+default_search_initial_rate = 16
+default_search_max_rate = 2**17
+default_search_duration = 30
+default_search_tolerance = 0.05
+default_search_max_probes = 20
+default_search_slo: spec.CapacitySearchSlo = {
+    'min_success': 0.999,
+    'max_p99': None,
+}
+
+
+def run_capacity_search(
+    *,
+    node: spec.NodeShorthand,
+    test_name: str,
+    slo: spec.CapacitySearchSlo | None = None,
+    initial_rate: int | None = None,
+    max_rate: int | None = None,
+    duration: int | None = None,
+    tolerance: float = default_search_tolerance,
+    max_probes: int = default_search_max_probes,
+    random_seed: spec.RandomSeed | None = None,
+    distribution: spec.DistributionShorthand | None = None,
+    vegeta_args: spec.VegetaArgsShorthand | None = None,
+    network: str = '',
+    verbose: bool | int = False,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
+    batch_size: int | None = None,
+) -> tuple[spec.LoadTestOutput, spec.CapacitySearchOutput]:
+    """find highest rate that meets slo, probing rates with load tests
+
+    returns (outputs of every probe sorted by rate, capacity search summary)
+    """
+    from flood import user_io
+
+    if slo is None:
+        slo = default_search_slo
+    if initial_rate is None:
+        initial_rate = default_search_initial_rate
+    if max_rate is None:
+        max_rate = default_search_max_rate
+    if duration is None:
+        duration = default_search_duration
+    if initial_rate < 1 or max_rate < initial_rate:
+        raise Exception('must have 1 <= initial_rate <= max_rate')
+    parsed_node = user_io.parse_node(node)
+    probe_duration = duration
+    probe_slo = slo
+    rng = _get_probe_rng(random_seed)
+
+    outputs: dict[int, spec.LoadTestOutput] = {}
+    probes: list[spec.CapacitySearchProbe] = []
+
+    def probe(rate: int) -> bool:
+        output = _run_probe(
+            node=parsed_node,
+            test_name=test_name,
+            rate=rate,
+            duration=probe_duration,
+            random_seed=int(rng.integers(2**32)),
+            distribution=distribution,
+            vegeta_args=vegeta_args,
+            network=network,
+            verbose=verbose,
+            include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            batch_size=batch_size,
+        )
+        outputs[rate] = output
+        passed = meets_slo(output, probe_slo)
+        probes.append(
+            {
+                'rate': rate,
+                'passed': passed,
+                'actual_rate': output['actual_rate'][0],
+                'success': output['success'][0],
+                'p99': output['p99'][0],
+            }
+        )
+        if verbose:
+            user_io.print_timestamped(
+                'Probed rate = '
+                + str(rate)
+                + ' rps: '
+                + ('meets SLO' if passed else 'violates SLO')
+            )
+        return passed
+
+    # ramp up exponentially until slo is violated
+    highest_passing = 0
+    lowest_failing = None
+    rate = initial_rate
+    while len(probes) < max_probes:
+        if probe(rate):
+            highest_passing = rate
+            if rate >= max_rate:
+                break
+            rate = min(rate * 2, max_rate)
+        else:
+            lowest_failing = rate
+            break
+
+    # bisect between highest passing rate and lowest failing rate
+    if lowest_failing is not None:
+        while len(probes) < max_probes:
+            gap = lowest_failing - highest_passing
+            if gap <= max(1, tolerance * highest_passing):
+                break
+            rate = highest_passing + gap // 2
+            if probe(rate):
+                highest_passing = rate
+            else:
+                lowest_failing = rate
+
+    results = _concatenate_outputs([outputs[rate] for rate in sorted(outputs)])
+    summary: spec.CapacitySearchOutput = {
+        'capacity': highest_passing if highest_passing > 0 else None,
+        'slo': slo,
+        'probes': probes,
+    }
+    return results, summary
+
+
+def meets_slo(
+    output: spec.LoadTestOutputDatum | spec.LoadTestOutput,
+    slo: spec.CapacitySearchSlo,
+) -> bool:
+    """return whether the output of a single attack meets the slo"""
+    success = _get_single_value(output['success'])
+    p99 = _get_single_value(output['p99'])
+
+    min_success = slo.get('min_success')
+    if min_success is not None and (success is None or success < min_success):
+        return False
+    max_p99 = slo.get('max_p99')
+    if max_p99 is not None and (p99 is None or p99 > max_p99):
+        return False
+    return True
+
+
+def _get_single_value(
+    value: float | None | typing.Sequence[float | None],
+) -> float | None:
+    """get value of the only attack of an output"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    return value[0]
+
+
+def _run_probe(
+    *,
+    node: spec.Node,
+    test_name: str,
+    rate: int,
+    duration: int,
+    random_seed: int,
+    distribution: spec.DistributionShorthand | None,
+    vegeta_args: spec.VegetaArgsShorthand | None,
+    network: str,
+    verbose: bool | int,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None,
+    engine: spec.LoadTestEngine | None,
+    vegeta_processes: int | None,
+    batch_size: int | None,
+) -> spec.LoadTestOutput:
+    import flood
+    from . import load_test_runs
+
+    test = flood.generate_test(
+        test_name=test_name,
+        rates=[rate],
+        durations=[duration],
+        vegeta_args=vegeta_args,
+        random_seed=random_seed,
+        distribution=distribution,
+        network=network,
+        flood_version=flood.get_flood_version(),
+        batch_size=batch_size,
+    )
+    results = load_test_runs.run_load_tests(
+        node=node,
+        test=test,
+        verbose=verbose,
+        include_deep_output=include_deep_output,
+        engine=engine,
+        vegeta_processes=vegeta_processes,
+    )
+    return results[node['name']]
+
+
+def _get_probe_rng(random_seed: spec.RandomSeed | None) -> np.random.Generator:
+    import numpy as np
+
+    if isinstance(random_seed, np.random.Generator):
+        return random_seed
+    return np.random.default_rng(random_seed)
+
+
+def _concatenate_outputs(
+    outputs: typing.Sequence[spec.LoadTestOutput],
+) -> spec.LoadTestOutput:
+    """concatenate outputs of separate load tests into a single output"""
+    concatenated: dict[str, typing.Any] = {}
+    for key in outputs[0].keys():
+        values = [output[key] for output in outputs]  # type: ignore
+        if any(value is None for value in values):
+            concatenated[key] = None
+        elif isinstance(values[0], dict):
+            # deep metrics are a map of category to output
+            concatenated[key] = {
+                category: _concatenate_outputs(
+                    [value[category] for value in values]
+                )
+                for category in values[0].keys()
+            }
+        else:
+            concatenated[key] = [item for value in values for item in value]
+    return concatenated  # type: ignore
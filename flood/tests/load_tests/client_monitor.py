@@ -0,0 +1,279 @@
+"""monitor the load generator itself, to tell client limits from node limits
+
+while an attack runs, a background thread samples:
+- cpu utilization of flood and its subprocesses (e.g. vegeta), as a
+  fraction of all available cpus
+- number of open sockets of flood and its subprocesses
+- scheduling lag, how late the sampling thread wakes up
+
+cpu and sockets are read from /proc and are None on other platforms.
+in-flight requests are computed exactly from request timings afterwards.
+
+an attack is flagged as generator saturated if any of these signals show
+that the client, rather than the node, limited the load. an open-loop attack
+whose send rate falls short of its target rate is always flagged, since the
+send rate is entirely under the client's control.
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+if typing.TYPE_CHECKING:
+    import threading
+
+    class _ClientMonitor(typing.TypedDict):
+        thread: threading.Thread
+        stop: threading.Event
+        interval: float
+        cpu: list[float]
+        sockets: list[int]
+        lags: list[float]
+
+    class _ClientMonitorMetrics(typing.TypedDict):
+        client_cpu_mean: float | None
+        client_cpu_max: float | None
+        client_sockets_max: int | None
+        client_sched_lag_max: float | None
+
+
+default_monitor_interval = 0.25
+
+# thresholds for flagging an attack as generator saturated
+saturation_cpu = 0.85
+saturation_sched_lag = 0.1
+saturation_sockets = 0.9
+saturation_send_rate = 0.95
+
+
+def start_client_monitor(
+    interval: float = default_monitor_interval,
+) -> _ClientMonitor:
+    """start sampling client resources in a background thread"""
+    import threading
+
+    stop = threading.Event()
+    cpu: list[float] = []
+    sockets: list[int] = []
+    lags: list[float] = []
+    thread = threading.Thread(
+        target=_run_client_monitor,
+        args=(stop, interval, cpu, sockets, lags),
+        daemon=True,
+    )
+    monitor: _ClientMonitor = {
+        'thread': thread,
+        'stop': stop,
+        'interval': interval,
+        'cpu': cpu,
+        'sockets': sockets,
+        'lags': lags,
+    }
+    thread.start()
+    return monitor
+
+
+def stop_client_monitor(monitor: _ClientMonitor) -> _ClientMonitorMetrics:
+    """stop sampling and summarize samples"""
+    monitor['stop'].set()
+    monitor['thread'].join()
+
+    cpu = monitor['cpu']
+    sockets = monitor['sockets']
+    lags = monitor['lags']
+    return {
+        'client_cpu_mean': sum(cpu) / len(cpu) if len(cpu) > 0 else None,
+        'client_cpu_max': max(cpu) if len(cpu) > 0 else None,
+        'client_sockets_max': max(sockets) if len(sockets) > 0 else None,
+        'client_sched_lag_max': max(lags) if len(lags) > 0 else None,
+    }
+
+
+def get_saturation_reasons(
+    output: spec.LoadTestOutputDatum,
+) -> typing.Sequence[str]:
+    """get reasons that the generator limited the load of an attack"""
+    reasons = []
+
+    target_rate = output['target_rate']
+    actual_rate = output['actual_rate']
+    if (
+        output['concurrency'] is None
+        and target_rate > 0
+        and actual_rate is not None
+        and actual_rate < target_rate * saturation_send_rate
+    ):
+        reasons.append(
+            'send rate '
+            + format(actual_rate, '.1f')
+            + ' below target rate '
+            + str(target_rate)
+        )
+
+    cpu = output['client_cpu_mean']
+    if cpu is not None and cpu >= saturation_cpu:
+        reasons.append('client cpu at ' + format(cpu, '.0%'))
+
+    lag = output['client_sched_lag_max']
+    if lag is not None and lag >= saturation_sched_lag:
+        reasons.append('client scheduling lag of ' + format(lag, '.3f') + 's')
+
+    sockets = output['client_sockets_max']
+    max_files = _get_max_open_files()
+    if (
+        sockets is not None
+        and max_files is not None
+        and sockets >= max_files * saturation_sockets
+    ):
+        reasons.append(
+            'client sockets near limit: '
+            + str(sockets)
+            + ' of '
+            + str(max_files)
+        )
+
+    return reasons
+
+
+def print_generator_saturation(
+    results: typing.Mapping[str, spec.LoadTestOutput],
+) -> None:
+    """print attacks whose results were limited by the load generator"""
+    flagged = []
+    for name, result in results.items():
+        saturated = result.get('generator_saturated')
+        if saturated is None:
+            continue
+        for i, is_saturated in enumerate(saturated):
+            if not is_saturated:
+                continue
+            if result['concurrency'][i] is not None:
+                load = 'concurrency ' + str(result['concurrency'][i])
+            else:
+                load = str(result['target_rate'][i]) + ' rps'
+            reasons = ', '.join(result['saturation_reasons'][i])
+            flagged.append(name + ' at ' + load + ': ' + reasons)
+
+    if len(flagged) == 0:
+        return
+    print()
+    print('⚠️  Load generator saturated, these results reflect client limits:')
+    for line in flagged:
+        print('    - ' + line)
+
+
+#
+# # sampling
+#
+
+
+def _run_client_monitor(
+    stop: threading.Event,
+    interval: float,
+    cpu: list[float],
+    sockets: list[int],
+    lags: list[float],
+) -> None:
+    import os
+    import time
+
+    if hasattr(os, 'sched_getaffinity'):
+        n_cpus = len(os.sched_getaffinity(0))
+    else:
+        n_cpus = os.cpu_count() or 1
+    ticks_per_second = _get_clock_ticks()
+
+    t_last = time.perf_counter()
+    last_usage = _read_process_tree_usage()
+    while not stop.wait(interval):
+        t_now = time.perf_counter()
+        lags.append(max(0.0, t_now - t_last - interval))
+
+        usage = _read_process_tree_usage()
+        if usage is not None and last_usage is not None:
+            cpu_seconds = (usage[0] - last_usage[0]) / ticks_per_second
+            utilization = cpu_seconds / (t_now - t_last) / n_cpus
+            cpu.append(min(1.0, max(0.0, utilization)))
+            sockets.append(usage[1])
+        t_last = t_now
+        last_usage = usage
+
+
+def _read_process_tree_usage() -> tuple[int, int] | None:
+    """get (cpu ticks, open sockets) of this process and its descendants"""
+    import os
+
+    # /proc is missing on other platforms, and unreadable when out of fds
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return None
+
+    # map each process to its parent
+    parents = {}
+    stats = {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open('/proc/' + entry + '/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # fields after the parenthesized command name, starting at state
+        fields = stat[stat.rfind(b')') + 2 :].split()
+        pid = int(entry)
+        parents[pid] = int(fields[1])
+        stats[pid] = fields
+
+    root = os.getpid()
+    tree = {root}
+    added = True
+    while added:
+        added = False
+        for pid, parent in parents.items():
+            if parent in tree and pid not in tree:
+                tree.add(pid)
+                added = True
+
+    ticks = 0
+    sockets = 0
+    for pid in tree:
+        pid_stats = stats.get(pid)
+        if pid_stats is None:
+            continue
+        # utime, stime, cutime, cstime
+        ticks += sum(int(field) for field in pid_stats[11:15])
+        try:
+            fds = os.listdir('/proc/' + str(pid) + '/fd')
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                link = os.readlink('/proc/' + str(pid) + '/fd/' + fd)
+            except OSError:
+                continue
+            if link.startswith('socket:'):
+                sockets += 1
+    return ticks, sockets
+
+
+def _get_clock_ticks() -> int:
+    import os
+
+    try:
+        return int(os.sysconf('SC_CLK_TCK'))
+    except (AttributeError, ValueError, OSError):
+        return 100
+
+
+def _get_max_open_files() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return None
+    return soft
@@ -0,0 +1,182 @@
+"""sweep client configurations to separate client limits from node limits
+
+the same attack is run once for every combination of connection limit,
+worker count, and keepalive. a configuration achieves the target rate if its
+throughput is within tolerance of the rate. the best configuration is the one
+that achieves the target rate with the lowest p99 latency.
+
+if no configuration achieves the rate, the client, not the node, may be the
+bottleneck, or the node may be saturated. comparing configurations tells
+these apart.
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+
+default_sweep_max_connections: typing.Sequence[int | None] = [16, 64, 256]
+default_sweep_workers: typing.Sequence[int | None] = [10, 100]
+default_sweep_keepalives: typing.Sequence[bool] = [True, False]
+default_sweep_duration = 30
+default_sweep_tolerance = 0.02
+
+
+def get_client_configs(
+    *,
+    max_connections: typing.Sequence[int | None] | None = None,
+    workers: typing.Sequence[int | None] | None = None,
+    keepalives: typing.Sequence[bool] | None = None,
+) -> typing.Sequence[spec.ClientConfig]:
+    """get every combination of the given client parameters"""
+    import itertools
+
+    if max_connections is None:
+        max_connections = default_sweep_max_connections
+    if workers is None:
+        workers = default_sweep_workers
+    if keepalives is None:
+        keepalives = default_sweep_keepalives
+    return [
+        {
+            'max_connections': n_connections,
+            'workers': n_workers,
+            'keepalive': keepalive,
+        }
+        for keepalive, n_connections, n_workers in itertools.product(
+            keepalives, max_connections, workers
+        )
+    ]
+
+
+def run_client_sweep(
+    *,
+    node: spec.NodeShorthand,
+    test_name: str,
+    rate: int,
+    duration: int | None = None,
+    max_connections: typing.Sequence[int | None] | None = None,
+    workers: typing.Sequence[int | None] | None = None,
+    keepalives: typing.Sequence[bool] | None = None,
+    tolerance: float = default_sweep_tolerance,
+    random_seed: spec.RandomSeed | None = None,
+    distribution: spec.DistributionShorthand | None = None,
+    vegeta_args: spec.VegetaArgsShorthand | None = None,
+    network: str = '',
+    verbose: bool | int = False,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
+    batch_size: int | None = None,
+) -> tuple[spec.LoadTestOutput, spec.ClientSweepOutput]:
+    """run attack at rate under each client config
+
+    returns (outputs of every config, client sweep summary)
+    """
+    import flood
+    from flood import user_io
+    from . import load_test_runs
+
+    if duration is None:
+        duration = default_sweep_duration
+    if rate < 1:
+        raise Exception('client sweep requires a rate of at least 1')
+    node = user_io.parse_node(node)
+    configs = get_client_configs(
+        max_connections=max_connections,
+        workers=workers,
+        keepalives=keepalives,
+    )
+
+    # every config replays the same calls
+    test = flood.generate_test(
+        test_name=test_name,
+        rates=[rate],
+        durations=[duration],
+        vegeta_args=vegeta_args,
+        random_seed=random_seed,
+        distribution=distribution,
+        network=network,
+        flood_version=flood.get_flood_version(),
+        batch_size=batch_size,
+    )
+    attack = test['attacks'][0]
+    sweep_test: spec.LoadTest = {
+        'test_parameters': test['test_parameters'],
+        'attacks': [dict(attack, client_config=config) for config in configs],  # type: ignore # noqa: E501
+    }
+
+    results = load_test_runs.run_load_tests(
+        node=node,
+        test=sweep_test,
+        verbose=verbose,
+        include_deep_output=include_deep_output,
+        engine=engine,
+        vegeta_processes=vegeta_processes,
+    )
+    output = results[node['name']]
+    summary = summarize_client_sweep(output, rate=rate, tolerance=tolerance)
+    return output, summary
+
+
+def summarize_client_sweep(
+    output: spec.LoadTestOutput,
+    *,
+    rate: int,
+    tolerance: float = default_sweep_tolerance,
+) -> spec.ClientSweepOutput:
+    """find config achieving rate with lowest p99, then lowest p50"""
+    sweep_results: list[spec.ClientSweepResult] = []
+    for i, config in enumerate(output['client_config']):
+        if config is None:
+            raise Exception('output is missing client config')
+        throughput = output['throughput'][i]
+        sweep_results.append(
+            {
+                'client_config': config,
+                'achieved_rate': throughput is not None
+                and throughput >= rate * (1 - tolerance),
+                'actual_rate': output['actual_rate'][i],
+                'throughput': throughput,
+                'success': output['success'][i],
+                'p50': output['p50'][i],
+                'p99': output['p99'][i],
+            }
+        )
+
+    candidates = [
+        result
+        for result in sweep_results
+        if result['achieved_rate'] and result['p99'] is not None
+    ]
+    if len(candidates) > 0:
+        best_result = min(
+            candidates,
+            key=lambda result: (result['p99'], result['p50'] or 0),
+        )
+        best: spec.ClientConfig | None = best_result['client_config']
+    else:
+        best = None
+
+    return {'target_rate': rate, 'best': best, 'results': sweep_results}
+
+
+def format_client_config(config: spec.ClientConfig) -> str:
+    """format config as short string, e.g. 'connections=64 workers=10'"""
+    if config['max_connections'] is None:
+        connections = 'default'
+    else:
+        connections = str(config['max_connections'])
+    if config['workers'] is None:
+        n_workers = 'default'
+    else:
+        n_workers = str(config['workers'])
+    return (
+        'connections='
+        + connections
+        + ' workers='
+        + n_workers
+        + ' keepalive='
+        + ('on' if config['keepalive'] else 'off')
+    )
@@ -1,11 +1,51 @@
 from __future__ import annotations
 
+import re
 import typing
+
 from ... import spec
+from . import latency_histograms
+from . import vegeta_gob
 
 if typing.TYPE_CHECKING:
+    import gzip
+
+    import numpy as np
+    import numpy.typing as npt
     import polars as pl
 
+    class _StreamingDeepDecoder(typing.TypedDict):
+        decoder: vegeta_gob.VegetaDecoder
+        dataframes: list[pl.DataFrame]
+
+    class _StreamingTimings(typing.TypedDict):
+        target_rate: int
+        t0: int | None
+        corrected: spec.LatencyHistogram
+        origin: int | None
+        deltas: npt.NDArray[np.int64]
+        latency_sum: int
+        first_sent: int | None
+        last_completed: int | None
+
+
+# response classes used while classifying responses
+_response_ok = 0
+_response_invalid_json = 1
+_response_rpc_error = 2
+
+# whole bodies of responses with a scalar or null result, which are valid json
+_scalar_response_pattern = re.compile(
+    rb'\{"jsonrpc":"2\.0","id":(?:\d+|"[^"\\]*"),'
+    rb'"result":(null|true|false|-?\d+|"[^"\\]*")\}\n?'
+)
+
+# integer id of a response, which precedes its result
+_response_id_pattern = re.compile(rb'"id":\s*(\d+)')
+
+# interval at which requests in flight are sampled in streamed output
+_in_flight_sample_ns = 1_000_000
+
 
 def compute_deep_datum(
     raw_output: bytes,
@@ -16,38 +56,38 @@ def compute_deep_datum(
     typing.Mapping[spec.ResponseCategory, spec.LoadTestDeepOutputDatum],
     typing.Sequence[spec.ErrorPair],
 ]:
-    import polars as pl
-
     # convert to dataframe
     all_df = _convert_raw_vegeta_output_to_dataframe(raw_output)
 
-    # add error columns
-    rpc_error = []
-    invalid_json_error = []
-    for status_code, response in zip(all_df['status_code'], all_df['response']):
-        if status_code == 200:
-            try:
-                import json
-                import base64
-
-                decoded = json.loads(base64.b64decode(response))
-
-                invalid_json_error.append(False)
-                if decoded.get('result') is None:
-                    rpc_error.append(True)
-                else:
-                    rpc_error.append(False)
-
-            except Exception:
-                invalid_json_error.append(True)
-                rpc_error.append(False)
-        else:
-            invalid_json_error.append(False)
-            rpc_error.append(False)
-    all_df = all_df.with_columns(
-        pl.Series('invalid_json_error', invalid_json_error),
-        pl.Series('rpc_error', rpc_error),
+    return compute_deep_datum_from_dataframe(
+        all_df=all_df,
+        target_rate=target_rate,
+        target_duration=target_duration,
+        calls=calls,
     )
+
+
+def compute_deep_datum_from_dataframe(
+    all_df: pl.DataFrame,
+    target_rate: int,
+    target_duration: int,
+    calls: typing.Sequence[typing.Any],
+) -> tuple[
+    typing.Mapping[spec.ResponseCategory, spec.LoadTestDeepOutputDatum],
+    typing.Sequence[spec.ErrorPair],
+]:
+    """compute deep metrics from dataframe of responses, 1 row per response"""
+    import polars as pl
+
+    from . import load_test_construction
+
+    batch_size = load_test_construction.get_batch_size(calls)
+
+    # add error columns
+    if 'rpc_error' not in all_df.columns:
+        all_df = _add_error_columns(all_df)
+    if 'scheduled_timestamp' not in all_df.columns:
+        all_df = _add_scheduled_timestamps(all_df, target_rate)
     all_df = all_df.with_columns(
         (
             (pl.col('status_code') == 200)
@@ -58,7 +98,7 @@ def compute_deep_datum(
 
     # get error pairs
     rpc_error_pairs: typing.Sequence[spec.ErrorPair] = []
-    rpc_error_pairs = _gather_error_pairs(df=all_df, calls=calls)
+    rpc_error_pairs = _gather_error_pairs(df=all_df)
 
     # compute sample metrics
     category_data = {}
@@ -69,88 +109,442 @@ def compute_deep_datum(
     ]
     for category, df in dataframes:
         category_data[category] = _compute_raw_output_sample_metrics(
-            df=df, target_rate=target_rate, target_duration=target_duration
+            df=df,
+            target_rate=target_rate,
+            target_duration=target_duration,
+            batch_size=batch_size,
+        )
+
+    # compute metrics of each method, for tests that mix methods
+    for method, df in _split_by_method(all_df, calls):
+        category_data[method] = _compute_raw_output_sample_metrics(
+            df=df,
+            target_rate=target_rate,
+            target_duration=target_duration,
         )
 
     return category_data, rpc_error_pairs
 
 
-def _convert_raw_vegeta_output_to_dataframe(raw_output: bytes) -> pl.DataFrame:
-    """convert raw vegeta attack output to dataframe, 1 row per response"""
-    import io
-    import subprocess
+def _create_report_from_dataframe(
+    df: pl.DataFrame,
+    target_rate: int,
+    target_duration: int,
+    include_deep_output: typing.Sequence[spec.DeepOutput],
+    calls: typing.Sequence[typing.Any],
+    deep_raw_output: str | None = None,
+    concurrency: int | None = None,
+) -> spec.LoadTestOutputDatum:
+    """create report for engines that produce a dataframe of responses"""
+    metrics = _compute_raw_output_sample_metrics(
+        df=df, target_rate=target_rate, target_duration=target_duration
+    )
+    in_flight = _compute_in_flight_metrics(df)
+
+    deep_metrics = None
+    deep_rpc_error_pairs = None
+    if 'metrics' in include_deep_output:
+        (
+            deep_metrics,
+            deep_rpc_error_pairs,
+        ) = compute_deep_datum_from_dataframe(
+            all_df=df,
+            target_rate=target_rate,
+            target_duration=target_duration,
+            calls=calls,
+        )
+
+    # vegeta counts any 2xx or 3xx response without error as a success
+    if len(df) > 0:
+        import polars as pl
+
+        n_success = len(
+            df.filter(
+                (pl.col('status_code') >= 200)
+                & (pl.col('status_code') < 400)
+                & pl.col('error').is_null()
+            )
+        )
+        success: float | None = n_success / len(df)
+    else:
+        success = metrics['success']
+
+    # client and batch keys are added by load_test_engines.run_attack
+    return {  # type: ignore[typeddict-item]
+        'target_rate': target_rate,
+        'concurrency': concurrency,
+        'actual_rate': metrics['actual_rate'],
+        'target_duration': target_duration,
+        'actual_duration': metrics['actual_duration'],
+        'requests': metrics['requests'],
+        'throughput': metrics['throughput'],
+        'success': success,
+        'min': metrics['min'],
+        'mean': metrics['mean'],
+        'p50': metrics['p50'],
+        'p90': metrics['p90'],
+        'p95': metrics['p95'],
+        'p99': metrics['p99'],
+        'max': metrics['max'],
+        'status_codes': metrics['status_codes'],
+        'errors': metrics['errors'],
+        'first_request_timestamp': metrics['first_request_timestamp'],
+        'last_request_timestamp': metrics['last_request_timestamp'],
+        'last_response_timestamp': metrics['last_response_timestamp'],
+        'final_wait_time': metrics['final_wait_time'],
+        'p50_corrected': metrics['p50_corrected'],
+        'p90_corrected': metrics['p90_corrected'],
+        'p95_corrected': metrics['p95_corrected'],
+        'p99_corrected': metrics['p99_corrected'],
+        'max_corrected': metrics['max_corrected'],
+        'mean_in_flight': in_flight['mean_in_flight'],
+        'max_in_flight': in_flight['max_in_flight'],
+        'latency_histogram': latency_histograms.create_latency_histogram(
+            df['latency']
+        ),
+        'deep_raw_output': deep_raw_output,
+        'deep_metrics': deep_metrics,
+        'deep_rpc_error_pairs': deep_rpc_error_pairs,
+    }
+
+
+def _add_error_columns(df: pl.DataFrame) -> pl.DataFrame:
+    """add invalid_json_error and rpc_error columns to response dataframe
+
+    responses with a scalar result in the canonical envelope are classified
+    by matching their whole body, which guarantees they are valid json. all
+    other responses are parsed as json
+
+    also adds n_successful_calls, the number of calls in each response that
+    returned a result. a batch response is an rpc error if any call failed
+    """
     import polars as pl
 
-    cmd = 'vegeta encode --to csv'
-    report_output = (
-        subprocess.check_output(cmd.split(' '), input=raw_output)
-        .decode()
-        .strip()
+    # non-200 responses are not classified
+    status_codes = df['status_code'].to_list()
+    scan = [_response_ok] * len(df)
+    counts: list[int | None] = [
+        None if status_code == 200 else 0 for status_code in status_codes
+    ]
+    positions = [i for i, code in enumerate(status_codes) if code == 200]
+    responses = df.filter(pl.col('status_code') == 200)['response'].to_list()
+
+    # classify canonical scalar responses by matching bytes
+    unknown_positions = []
+    unknown_responses = []
+    for position, response in zip(positions, responses):
+        match = None
+        if response is not None:
+            match = _scalar_response_pattern.fullmatch(response)
+        if match is None:
+            unknown_positions.append(position)
+            unknown_responses.append(response)
+        elif match.group(1) == b'null':
+            scan[position] = _response_rpc_error
+        else:
+            scan[position] = _response_ok
+
+    # fully parse remaining responses
+    if len(unknown_responses) > 0:
+        parsed = _classify_responses(unknown_responses)
+        for position, (value, count) in zip(unknown_positions, parsed):
+            scan[position] = value
+            counts[position] = count
+
+    scan_column = pl.Series(scan, dtype=pl.Int8)
+    count_column = pl.Series(counts, dtype=pl.Int64)
+    return df.with_columns(
+        (scan_column == _response_invalid_json).alias('invalid_json_error'),
+        (scan_column == _response_rpc_error).alias('rpc_error'),
+        count_column.fill_null(
+            (scan_column == _response_ok).cast(pl.Int64)
+        ).alias('n_successful_calls'),
     )
 
-    buf = io.StringIO()
-    buf.write(report_output)
-    buf.seek(0)
-
-    schema = [
-        'timestamp',
-        'status_code',
-        'latency',
-        'bytes_out',
-        'bytes_in',
-        'error',
-        'response',
-        'name',
-        'index',
-        'method',
-        'url',
-        'response_headers',
+
+def _classify_responses(
+    responses: typing.Sequence[bytes | None],
+    chunk_size: int = 100_000,
+) -> typing.Sequence[tuple[int, int]]:
+    """classify responses by parsing json, in parallel if there are many
+
+    returns (response class, number of successful calls) of each response
+    """
+    if len(responses) <= chunk_size:
+        return _classify_response_chunk(responses)
+
+    import multiprocessing
+
+    chunks = [
+        responses[i : i + chunk_size]
+        for i in range(0, len(responses), chunk_size)
     ]
-    dtypes = {
-        'bytes_in': pl.Int64,
-        'bytes_out': pl.Int64,
-        'error': pl.Utf8,
-        'index': pl.Int64,
-        'latency': pl.Int64,
-        'method': pl.Utf8,
-        'name': pl.Utf8,
-        'response': pl.Utf8,
-        'response_headers': pl.Utf8,
-        'status_code': pl.Int64,
-        'timestamp': pl.Int64,
-        'url': pl.Utf8,
-    }
-    return pl.read_csv(buf, new_columns=schema, has_header=False, dtypes=dtypes)
+    with multiprocessing.Pool() as pool:
+        results = pool.map(_classify_response_chunk, chunks)
+    return [value for result in results for value in result]
 
 
-def _gather_error_pairs(
-    df: pl.DataFrame, calls: typing.Sequence[typing.Any]
-) -> typing.Sequence[spec.ErrorPair]:
+def _classify_response_chunk(
+    responses: typing.Sequence[bytes | None],
+) -> list[tuple[int, int]]:
+    """classify json-rpc responses by parsing each one"""
+    import orjson
+
+    classes = []
+    for response in responses:
+        try:
+            decoded = orjson.loads(response or b'')
+        except orjson.JSONDecodeError:
+            classes.append((_response_invalid_json, 0))
+            continue
+        if isinstance(decoded, list):
+            n_successful = sum(
+                1
+                for item in decoded
+                if isinstance(item, dict) and item.get('result') is not None
+            )
+            if len(decoded) > 0 and n_successful == len(decoded):
+                classes.append((_response_ok, n_successful))
+            else:
+                classes.append((_response_rpc_error, n_successful))
+        elif isinstance(decoded, dict) and decoded.get('result') is None:
+            classes.append((_response_rpc_error, 0))
+        else:
+            classes.append((_response_ok, 1))
+    return classes
+
+
+#
+# # streaming
+#
+
+
+def _start_streaming_deep_decoder() -> _StreamingDeepDecoder:
+    """start decoding raw vegeta output that will be fed in chunks
+
+    rows are classified as they are decoded and response bodies are only
+    retained for rpc errors, so memory does not grow with response sizes.
+    json-rpc ids are kept in a response_id column, to match responses to calls
+    """
+    return {'decoder': vegeta_gob.create_vegeta_decoder(), 'dataframes': []}
+
+
+def _feed_streaming_deep_decoder(
+    decoder: _StreamingDeepDecoder, chunk: bytes
+) -> None:
+    columns = vegeta_gob.feed_vegeta_decoder(decoder['decoder'], chunk)
+    _add_streaming_deep_columns(decoder, columns)
+
+
+def _add_streaming_deep_columns(
+    decoder: _StreamingDeepDecoder, columns: vegeta_gob.VegetaColumns
+) -> None:
+    """add rows that were already decoded from raw vegeta output"""
     import polars as pl
 
-    calls_by_id = {}
-    for call in calls:
-        call_id = call.get('id')
-        if call_id is None:
-            raise Exception('id not specified for call')
-        elif call_id in calls_by_id:
-            raise Exception('duplicate call for id')
-        calls_by_id[call_id] = call
+    if len(columns['index']) == 0:
+        return
+    df = vegeta_gob.vegeta_columns_to_dataframe(columns)
+    df = _add_response_id_column(_add_error_columns(df))
+    df = df.with_columns(
+        pl.when(pl.col('rpc_error')).then(pl.col('response')).otherwise(None)
+    )
+    decoder['dataframes'].append(df)
+
+
+def _finish_streaming_deep_decoder(
+    decoder: _StreamingDeepDecoder,
+) -> pl.DataFrame:
+    """return dataframe of all decoded rows, 1 row per response"""
+    import polars as pl
+
+    if len(decoder['decoder']['buffer']) > 0:
+        raise Exception('raw vegeta output ends with a truncated result')
+    if len(decoder['dataframes']) > 0:
+        return pl.concat(decoder['dataframes'])
+    else:
+        empty = vegeta_gob.vegeta_columns_to_dataframe(
+            vegeta_gob._create_columns()
+        )
+        return _add_response_id_column(_add_error_columns(empty))
+
+
+def _add_response_id_column(df: pl.DataFrame) -> pl.DataFrame:
+    """add response_id column, the integer json-rpc id of each response"""
+    import polars as pl
+
+    response_ids = _get_response_ids(df['response'].to_list())
+    return df.with_columns(
+        pl.Series('response_id', response_ids, dtype=pl.Int64)
+    )
+
+
+def _get_response_ids(
+    responses: typing.Sequence[bytes | None],
+) -> list[int | None]:
+    """get integer json-rpc id of each response, or None if it has none"""
+    response_ids: list[int | None] = []
+    for response in responses:
+        match = _response_id_pattern.search(response) if response else None
+        if match is not None:
+            response_ids.append(int(match.group(1)))
+        else:
+            response_ids.append(None)
+    return response_ids
+
+
+def _convert_raw_vegeta_output_to_dataframe(raw_output: bytes) -> pl.DataFrame:
+    """convert raw vegeta attack output to dataframe, 1 row per response"""
+    return vegeta_gob.decode_vegeta_results(raw_output)
+
+
+def _gather_error_pairs(df: pl.DataFrame) -> typing.Sequence[spec.ErrorPair]:
+    """gather responses that are rpc errors
+
+    requests are not paired with responses, since engines may renumber the
+    ids of calls when sending them
+    """
+    import base64
+    import polars as pl
 
     responses = df.filter(pl.col('rpc_error'))['response']
 
+    # responses are stored as base64 to keep results json-serializable
     pairs = []
     for response in responses:
-        pairs.append((None, response))
+        pairs.append((None, base64.b64encode(response).decode()))
 
     return pairs
 
 
+def _split_by_method(
+    df: pl.DataFrame, calls: typing.Sequence[typing.Any]
+) -> typing.Sequence[tuple[str, pl.DataFrame]]:
+    """split responses by method of their call, if calls mix methods
+
+    engines that record which call each request sent add a call_index column.
+    otherwise responses are matched to calls by json-rpc id, since vegeta
+    numbers requests independently of the order it reads targets in
+    """
+    import numpy as np
+    import polars as pl
+
+    methods = _get_call_methods(calls)
+    if methods is None or len(set(methods)) < 2:
+        return []
+    call_index: npt.NDArray[np.int64] | None
+    if 'call_index' in df.columns:
+        call_index = df['call_index'].to_numpy()
+    else:
+        call_index = _get_call_index_by_id(df, calls)
+    if call_index is None:
+        return []
+
+    names, codes = np.unique(methods, return_inverse=True)
+    row_codes = codes[call_index]
+    return [
+        (str(name), df.filter(pl.Series(row_codes == code)))
+        for code, name in enumerate(names)
+    ]
+
+
+def _get_call_index_by_id(
+    df: pl.DataFrame, calls: typing.Sequence[typing.Any]
+) -> npt.NDArray[np.int64] | None:
+    """get index of the call of each response, matched by json-rpc id
+
+    ids are read from the response_id column of streamed output, whose
+    response bodies are dropped, or else from the responses themselves.
+    responses without a matching id, such as failed requests, fall back to
+    their request index. returns None if call ids are not unique
+    """
+    import numpy as np
+
+    call_ids = _get_call_ids(calls)
+    if call_ids is None:
+        return None
+    position_by_id = {call_id: i for i, call_id in enumerate(call_ids)}
+    if len(position_by_id) < len(call_ids) or 'index' not in df.columns:
+        return None
+
+    if 'response_id' in df.columns:
+        response_ids = df['response_id'].to_list()
+    else:
+        response_ids = _get_response_ids(df['response'].to_list())
+    fallback = df['index'].to_numpy() % len(calls)
+    call_index = np.empty(len(df), dtype=np.int64)
+    for i, response_id in enumerate(response_ids):
+        if response_id is not None:
+            position = position_by_id.get(response_id)
+        else:
+            position = None
+        if position is not None:
+            call_index[i] = position
+        else:
+            call_index[i] = fallback[i]
+    return call_index
+
+
+def _get_call_ids(
+    calls: typing.Sequence[typing.Any],
+) -> typing.Sequence[int] | None:
+    """get integer json-rpc id of each call, or None if not available"""
+    from . import load_test_construction
+
+    ids = []
+    for call in calls:
+        decoded = load_test_construction._decode_call(call)
+        if not isinstance(decoded, dict) or 'url' in decoded:
+            return None
+        call_id = decoded.get('id')
+        if not isinstance(call_id, int):
+            return None
+        ids.append(call_id)
+    return ids
+
+
+def _get_call_methods(
+    calls: typing.Sequence[typing.Any],
+) -> typing.Sequence[str] | None:
+    """get json-rpc method of each call, or None if not available
+
+    lazy calls would have to be regenerated in full, and batches have no
+    single method, so neither is split by method
+    """
+    import re
+
+    from . import lazy_calls
+    from . import load_test_construction
+
+    if isinstance(calls, lazy_calls.LazyCalls) or len(calls) == 0:
+        return None
+    if load_test_construction.get_batch_size(calls) is not None:
+        return None
+
+    pattern = re.compile(rb'"method":"([^"]*)"')
+    methods = []
+    for call in calls:
+        if isinstance(call, bytes):
+            match = pattern.search(call)
+            if match is None:
+                return None
+            methods.append(match.group(1).decode())
+        elif isinstance(call, dict) and 'url' not in call:
+            methods.append(call['method'])
+        else:
+            return None
+    return methods
+
+
 def _compute_raw_output_sample_metrics(
-    df: pl.DataFrame, target_rate: int, target_duration: int
+    df: pl.DataFrame,
+    target_rate: int,
+    target_duration: int,
+    batch_size: int | None = None,
 ) -> spec.LoadTestDeepOutputDatum:
     """convert standard test metrics from vegeta raw output dataframe"""
     if len(df) == 0:
+        corrected = _compute_corrected_latency_metrics(df)
         return {
             'target_rate': target_rate,
             'actual_rate': 0,
@@ -172,8 +566,16 @@ def _compute_raw_output_sample_metrics(
             'last_request_timestamp': None,
             'last_response_timestamp': None,
             'final_wait_time': None,
+            'p50_corrected': corrected['p50_corrected'],
+            'p90_corrected': corrected['p90_corrected'],
+            'p95_corrected': corrected['p95_corrected'],
+            'p99_corrected': corrected['p99_corrected'],
+            'max_corrected': corrected['max_corrected'],
             'n_invalid_json_errors': 0,
             'n_rpc_errors': 0,
+            'n_calls': 0,
+            'n_successful_calls': 0,
+            'call_throughput': None,
         }
 
     import polars as pl
@@ -233,12 +635,259 @@ def _compute_raw_output_sample_metrics(
     )
 
     output: spec.LoadTestDeepOutputDatum = metrics_df.to_dicts()[0]  # type: ignore # noqa: E501
-    output['n_invalid_json_errors'] = int(df['invalid_json_error'].sum())
-    output['n_rpc_errors'] = int(df['rpc_error'].sum())
+    if 'scheduled_timestamp' not in df.columns:
+        df = _add_scheduled_timestamps(df, target_rate)
+    output.update(_compute_corrected_latency_metrics(df))  # type: ignore
+    if 'invalid_json_error' in df.columns:
+        output['n_invalid_json_errors'] = int(df['invalid_json_error'].sum())
+    if 'rpc_error' in df.columns:
+        output['n_rpc_errors'] = int(df['rpc_error'].sum())
+    output['n_calls'] = len(df) * (batch_size if batch_size is not None else 1)
+    if 'n_successful_calls' in df.columns:
+        n_successful_calls = int(df['n_successful_calls'].sum())
+        output['n_successful_calls'] = n_successful_calls
+        output['call_throughput'] = n_successful_calls / total_duration * 1e9
+    else:
+        output['n_successful_calls'] = None
+        output['call_throughput'] = None
 
     return output
 
 
+#
+# # coordinated omission
+#
+
+
+def _start_streaming_timings(target_rate: int) -> _StreamingTimings:
+    """start measuring corrected latencies and requests in flight in chunks
+
+    memory does not grow with the number of requests. the schedule of an
+    open-loop attack starts at the earliest send time implied by the first
+    chunk, which holds the first responses received. requests in flight are
+    counted every millisecond. closed-loop attacks use a target_rate of 0
+    """
+    import numpy as np
+
+    return {
+        'target_rate': target_rate,
+        't0': None,
+        'corrected': latency_histograms.create_latency_histogram([]),
+        'origin': None,
+        'deltas': np.zeros(0, dtype=np.int64),
+        'latency_sum': 0,
+        'first_sent': None,
+        'last_completed': None,
+    }
+
+
+def _add_streaming_timings(
+    timings: _StreamingTimings, columns: vegeta_gob.VegetaColumns
+) -> None:
+    """add timings of rows that were already decoded from raw vegeta output"""
+    import numpy as np
+
+    timestamps = np.frombuffer(columns['timestamp'], dtype=np.int64)
+    latencies = np.frombuffer(columns['latency'], dtype=np.int64)
+    if len(timestamps) == 0:
+        return
+    completed = timestamps + latencies
+
+    # measure latencies from scheduled send times
+    if timings['target_rate'] > 0:
+        indices = np.frombuffer(columns['index'], dtype=np.int64)
+        offsets = (indices * (1e9 / timings['target_rate'])).astype(np.int64)
+        t0 = timings['t0']
+        if t0 is None:
+            t0 = int((timestamps - offsets).min())
+            timings['t0'] = t0
+        corrected = np.maximum(completed - (t0 + offsets), latencies)
+        timings['corrected'] = latency_histograms.merge_latency_histograms(
+            [
+                timings['corrected'],
+                latency_histograms.create_latency_histogram(corrected),
+            ]
+        )
+
+    # count requests in flight at each sample time, as a sample is in flight
+    # from the sample at or after it is sent until the one at or after it ends
+    first_sent = int(timestamps.min())
+    origin = timings['origin']
+    if origin is None:
+        origin = first_sent
+    if first_sent < origin:
+        shift = -(-(origin - first_sent) // _in_flight_sample_ns)
+        origin -= shift * _in_flight_sample_ns
+        timings['deltas'] = np.concatenate(
+            [np.zeros(shift, dtype=np.int64), timings['deltas']]
+        )
+    timings['origin'] = origin
+    starts = -(-(timestamps - origin) // _in_flight_sample_ns)
+    ends = -(-(completed - origin) // _in_flight_sample_ns)
+    n_samples = max(len(timings['deltas']), int(ends.max()) + 1)
+    deltas = np.bincount(starts, minlength=n_samples) - np.bincount(
+        ends, minlength=n_samples
+    )
+    deltas[: len(timings['deltas'])] += timings['deltas']
+    timings['deltas'] = deltas
+
+    timings['latency_sum'] += int(latencies.sum())
+    if timings['first_sent'] is None or first_sent < timings['first_sent']:
+        timings['first_sent'] = first_sent
+    last_completed = int(completed.max())
+    if (
+        timings['last_completed'] is None
+        or last_completed > timings['last_completed']
+    ):
+        timings['last_completed'] = last_completed
+
+
+def _finish_streaming_timings(
+    timings: _StreamingTimings,
+) -> tuple[typing.Mapping[str, float | None], spec.InFlightMetrics]:
+    """return corrected latency metrics and in flight metrics"""
+    corrected = timings['corrected']
+    if corrected['n'] == 0 or corrected['max'] is None:
+        corrected_metrics: typing.Mapping[str, float | None] = {
+            name + '_corrected': None
+            for name in ['p50', 'p90', 'p95', 'p99', 'max']
+        }
+    else:
+        p50, p90, p95, p99 = (
+            latency_histograms.compute_latency_histogram_quantiles(
+                corrected, [0.5, 0.9, 0.95, 0.99]
+            )
+        )
+        corrected_metrics = {
+            'p50_corrected': p50,
+            'p90_corrected': p90,
+            'p95_corrected': p95,
+            'p99_corrected': p99,
+            'max_corrected': corrected['max'] / 1e9,
+        }
+
+    first_sent = timings['first_sent']
+    last_completed = timings['last_completed']
+    if first_sent is None or last_completed is None:
+        in_flight: spec.InFlightMetrics = {
+            'mean_in_flight': None,
+            'max_in_flight': None,
+        }
+    else:
+        # samples can fall between requests, but one was in flight at a time
+        max_in_flight = max(1, int(timings['deltas'].cumsum().max()))
+        span = last_completed - first_sent
+        if span > 0:
+            mean_in_flight: float | None = timings['latency_sum'] / span
+        else:
+            mean_in_flight = None
+        in_flight = {
+            'mean_in_flight': mean_in_flight,
+            'max_in_flight': max_in_flight,
+        }
+    return corrected_metrics, in_flight
+
+
+def _add_scheduled_timestamps(
+    df: pl.DataFrame,
+    target_rate: int,
+    schedule: typing.Sequence[float] | None = None,
+) -> pl.DataFrame:
+    """add column of the time at which each request was meant to be sent
+
+    an open-loop attack schedules request i at t0 + i / rate, or at
+    t0 + schedule[i] if it replays a schedule. t0 is taken as the earliest
+    send time implied by any request, so requests that were sent late by a
+    saturated client are measured from their intended time. closed-loop
+    attacks have no schedule, so their column is null
+    """
+    import polars as pl
+
+    if (
+        (schedule is None and target_rate <= 0)
+        or 'index' not in df.columns
+        or len(df) == 0
+    ):
+        return df.with_columns(
+            pl.lit(None, dtype=pl.Int64).alias('scheduled_timestamp')
+        )
+    if schedule is not None:
+        import numpy as np
+
+        schedule_ns = (np.asarray(schedule) * 1e9).astype(np.int64)
+        offsets: typing.Any = pl.Series(schedule_ns[df['index'].to_numpy()])
+    else:
+        offsets = (pl.col('index') * (1e9 / target_rate)).cast(pl.Int64)
+    t0 = df.select((pl.col('timestamp') - offsets).min()).item()
+    return df.with_columns((t0 + offsets).alias('scheduled_timestamp'))
+
+
+def _compute_corrected_latency_metrics(
+    df: pl.DataFrame,
+) -> typing.Mapping[str, float | None]:
+    """compute latency metrics measured from the scheduled send times
+
+    corrected latencies include time spent waiting to be sent, which plain
+    latencies omit when the client falls behind its schedule
+    """
+    import polars as pl
+
+    names = ['p50', 'p90', 'p95', 'p99', 'max']
+    if 'scheduled_timestamp' not in df.columns:
+        return {name + '_corrected': None for name in names}
+    scheduled = df.filter(pl.col('scheduled_timestamp').is_not_null())
+    if len(scheduled) == 0:
+        return {name + '_corrected': None for name in names}
+
+    completed = pl.col('timestamp') + pl.col('latency')
+    corrected = completed - pl.col('scheduled_timestamp')
+    corrected = (
+        pl.when(corrected > pl.col('latency'))
+        .then(corrected)
+        .otherwise(pl.col('latency'))
+        .alias('corrected')
+    )
+    metrics = scheduled.select(corrected).select(
+        pl.median('corrected').alias('p50_corrected') / 1e9,
+        pl.quantile('corrected', 0.90).alias('p90_corrected') / 1e9,
+        pl.quantile('corrected', 0.95).alias('p95_corrected') / 1e9,
+        pl.quantile('corrected', 0.99).alias('p99_corrected') / 1e9,
+        pl.max('corrected').alias('max_corrected') / 1e9,
+    )
+    return metrics.to_dicts()[0]
+
+
+def _compute_in_flight_metrics(
+    df: pl.DataFrame,
+) -> spec.InFlightMetrics:
+    """compute mean and max number of requests in flight at once
+
+    the mean is the time average over the span of the attack
+    """
+    import polars as pl
+
+    if len(df) == 0:
+        return {'mean_in_flight': None, 'max_in_flight': None}
+
+    # responses at the same instant as a request are counted first
+    starts = df.select(
+        pl.col('timestamp').alias('t'), pl.lit(1, dtype=pl.Int64).alias('d')
+    )
+    ends = df.select(
+        (pl.col('timestamp') + pl.col('latency')).alias('t'),
+        pl.lit(-1, dtype=pl.Int64).alias('d'),
+    )
+    events = pl.concat([starts, ends]).sort(['t', 'd'])
+    max_in_flight = int(events.select(pl.col('d').cumsum().max()).item())
+
+    span = float(events.select(pl.col('t').max() - pl.col('t').min()).item())
+    if span > 0:
+        mean_in_flight: float | None = float(df['latency'].sum()) / span
+    else:
+        mean_in_flight = None
+    return {'mean_in_flight': mean_in_flight, 'max_in_flight': max_in_flight}
+
+
 # def compute_raw_output_metrics(
 #     raw_output: typing.Mapping[str, pl.DataFrame],
 #     results: typing.Mapping[str, spec.LoadTestOutput],
@@ -322,6 +971,28 @@ def encode_raw_vegeta_output(raw_output: bytes) -> str:
     return as_base64
 
 
+def _start_raw_output_spill() -> gzip.GzipFile:
+    """start spilling raw output to a compressed temporary file on disk"""
+    import gzip
+    import tempfile
+
+    return gzip.GzipFile(fileobj=tempfile.TemporaryFile(), mode='wb')
+
+
+def _finish_raw_output_spill(spill: gzip.GzipFile) -> str:
+    """encode spilled raw output to str in encode_raw_vegeta_output format"""
+    import base64
+
+    # spills are always backed by a binary temporary file
+    fileobj = typing.cast(typing.BinaryIO, spill.fileobj)
+    spill.close()
+    fileobj.seek(0)
+    as_base64 = base64.b64encode(fileobj.read()).decode('utf-8')
+    fileobj.close()
+
+    return as_base64
+
+
 def decode_raw_vegeta_output(encoded_output: str) -> bytes:
     """decode raw output from str for use in JSON"""
     import base64
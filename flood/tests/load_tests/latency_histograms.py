@@ -0,0 +1,177 @@
+"""log-bucketed latency histograms, in the style of HDR histograms
+
+latencies (in nanoseconds) are recorded into buckets whose width grows with
+the latency, so every bucket has the same relative precision. with the default
+precision of 7 bits, each bucket spans at most 1/128 of its lower bound.
+
+histograms are stored sparsely as json-friendly dicts. histograms using the
+same precision can be merged exactly, e.g. across shards, remotes, or repeats,
+and quantiles can be recomputed from them without keeping raw output.
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    import polars as pl
+
+
+default_precision_bits = 7
+
+
+def create_latency_histogram(
+    latencies: typing.Sequence[int] | npt.NDArray[np.int64] | pl.Series,
+    *,
+    precision_bits: int = default_precision_bits,
+) -> spec.LatencyHistogram:
+    """create histogram from latencies in nanoseconds"""
+    import numpy as np
+
+    values = np.asarray(latencies, dtype=np.int64)
+    values = np.maximum(values, 0)
+    if len(values) == 0:
+        return {
+            'precision_bits': precision_bits,
+            'buckets': [],
+            'counts': [],
+            'n': 0,
+            'min': None,
+            'max': None,
+            'sum': 0,
+        }
+
+    indices = _get_bucket_indices(values, precision_bits)
+    buckets, counts = np.unique(indices, return_counts=True)
+    return {
+        'precision_bits': precision_bits,
+        'buckets': buckets.tolist(),
+        'counts': counts.tolist(),
+        'n': len(values),
+        'min': int(values.min()),
+        'max': int(values.max()),
+        'sum': int(values.sum()),
+    }
+
+
+def merge_latency_histograms(
+    histograms: typing.Sequence[spec.LatencyHistogram],
+) -> spec.LatencyHistogram:
+    """merge histograms into a single histogram of all their latencies"""
+    if len(histograms) == 0:
+        raise Exception('must specify at least one histogram')
+    precision_bits = histograms[0]['precision_bits']
+    if any(h['precision_bits'] != precision_bits for h in histograms):
+        raise Exception('cannot merge histograms of different precisions')
+
+    totals: typing.MutableMapping[int, int] = {}
+    for histogram in histograms:
+        for bucket, count in zip(histogram['buckets'], histogram['counts']):
+            totals[bucket] = totals.get(bucket, 0) + count
+    buckets = sorted(totals.keys())
+
+    mins = [h['min'] for h in histograms if h['min'] is not None]
+    maxs = [h['max'] for h in histograms if h['max'] is not None]
+    return {
+        'precision_bits': precision_bits,
+        'buckets': buckets,
+        'counts': [totals[bucket] for bucket in buckets],
+        'n': sum(h['n'] for h in histograms),
+        'min': min(mins) if len(mins) > 0 else None,
+        'max': max(maxs) if len(maxs) > 0 else None,
+        'sum': sum(h['sum'] for h in histograms),
+    }
+
+
+def compute_latency_histogram_quantiles(
+    histogram: spec.LatencyHistogram,
+    quantiles: typing.Sequence[float],
+) -> typing.Sequence[float | None]:
+    """compute latency quantiles in seconds, accurate to bucket precision"""
+    import numpy as np
+
+    if histogram['n'] == 0:
+        return [None for quantile in quantiles]
+    assert histogram['min'] is not None and histogram['max'] is not None
+
+    buckets = np.array(histogram['buckets'], dtype=np.int64)
+    cumulative = np.cumsum(histogram['counts'])
+    lower, upper = _get_bucket_bounds(buckets, histogram['precision_bits'])
+    midpoints = (lower + upper - 1) / 2
+
+    output: list[float | None] = []
+    for quantile in quantiles:
+        if quantile < 0 or quantile > 1:
+            raise Exception('quantile must be between 0 and 1')
+        rank = max(1, int(np.ceil(quantile * histogram['n'])))
+        index = int(np.searchsorted(cumulative, rank))
+        value = min(max(midpoints[index], histogram['min']), histogram['max'])
+        output.append(value / 1e9)
+    return output
+
+
+def compute_latency_histogram_metrics(
+    histogram: spec.LatencyHistogram,
+) -> typing.Mapping[str, float | None]:
+    """compute standard latency metrics in seconds from histogram"""
+    p50, p90, p95, p99 = compute_latency_histogram_quantiles(
+        histogram, [0.5, 0.9, 0.95, 0.99]
+    )
+    if histogram['n'] == 0:
+        mean = None
+        latency_min = None
+        latency_max = None
+    else:
+        assert histogram['min'] is not None and histogram['max'] is not None
+        mean = histogram['sum'] / histogram['n'] / 1e9
+        latency_min = histogram['min'] / 1e9
+        latency_max = histogram['max'] / 1e9
+    return {
+        'min': latency_min,
+        'mean': mean,
+        'p50': p50,
+        'p90': p90,
+        'p95': p95,
+        'p99': p99,
+        'max': latency_max,
+    }
+
+
+#
+# # buckets
+#
+
+
+def _get_bucket_indices(
+    values: npt.NDArray[np.int64], precision_bits: int
+) -> npt.NDArray[np.int64]:
+    """get bucket index of each value
+
+    values below 2 ** (precision_bits + 1) get their own bucket. larger values
+    keep only their top precision_bits + 1 bits, which are combined with the
+    number of discarded bits to form the index
+    """
+    import numpy as np
+
+    _, bit_lengths = np.frexp(values.astype(np.float64))
+    shifts = np.maximum(bit_lengths.astype(np.int64) - precision_bits - 1, 0)
+    indices: npt.NDArray[np.int64] = (shifts << precision_bits) + (
+        values >> shifts
+    )
+    return indices
+
+
+def _get_bucket_bounds(
+    buckets: npt.NDArray[np.int64], precision_bits: int
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """get inclusive lower bound and exclusive upper bound of each bucket"""
+    import numpy as np
+
+    shifts = np.maximum((buckets >> precision_bits) - 1, 0)
+    mantissas = buckets - (shifts << precision_bits)
+    lower = mantissas << shifts
+    upper = lower + (np.int64(1) << shifts)
+    return lower, upper
@@ -0,0 +1,214 @@
+"""lazily generated calls, so that long tests run at constant memory
+
+a LazyCalls is a read-only sequence of calls that generates its calls one
+chunk at a time, only when they are accessed. only the most recently used
+chunks are kept in memory. chunk i is always generated from the same seed, so
+iterating a LazyCalls twice yields the same calls. each chunk draws its
+parameters independently, so calls that are distinct within a chunk, such as
+uniform samples, can repeat in other chunks. json-rpc ids are numbered across
+chunks, so they are unique within the whole sequence.
+
+slicing a LazyCalls returns a lazy view sharing the same chunks, which allows
+tests to be partitioned into attacks, and attacks into vegeta shards, without
+generating any calls in advance.
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+if typing.TYPE_CHECKING:
+    import threading
+
+    class _ChunkCache(typing.TypedDict):
+        get_chunk: typing.Callable[[int], typing.Sequence[typing.Any]]
+        chunks: dict[int, typing.Sequence[typing.Any]]
+        lock: threading.Lock
+
+
+# tests with more calls than this are generated lazily
+default_chunk_size = 100_000
+
+# recent chunks kept in memory, at least one per concurrently read view
+_n_cached_chunks = 4
+
+
+class LazyCalls(typing.Sequence[typing.Any]):
+    """sequence of calls generated in chunks as they are accessed"""
+
+    def __init__(
+        self,
+        get_chunk: typing.Callable[[int], typing.Sequence[typing.Any]],
+        n_calls: int,
+        chunk_size: int,
+        *,
+        indices: range | None = None,
+        cache: _ChunkCache | None = None,
+    ) -> None:
+        import threading
+
+        if chunk_size < 1:
+            raise Exception('chunk_size must be at least 1')
+        if indices is None:
+            indices = range(n_calls)
+        if cache is None:
+            cache = {
+                'get_chunk': get_chunk,
+                'chunks': {},
+                'lock': threading.Lock(),
+            }
+        self.n_calls = n_calls
+        self.chunk_size = chunk_size
+        self._indices = indices
+        self._cache = cache
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> typing.Any:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> LazyCalls:
+        ...
+
+    def __getitem__(self, index: int | slice) -> typing.Any:
+        if isinstance(index, slice):
+            return LazyCalls(
+                self._cache['get_chunk'],
+                self.n_calls,
+                self.chunk_size,
+                indices=self._indices[index],
+                cache=self._cache,
+            )
+        i = self._indices[index]
+        chunk = _get_chunk(self._cache, i // self.chunk_size)
+        return chunk[i % self.chunk_size]
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        chunk_index = None
+        chunk: typing.Sequence[typing.Any] = []
+        for i in self._indices:
+            if i // self.chunk_size != chunk_index:
+                chunk_index = i // self.chunk_size
+                chunk = _get_chunk(self._cache, chunk_index)
+            yield chunk[i % self.chunk_size]
+
+    def __repr__(self) -> str:
+        return '<LazyCalls, ' + str(len(self)) + ' calls>'
+
+
+def _get_chunk(cache: _ChunkCache, index: int) -> typing.Sequence[typing.Any]:
+    chunks = cache['chunks']
+    with cache['lock']:
+        chunk = chunks.pop(index, None)
+        if chunk is None:
+            chunk = cache['get_chunk'](index)
+            if len(chunks) >= _n_cached_chunks:
+                del chunks[next(iter(chunks))]
+        # keep chunks ordered by most recent use
+        chunks[index] = chunk
+    return chunk
+
+
+def generate_lazy_calls(
+    generate_calls: typing.Callable[..., typing.Sequence[spec.Call]],
+    *,
+    n_calls: int,
+    random_seed: spec.RandomSeed | None = None,
+    chunk_size: int = default_chunk_size,
+    **generator_kwargs: typing.Any,
+) -> typing.Sequence[spec.Call]:
+    """generate calls lazily using call generator, one chunk at a time
+
+    each chunk is generated as generate_calls(n_calls=..., random_seed=...),
+    with a distinct seed derived from random_seed, and its json-rpc ids are
+    renumbered to continue from the previous chunk. tests of at most chunk_size
+    calls are generated immediately, exactly as by calling generate_calls
+    """
+    if n_calls <= chunk_size:
+        return generate_calls(
+            n_calls=n_calls, random_seed=random_seed, **generator_kwargs
+        )
+
+    # fix the seed now so that regenerated chunks are identical
+    from flood import generators
+
+    rng = generators.get_rng(random_seed=random_seed)
+    seed = int(rng.integers(2**32))
+
+    def get_chunk(index: int) -> typing.Sequence[spec.Call]:
+        start = index * chunk_size
+        calls = generate_calls(
+            n_calls=min(chunk_size, n_calls - start),
+            random_seed=_get_chunk_seed(seed, index),
+            **generator_kwargs,
+        )
+        return _renumber_calls(calls, start_id=start + 1)
+
+    return LazyCalls(get_chunk, n_calls, chunk_size)
+
+
+def batch_lazy_calls(
+    calls: LazyCalls, batch_size: int
+) -> typing.Sequence[typing.Sequence[spec.Call]]:
+    """group lazy calls into json-rpc batches, lazily"""
+    n_batches = -(-len(calls) // batch_size)
+    chunk_size = max(1, calls.chunk_size // batch_size)
+
+    from . import load_test_construction
+
+    def get_chunk(index: int) -> typing.Sequence[typing.Sequence[spec.Call]]:
+        start = index * chunk_size * batch_size
+        end = min(start + chunk_size * batch_size, len(calls))
+        numbered = [
+            dict(load_test_construction._decode_call(call), id=i)
+            for i, call in enumerate(calls[start:end], start=start + 1)
+        ]
+        return [
+            numbered[i : i + batch_size]
+            for i in range(0, len(numbered), batch_size)
+        ]
+
+    return LazyCalls(get_chunk, n_batches, chunk_size)
+
+
+def cycle_calls(
+    calls: typing.Sequence[typing.Any],
+) -> typing.Iterator[typing.Any]:
+    """reuse calls indefinitely, without copying them as itertools.cycle does"""
+    if len(calls) == 0:
+        return
+    while True:
+        yield from calls
+
+
+def _renumber_calls(
+    calls: typing.Sequence[spec.Call], start_id: int
+) -> typing.Sequence[spec.Call]:
+    """number json-rpc calls from start_id, leaving calls without ids as is"""
+    import orjson
+
+    from . import load_test_construction
+
+    renumbered: list[spec.Call] = []
+    for i, call in enumerate(calls, start=start_id):
+        decoded = load_test_construction._decode_call(call)
+        if not isinstance(decoded, dict) or 'id' not in decoded:
+            renumbered.append(call)
+            continue
+        numbered: dict[str, typing.Any] = dict(decoded, id=i)
+        if isinstance(call, bytes):
+            renumbered.append(orjson.dumps(numbered))
+        else:
+            renumbered.append(numbered)
+    return renumbered
+
+
+def _get_chunk_seed(seed: int, index: int) -> int:
+    import numpy as np
+
+    sequence = np.random.SeedSequence([seed, index])
+    return int(sequence.generate_state(1)[0])
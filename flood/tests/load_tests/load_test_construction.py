@@ -3,15 +3,45 @@ from __future__ import annotations
 import typing
 
 import flood
+from . import lazy_calls
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+
+# closed-loop throughput is not known in advance, so calls are generated for
+# this many requests per worker per second and reused if they run out
+closed_loop_calls_per_worker = 100
+
+
+def get_closed_loop_call_rates(
+    concurrencies: typing.Sequence[int],
+) -> typing.Sequence[int]:
+    """get rates used to size the calls of closed-loop attacks"""
+    if any(concurrency < 1 for concurrency in concurrencies):
+        raise Exception('concurrency must be at least 1')
+    return [
+        concurrency * closed_loop_calls_per_worker
+        for concurrency in concurrencies
+    ]
 
 
 def estimate_call_count(
     *,
-    rates: typing.Sequence[int],
+    rates: typing.Sequence[int] | None = None,
     duration: int | None = None,
     durations: typing.Sequence[int] | None = None,
     n_repeats: int | None = None,
+    concurrencies: typing.Sequence[int] | None = None,
 ) -> int:
+    if concurrencies is not None:
+        if rates is not None:
+            raise Exception('specify only one of rates or concurrencies')
+        rates = get_closed_loop_call_rates(concurrencies)
+    elif rates is None:
+        raise Exception('must specify rates or concurrencies')
+
     if duration is not None:
         n_calls = sum(rate * duration for rate in rates)
     elif durations is not None:
@@ -31,15 +61,49 @@ def estimate_call_count(
 
 def create_load_test(
     calls: typing.Sequence[typing.Any],
-    rates: typing.Sequence[int],
+    rates: typing.Sequence[int] | None = None,
     duration: int | None = None,
     durations: typing.Sequence[int] | None = None,
     vegeta_args: flood.VegetaArgs
     | typing.Sequence[flood.VegetaArgs]
     | None = None,
     repeat_calls: bool = False,
+    concurrencies: typing.Sequence[int] | None = None,
+    send_times: typing.Sequence[float] | npt.NDArray[np.float64] | None = None,
+    speeds: typing.Sequence[float] | None = None,
 ) -> typing.Sequence[flood.VegetaAttack]:
+    """create open-loop attacks at rates or closed-loop attacks at concurrencies
+
+    each closed-loop attack keeps a fixed number of requests in flight for its
+    duration, with each worker sending its next call as soon as its previous
+    call completes
+
+    if send_times are given instead, each attack replays every call at its
+    send time in seconds, sped up by one of speeds (default [1])
+    """
     # validate inputs
+    if send_times is not None:
+        if rates is not None or concurrencies is not None:
+            raise Exception(
+                'send_times cannot be combined with rates or concurrencies'
+            )
+        return _create_replay_attacks(
+            calls=calls,
+            send_times=send_times,
+            speeds=speeds,
+            vegeta_args=vegeta_args,
+        )
+    elif speeds is not None:
+        raise Exception('speeds require send_times')
+    if concurrencies is not None:
+        if rates is not None:
+            raise Exception('specify only one of rates or concurrencies')
+        rates = get_closed_loop_call_rates(concurrencies)
+        use_concurrencies: typing.Sequence[int | None] = concurrencies
+    elif rates is None:
+        raise Exception('must specify rates or concurrencies')
+    else:
+        use_concurrencies = [None] * len(rates)
     if len(rates) == 0:
         raise Exception('must specify at least one rate')
 
@@ -61,32 +125,156 @@ def create_load_test(
     else:
         raise Exception('invalid input')
 
-    # partition calls into individual attacks
+    # partition calls into individual attacks, slices of lazy calls are lazy
     if not repeat_calls:
         attacks_calls: typing.MutableSequence[typing.Sequence[flood.Call]] = []
-        calls_iter = iter(calls)
+        start = 0
         for rate, duration in zip(rates, durations):
-            n_attack_calls = rate * duration
-            attack_calls = []
-            for i in range(n_attack_calls):
-                attack_calls.append(next(calls_iter))
-            attacks_calls.append(attack_calls)
+            end = start + rate * duration
+            if end > len(calls):
+                raise Exception('not enough calls for attacks')
+            attacks_calls.append(calls[start:end])
+            start = end
     else:
         attacks_calls = [calls] * len(rates)
     assert len(attacks_calls) == len(rates)
 
     # create load tests
     load_test: list[flood.VegetaAttack] = []
-    for rate, duration, a_calls, attack_kwargs in zip(
-        rates, durations, attacks_calls, use_vegeta_args
+    for rate, duration, a_calls, attack_kwargs, concurrency in zip(
+        rates, durations, attacks_calls, use_vegeta_args, use_concurrencies
     ):
         attack: flood.VegetaAttack = {
-            'rate': rate,
+            'rate': rate if concurrency is None else 0,
             'duration': duration,
             'calls': a_calls,
             'vegeta_args': attack_kwargs,
+            'concurrency': concurrency,
+            'client_config': None,
+            'schedule': None,
         }
         load_test.append(attack)
 
     return load_test
 
+
+def _create_replay_attacks(
+    *,
+    calls: typing.Sequence[typing.Any],
+    send_times: typing.Sequence[float] | npt.NDArray[np.float64],
+    speeds: typing.Sequence[float] | None,
+    vegeta_args: flood.VegetaArgs | typing.Sequence[flood.VegetaArgs] | None,
+) -> typing.Sequence[flood.VegetaAttack]:
+    """create attacks that replay calls at their send times"""
+    import math
+
+    import numpy as np
+
+    if len(send_times) != len(calls):
+        raise Exception('different number of calls vs send_times')
+    if len(calls) == 0:
+        raise Exception('no calls to replay')
+    if speeds is None:
+        speeds = [1.0]
+    if vegeta_args is not None:
+        raise Exception('vegeta_args not supported by replay attacks')
+
+    times = np.asarray(send_times, dtype=np.float64)
+    if np.any(np.diff(times) < 0):
+        raise Exception('send_times must be sorted')
+    offsets = times - times[0]
+
+    attacks: list[flood.VegetaAttack] = []
+    for speed in speeds:
+        if speed <= 0:
+            raise Exception('replay speed must be positive')
+        schedule = offsets / speed
+        duration = max(1, math.ceil(schedule[-1]))
+        attacks.append(
+            {
+                # nominal rate, the schedule sets when each call is sent
+                'rate': max(1, round(len(calls) / duration)),
+                'duration': duration,
+                'calls': calls,
+                'vegeta_args': None,
+                'concurrency': None,
+                'client_config': None,
+                'schedule': schedule,
+            }
+        )
+    return attacks
+
+
+def convert_to_closed_loop(
+    attacks: typing.Sequence[flood.VegetaAttack],
+    concurrencies: typing.Sequence[int],
+) -> typing.Sequence[flood.VegetaAttack]:
+    """convert attacks into closed-loop attacks at concurrencies
+
+    attacks should be generated at get_closed_loop_call_rates(concurrencies)
+    so that each has enough calls for its concurrency
+    """
+    if len(attacks) != len(concurrencies):
+        raise Exception('different number of attacks vs concurrencies')
+    return [
+        dict(attack, rate=0, concurrency=concurrency)  # type: ignore
+        for attack, concurrency in zip(attacks, concurrencies)
+    ]
+
+
+def batch_calls(
+    calls: typing.Sequence[flood.Call], batch_size: int
+) -> typing.Sequence[typing.Sequence[flood.Call]]:
+    """group calls into json-rpc batches of up to batch_size calls
+
+    calls are renumbered so that every call has a unique id, allowing the
+    responses within each batch to be matched to their calls
+    """
+    if batch_size < 1:
+        raise Exception('batch_size must be at least 1')
+    if isinstance(calls, lazy_calls.LazyCalls):
+        return lazy_calls.batch_lazy_calls(calls, batch_size)
+    numbered = [
+        dict(_decode_call(call), id=i) for i, call in enumerate(calls, start=1)
+    ]
+    return [
+        numbered[i : i + batch_size]
+        for i in range(0, len(numbered), batch_size)
+    ]
+
+
+def convert_to_batches(
+    attacks: typing.Sequence[flood.VegetaAttack],
+    batch_size: int,
+) -> typing.Sequence[flood.VegetaAttack]:
+    """convert attacks into attacks that send batches of batch_size calls
+
+    attacks should be generated at batch_size times their rates so that each
+    http request has batch_size calls
+    """
+    return [
+        dict(  # type: ignore
+            attack,
+            rate=attack['rate'] // batch_size,
+            calls=batch_calls(attack['calls'], batch_size),
+        )
+        for attack in attacks
+    ]
+
+
+def get_batch_size(calls: typing.Sequence[typing.Any]) -> int | None:
+    """get number of calls per batch, or None if calls are not batched"""
+    if len(calls) > 0 and isinstance(calls[0], list):
+        return len(calls[0])
+    else:
+        return None
+
+
+def _decode_call(call: typing.Any) -> typing.Any:
+    """get call as a dict, decoding calls rendered as json-rpc bodies"""
+    if isinstance(call, bytes):
+        import orjson
+
+        return orjson.loads(call)
+    else:
+        return call
@@ -0,0 +1,156 @@
+"""pluggable engines for executing individual load test attacks
+
+every engine is a function with the signature of run_vegeta_attack that
+returns a LoadTestOutputDatum
+
+attacks are open-loop at a fixed rate by default. if concurrency is given,
+attacks are instead closed-loop, with concurrency workers that each send their
+next call as soon as their previous call completes. if schedule is given,
+attacks are open-loop but send each call at its own offset from the start
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+
+
+default_engine: spec.LoadTestEngine = 'vegeta'
+
+_default_headers = {'Content-Type': ['application/json']}
+
+
+def get_load_test_engines() -> (
+    typing.Mapping[spec.LoadTestEngine, spec.LoadTestEngineFunction]
+):
+    """get all available load test engines"""
+    from . import asyncio_engine
+    from . import vegeta
+    from . import websocket_engine
+
+    return {
+        'vegeta': vegeta.run_vegeta_attack,
+        'asyncio': asyncio_engine.run_asyncio_attack,
+        'websocket': websocket_engine.run_websocket_attack,
+    }
+
+
+def get_load_test_engine(
+    engine: spec.LoadTestEngine | None = None,
+    url: str | None = None,
+) -> spec.LoadTestEngineFunction:
+    """get particular load test engine
+
+    if no engine is given, websocket urls use the websocket engine and other
+    urls use the default engine
+    """
+    if engine is None:
+        if url is not None and url.startswith(('ws://', 'wss://')):
+            engine = 'websocket'
+        else:
+            engine = default_engine
+    engines = get_load_test_engines()
+    if engine not in engines:
+        raise Exception('unknown engine: ' + str(engine))
+    return engines[engine]
+
+
+def run_attack(
+    *,
+    url: str,
+    rate: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    vegeta_args: str | None = None,
+    verbose: bool = False,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
+    concurrency: int | None = None,
+    client_config: spec.ClientConfig | None = None,
+    schedule: typing.Sequence[float] | None = None,
+) -> spec.LoadTestOutputDatum:
+    """run a single attack using the given engine
+
+    for batched calls, throughput is also reported in rpc calls per second
+
+    attacks with a schedule default to the asyncio engine, since vegeta only
+    sends at constant rates
+
+    client resources are sampled during the attack, and the attack is flagged
+    if the load generator was saturated
+    """
+    from . import client_monitor
+    from . import load_test_construction
+
+    if (
+        schedule is not None
+        and engine is None
+        and not url.startswith(('ws://', 'wss://'))
+    ):
+        engine = 'asyncio'
+    f = get_load_test_engine(engine, url=url)
+    monitor = client_monitor.start_client_monitor()
+    try:
+        output = f(
+            url=url,
+            rate=rate,
+            calls=calls,
+            duration=duration,
+            vegeta_args=vegeta_args,
+            verbose=verbose,
+            include_deep_output=include_deep_output,
+            vegeta_processes=vegeta_processes,
+            concurrency=concurrency,
+            client_config=client_config,
+            schedule=schedule,
+        )
+    finally:
+        client_metrics = client_monitor.stop_client_monitor(monitor)
+    output['client_config'] = client_config
+    output.update(client_metrics)  # type: ignore
+
+    batch_size = load_test_construction.get_batch_size(calls)
+    calls_per_request = batch_size if batch_size is not None else 1
+    output['batch_size'] = batch_size
+    if output['actual_rate'] is not None:
+        output['call_rate'] = output['actual_rate'] * calls_per_request
+    else:
+        output['call_rate'] = None
+    if output['throughput'] is not None:
+        output['call_throughput'] = output['throughput'] * calls_per_request
+    else:
+        output['call_throughput'] = None
+
+    saturation_reasons = client_monitor.get_saturation_reasons(output)
+    output['generator_saturated'] = len(saturation_reasons) > 0
+    output['saturation_reasons'] = saturation_reasons
+    return output
+
+
+def _get_call_http_request(
+    call: typing.Any, url: str
+) -> tuple[str, str, typing.Mapping[str, typing.Sequence[str]], bytes]:
+    """get method, url, headers, and body of the http request for a call
+
+    JSON-RPC calls are POSTed to the node url, and calls already rendered as
+    bytes are POSTed as-is. Calls that are already shaped like vegeta targets
+    (having a url and header, e.g. REST calls) keep their own method, headers,
+    and body, with relative urls joined to the node url.
+    """
+    import orjson
+
+    if isinstance(call, dict) and 'url' in call and 'header' in call:
+        target_url = call['url']
+        if target_url.startswith('/'):
+            target_url = url.rstrip('/') + target_url
+        body = call.get('body')
+        if body is None:
+            body = b''
+        elif isinstance(body, str):
+            body = body.encode()
+        return call.get('method', 'GET'), target_url, call['header'], body
+    elif isinstance(call, bytes):
+        return 'POST', url, _default_headers, call
+    else:
+        return 'POST', url, _default_headers, orjson.dumps(call)
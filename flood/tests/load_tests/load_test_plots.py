@@ -201,6 +201,9 @@ def plot_load_test_result_metrics(
     if colors is None:
         colors = {key: color for key, color in zip(results.keys(), plot_colors)}
 
+    # closed-loop results are plotted against concurrency instead of rate
+    closed_loop = _is_closed_loop(results)
+
     for name, result in results.items():
         # determine colors
         result_colors = colors.get(name)
@@ -229,7 +232,7 @@ def plot_load_test_result_metrics(
             if len(metrics) > 1:
                 label += ' ' + metric
             plt.plot(
-                result['target_rate'],
+                result['concurrency'] if closed_loop else result['target_rate'],  # type: ignore # noqa: E501
                 result[metric],  # type: ignore
                 '.-',
                 markersize=20,
@@ -246,7 +249,10 @@ def plot_load_test_result_metrics(
     if ymin is not None:
         ylim = plt.ylim()
         plt.ylim([ymin, ylim[1]])  # type: ignore
-    xlabel = 'requests per second'
+    if closed_loop:
+        xlabel = 'concurrent requests'
+    else:
+        xlabel = 'requests per second'
     if test_name is not None:
         xlabel += '\n[' + test_name + ']'
     toolplot.set_labels(
@@ -256,3 +262,16 @@ def plot_load_test_result_metrics(
     )
     plt.legend(loc='center right')
 
+
+def _is_closed_loop(
+    results: typing.Mapping[str, flood.LoadTestOutput]
+    | typing.Mapping[str, flood.LoadTestDeepOutput],
+) -> bool:
+    return all(
+        result.get('concurrency') is not None
+        and all(
+            concurrency is not None
+            for concurrency in result['concurrency']  # type: ignore
+        )
+        for result in results.values()
+    )
@@ -428,12 +428,15 @@ _test_template_cells: notebook_io.NotebookTemplate = [
             # show test metadata
 
             toolstr.print_text_box(test_name + ' parameters')
-            test = flood.generate_test(**test_payload['test_parameters'])
+            test = flood.generate_test(
+                **test_payload['test_parameters'],
+                cache_dir=flood.generators.get_call_cache_dir(test_paths[test_name]),
+            )
             flood.tests.load_tests.print_load_test_summary(test)
             toolstr.print('- nodes tested:')
             nodes_df = pl.from_records(list(results_payload['nodes'].values()))
             toolstr.print_dataframe_as_table(nodes_df)
-        """,
+        """,  # noqa: E501
         'inputs': [],
     },
     {
@@ -443,6 +446,7 @@ _test_template_cells: notebook_io.NotebookTemplate = [
             # show result tables
 
             flood.user_io.print_metric_tables(results, metrics=metrics, comparison=len(results) == 2)
+            flood.tests.load_tests.print_generator_saturation(results)
         """,  # noqa: E501
         'inputs': [],
     },
@@ -5,7 +5,7 @@ import typing
 import flood
 from flood import user_io
 from flood import spec
-from . import vegeta
+from . import load_test_engines
 
 if typing.TYPE_CHECKING:
     import multiprocessing
@@ -20,6 +20,8 @@ def run_load_tests(
     | None = None,
     verbose: bool | int = False,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
 ) -> typing.Mapping[str, spec.LoadTestOutput]:
     """run multiple load tests"""
     # parse user_io
@@ -49,6 +51,8 @@ def run_load_tests(
             node=node,
             test=test,
             include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
         )
 
     # case: single node and multiple tests
@@ -59,6 +63,8 @@ def run_load_tests(
                 verbose=verbose,
                 test=each_test,
                 include_deep_output=include_deep_output,
+                engine=engine,
+                vegeta_processes=vegeta_processes,
             )
 
     # case: multiple nodes and single tests
@@ -69,6 +75,8 @@ def run_load_tests(
                 verbose=verbose,
                 test=test,
                 include_deep_output=include_deep_output,
+                engine=engine,
+                vegeta_processes=vegeta_processes,
             )
 
     # case: multiple nodes and multiple tests
@@ -80,6 +88,8 @@ def run_load_tests(
                     verbose=verbose,
                     test=test,
                     include_deep_output=include_deep_output,
+                    engine=engine,
+                    vegeta_processes=vegeta_processes,
                 )
 
     # case: invalid input
@@ -116,6 +126,8 @@ def schedule_load_test(
     test: spec.LoadTest | spec.TestGenerationParameters,
     verbose: bool | int = False,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
     _pbar_kwargs: typing.Mapping[str, typing.Any] | None = None,
 ) -> (
     spec.LoadTestOutput
@@ -136,6 +148,8 @@ def schedule_load_test(
                 test=test,
                 verbose=verbose,
                 include_deep_output=include_deep_output,
+                engine=engine,
+                vegeta_processes=vegeta_processes,
                 _pbar_kwargs=_pbar_kwargs,
                 _container=queue,
             ),
@@ -148,6 +162,8 @@ def schedule_load_test(
             test=test,
             verbose=verbose,
             include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
             _pbar_kwargs=_pbar_kwargs,
         )
 
@@ -160,6 +176,8 @@ def run_load_test(
     _pbar_kwargs: typing.Mapping[str, typing.Any] | None = None,
     _container: multiprocessing.Queue[str] | None = None,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
 ) -> spec.LoadTestOutput | str:
     """run a load test against a single node"""
 
@@ -174,6 +192,8 @@ def run_load_test(
             verbose=verbose,
             _pbar_kwargs=_pbar_kwargs,
             include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
         )
     else:
         result = _run_load_test_remotely(
@@ -182,6 +202,8 @@ def run_load_test(
             verbose=verbose,
             _pbar_kwargs=_pbar_kwargs,
             include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
         )
 
     if _container is not None:
@@ -199,6 +221,8 @@ def _run_load_test_locally(
     verbose: bool | int = False,
     _pbar_kwargs: typing.Mapping[str, typing.Any] | None = None,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
 ) -> spec.LoadTestOutput:
     """run a load test from local node"""
 
@@ -228,12 +252,18 @@ def _run_load_test_locally(
     # perform tests
     results = []
     for attack in tqdm.tqdm(use_test['attacks'], **tqdm_kwargs):
+        concurrency = attack.get('concurrency')
         if verbose:
-            flood.user_io.print_timestamped(
-                'Running attack at rate = ' + str(attack['rate']) + ' rps'
-            )
+            if concurrency is not None:
+                flood.user_io.print_timestamped(
+                    'Running attack at concurrency = ' + str(concurrency)
+                )
+            else:
+                flood.user_io.print_timestamped(
+                    'Running attack at rate = ' + str(attack['rate']) + ' rps'
+                )
 
-        result = vegeta.run_vegeta_attack(
+        result = load_test_engines.run_attack(
             url=node['url'],
             calls=attack['calls'],
             duration=attack['duration'],
@@ -241,6 +271,11 @@ def _run_load_test_locally(
             vegeta_args=attack['vegeta_args'],
             verbose=verbose >= 2,
             include_deep_output=include_deep_output,
+            engine=engine,
+            vegeta_processes=vegeta_processes,
+            concurrency=concurrency,
+            client_config=attack.get('client_config'),
+            schedule=attack.get('schedule'),
         )
         results.append(result)
         if verbose >= 2:
@@ -260,14 +295,28 @@ def _run_load_test_locally(
         ]
 
         # convert list of map of map into map of map of list
-        categories: list[spec.ResponseCategory] = list(
-            results[0]['deep_metrics'].keys()  # type: ignore
-        )
+        # (a method of a mixed test may be missing from some attacks)
+        categories: list[spec.ResponseCategory] = []
+        for result in results:
+            for category in result['deep_metrics']:  # type: ignore
+                if category not in categories:
+                    categories.append(category)
         deep_metrics = {}
         for category in categories:
-            deep_metrics[category] = _list_of_maps_to_map_of_lists(
-                [result['deep_metrics'][category] for result in results]  # type: ignore # noqa: E501
-            )
+            category_results: list[typing.Mapping[str, typing.Any] | None] = [
+                result['deep_metrics'].get(category)  # type: ignore
+                for result in results
+            ]
+            keys = next(
+                item for item in category_results if item is not None
+            ).keys()
+            deep_metrics[category] = {
+                key: [
+                    item[key] if item is not None else None
+                    for item in category_results
+                ]
+                for key in keys
+            }
         output_data['deep_metrics'] = deep_metrics  # type: ignore
 
     return output_data
@@ -287,6 +336,8 @@ def _run_load_test_remotely(
     verbose: bool | int = False,
     _pbar_kwargs: typing.Mapping[str, typing.Any] | None = None,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    engine: spec.LoadTestEngine | None = None,
+    vegeta_processes: int | None = None,
 ) -> str:
     """run a load test from local node"""
 
@@ -312,7 +363,7 @@ def _run_load_test_remotely(
             'could not find flood installation on remote host ' + node['name']
         )
         sys.exit()
-    if remote_vegeta_path is None:
+    if remote_vegeta_path is None and (engine is None or engine == 'vegeta'):
         raise Exception(
             'could not find vegeta installation on remote host ' + node['name']
         )
@@ -368,6 +419,10 @@ def _run_load_test_remotely(
             extra_kwargs += ' --save-raw-output'
         if 'metrics' in include_deep_output:
             extra_kwargs += ' --deep-check'
+    if engine is not None:
+        extra_kwargs += ' --engine ' + engine
+    if vegeta_processes is not None:
+        extra_kwargs += ' --vegeta-processes ' + str(vegeta_processes)
     cmd = cmd_template.format(
         host=remote,
         name=node['name'],
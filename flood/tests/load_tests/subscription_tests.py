@@ -0,0 +1,419 @@
+"""eth_subscribe fan-out tests, measuring notification delivery latency
+
+- each subscriber opens its own websocket connection and subscription
+- subscribers are started at a ramp rate, or all at once
+- each notification is keyed by its block hash (newHeads), or by its block
+  hash and log index (logs)
+- the delivery delay of a notification is measured relative to the first
+  subscriber that received it
+
+delays are streamed into a latency histogram, so the state kept per
+subscriber is constant regardless of test duration. a delivery is late if its
+delay exceeds late_threshold. a notification is dropped by each subscriber
+that was subscribed when it first arrived but never received it. after the
+test duration, subscribers drain for late_threshold seconds so that the last
+notifications can reach every subscriber.
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+from . import latency_histograms
+from . import websocket_engine
+
+if typing.TYPE_CHECKING:
+    import array
+
+    class _SubscriptionState(typing.TypedDict):
+        late_threshold_ns: int
+        draining: bool
+        n_subscribed: int
+        n_connection_errors: int
+        n_subscription_errors: int
+        n_disconnects: int
+        n_deliveries: int
+        n_late: int
+        errors: dict[str, int]
+        connect_latencies: list[int]
+        subscribe_latencies: list[int]
+        # notification key -> [first arrival, n expected, n received]
+        notifications: dict[typing.Any, list[int]]
+        delays: array.array[int]
+        delay_histograms: list[spec.LatencyHistogram]
+
+
+subscription_test_names: typing.Mapping[str, spec.SubscriptionType] = {
+    'eth_subscribe_newHeads': 'newHeads',
+    'eth_subscribe_logs': 'logs',
+}
+
+default_n_subscribers = 100
+default_late_threshold = 1.0
+default_timeout = 30
+
+_delay_buffer_size = 10_000
+
+
+def run_subscription_test(
+    *,
+    url: str,
+    subscription: spec.SubscriptionType = 'newHeads',
+    n_subscribers: int = default_n_subscribers,
+    duration: float = 30,
+    ramp_rate: float | None = None,
+    late_threshold: float = default_late_threshold,
+    log_filter: typing.Mapping[str, typing.Any] | None = None,
+    timeout: float = default_timeout,
+    verbose: bool = False,
+) -> spec.SubscriptionTestOutput:
+    """open subscribers and measure delivery of their notifications
+
+    ramp_rate is in subscribers per second, None opens all at once
+    """
+    import asyncio
+
+    if subscription not in subscription_test_names.values():
+        raise Exception('unknown subscription type: ' + str(subscription))
+    if n_subscribers < 1:
+        raise Exception('n_subscribers must be at least 1')
+    if ramp_rate is not None and ramp_rate <= 0:
+        raise Exception('ramp_rate must be positive')
+
+    if subscription == 'logs':
+        if log_filter is None:
+            log_filter = {}
+        subscribe_params: list[typing.Any] = ['logs', log_filter]
+    else:
+        if log_filter is not None:
+            raise Exception('log_filter only used for logs subscriptions')
+        subscribe_params = [subscription]
+
+    if verbose:
+        print('running subscription test...')
+        print('- subscription:', subscription)
+        print('- subscribers:', n_subscribers)
+        if ramp_rate is not None:
+            print('- ramp:', ramp_rate, 'subscribers per second')
+        print('- duration:', duration)
+
+    state = asyncio.run(
+        _async_subscription_test(
+            url=url,
+            subscribe_params=subscribe_params,
+            n_subscribers=n_subscribers,
+            duration=duration,
+            ramp_rate=ramp_rate,
+            late_threshold=late_threshold,
+            timeout=timeout,
+        )
+    )
+    return _create_subscription_report(
+        state,
+        subscription=subscription,
+        n_subscribers=n_subscribers,
+        duration=duration,
+        ramp_rate=ramp_rate,
+        late_threshold=late_threshold,
+    )
+
+
+async def _async_subscription_test(
+    *,
+    url: str,
+    subscribe_params: typing.Sequence[typing.Any],
+    n_subscribers: int,
+    duration: float,
+    ramp_rate: float | None,
+    late_threshold: float,
+    timeout: float,
+) -> _SubscriptionState:
+    import array
+    import asyncio
+
+    state: _SubscriptionState = {
+        'late_threshold_ns': int(late_threshold * 1e9),
+        'draining': False,
+        'n_subscribed': 0,
+        'n_connection_errors': 0,
+        'n_subscription_errors': 0,
+        'n_disconnects': 0,
+        'n_deliveries': 0,
+        'n_late': 0,
+        'errors': {},
+        'connect_latencies': [],
+        'subscribe_latencies': [],
+        'notifications': {},
+        'delays': array.array('q'),
+        'delay_histograms': [],
+    }
+
+    loop = asyncio.get_running_loop()
+    t_start = loop.time()
+    tasks = []
+    try:
+        for i in range(n_subscribers):
+            if ramp_rate is not None:
+                t_target = t_start + i / ramp_rate
+                if t_target >= t_start + duration:
+                    break
+                await asyncio.sleep(max(0, t_target - loop.time()))
+            task = asyncio.ensure_future(
+                _run_subscriber(
+                    url=url,
+                    subscribe_params=subscribe_params,
+                    state=state,
+                    timeout=timeout,
+                )
+            )
+            tasks.append(task)
+
+        await asyncio.sleep(max(0, t_start + duration - loop.time()))
+        state['draining'] = True
+        await asyncio.sleep(late_threshold)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    _flush_delays(state)
+    return state
+
+
+async def _run_subscriber(
+    *,
+    url: str,
+    subscribe_params: typing.Sequence[typing.Any],
+    state: _SubscriptionState,
+    timeout: float,
+) -> None:
+    import asyncio
+    import time
+
+    import orjson
+
+    t_start = time.perf_counter_ns()
+    try:
+        reader, writer = await asyncio.wait_for(
+            websocket_engine._open_websocket(url), timeout=timeout
+        )
+    except asyncio.TimeoutError:
+        state['n_connection_errors'] += 1
+        _add_error(state, 'connection timeout after ' + str(timeout) + 's')
+        return
+    except Exception as e:
+        state['n_connection_errors'] += 1
+        _add_error(state, str(e) or type(e).__name__)
+        return
+    state['connect_latencies'].append(time.perf_counter_ns() - t_start)
+
+    subscribed = False
+    try:
+        call = {
+            'jsonrpc': '2.0',
+            'id': 1,
+            'method': 'eth_subscribe',
+            'params': subscribe_params,
+        }
+        t_start = time.perf_counter_ns()
+        writer.write(
+            websocket_engine._encode_frame(
+                websocket_engine._opcode_text, orjson.dumps(call)
+            )
+        )
+        response = await asyncio.wait_for(
+            websocket_engine._read_message(reader, writer), timeout=timeout
+        )
+        subscription_id = _get_subscription_id(response)
+        if subscription_id is None:
+            state['n_subscription_errors'] += 1
+            _add_error(state, 'eth_subscribe failed: ' + repr(response))
+            return
+        state['subscribe_latencies'].append(time.perf_counter_ns() - t_start)
+        state['n_subscribed'] += 1
+        subscribed = True
+
+        while True:
+            message = await websocket_engine._read_message(reader, writer)
+            if message is None:
+                state['n_disconnects'] += 1
+                _add_error(state, 'connection closed by server')
+                break
+            _record_notification(
+                state, message, received=time.perf_counter_ns()
+            )
+    except asyncio.TimeoutError:
+        state['n_subscription_errors'] += 1
+        _add_error(state, 'eth_subscribe timeout after ' + str(timeout) + 's')
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        if subscribed:
+            state['n_disconnects'] += 1
+        else:
+            state['n_subscription_errors'] += 1
+        _add_error(state, str(e) or type(e).__name__)
+    finally:
+        try:
+            writer.write(
+                websocket_engine._encode_frame(
+                    websocket_engine._opcode_close, b''
+                )
+            )
+        except Exception:
+            pass
+        writer.close()
+
+
+def _add_error(state: _SubscriptionState, error: str) -> None:
+    state['errors'][error] = state['errors'].get(error, 0) + 1
+
+
+def _get_subscription_id(response: bytes | None) -> str | None:
+    import orjson
+
+    if response is None:
+        return None
+    try:
+        decoded = orjson.loads(response)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(decoded, dict) or decoded.get('id') != 1:
+        return None
+    subscription_id = decoded.get('result')
+    if isinstance(subscription_id, str):
+        return subscription_id
+    return None
+
+
+#
+# # notifications
+#
+
+
+def _get_notification_key(message: bytes) -> typing.Any:
+    """get key identifying notification across subscribers"""
+    import orjson
+
+    try:
+        decoded = orjson.loads(message)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(decoded, dict):
+        return None
+    if decoded.get('method') != 'eth_subscription':
+        return None
+    params = decoded.get('params')
+    if not isinstance(params, dict):
+        return None
+    result = params.get('result')
+    if isinstance(result, dict):
+        if 'logIndex' in result:
+            return (
+                result.get('blockHash'),
+                result.get('logIndex'),
+                result.get('removed', False),
+            )
+        elif 'hash' in result:
+            return result['hash']
+    return orjson.dumps(result, option=orjson.OPT_SORT_KEYS)
+
+
+def _record_notification(
+    state: _SubscriptionState, message: bytes, received: int
+) -> None:
+    key = _get_notification_key(message)
+    if key is None:
+        return
+
+    notification = state['notifications'].get(key)
+    if notification is None:
+        # notifications first seen after the test duration are not scored
+        if state['draining']:
+            return
+        state['notifications'][key] = [received, state['n_subscribed'], 1]
+        delay = 0
+    else:
+        notification[2] += 1
+        delay = received - notification[0]
+
+    state['n_deliveries'] += 1
+    if delay > state['late_threshold_ns']:
+        state['n_late'] += 1
+    state['delays'].append(delay)
+    if len(state['delays']) >= _delay_buffer_size:
+        _flush_delays(state)
+
+
+def _flush_delays(state: _SubscriptionState) -> None:
+    """move buffered delays into a histogram"""
+    import array
+
+    if len(state['delays']) == 0:
+        return
+    histogram = latency_histograms.create_latency_histogram(state['delays'])
+    state['delay_histograms'] = [
+        latency_histograms.merge_latency_histograms(
+            state['delay_histograms'] + [histogram]
+        )
+    ]
+    state['delays'] = array.array('q')
+
+
+#
+# # reports
+#
+
+
+def _create_subscription_report(
+    state: _SubscriptionState,
+    *,
+    subscription: spec.SubscriptionType,
+    n_subscribers: int,
+    duration: float,
+    ramp_rate: float | None,
+    late_threshold: float,
+) -> spec.SubscriptionTestOutput:
+    if len(state['delay_histograms']) > 0:
+        delay_histogram = state['delay_histograms'][0]
+    else:
+        delay_histogram = latency_histograms.create_latency_histogram([])
+    delay_metrics = latency_histograms.compute_latency_histogram_metrics(
+        delay_histogram
+    )
+
+    connect_histogram = latency_histograms.create_latency_histogram(
+        state['connect_latencies']
+    )
+    subscribe_histogram = latency_histograms.create_latency_histogram(
+        state['subscribe_latencies']
+    )
+
+    n_dropped = 0
+    for _, n_expected, n_received in state['notifications'].values():
+        n_dropped += max(0, n_expected - n_received)
+
+    return {
+        'subscription': subscription,
+        'target_subscribers': n_subscribers,
+        'ramp_rate': ramp_rate,
+        'duration': duration,
+        'late_threshold': late_threshold,
+        'n_connected': len(state['connect_latencies']),
+        'n_subscribed': state['n_subscribed'],
+        'n_connection_errors': state['n_connection_errors'],
+        'n_subscription_errors': state['n_subscription_errors'],
+        'n_disconnects': state['n_disconnects'],
+        'n_notifications': len(state['notifications']),
+        'n_deliveries': state['n_deliveries'],
+        'n_late': state['n_late'],
+        'n_dropped': n_dropped,
+        'delay_p50': delay_metrics['p50'],
+        'delay_p90': delay_metrics['p90'],
+        'delay_p99': delay_metrics['p99'],
+        'delay_max': delay_metrics['max'],
+        'errors': state['errors'],
+        'connect_latency_histogram': connect_histogram,
+        'subscribe_latency_histogram': subscribe_histogram,
+        'delay_histogram': delay_histogram,
+    }
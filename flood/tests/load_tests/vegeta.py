@@ -5,6 +5,16 @@ import typing
 
 from ... import spec
 from . import deep_utils
+from . import latency_histograms
+from . import load_test_engines
+from . import vegeta_gob
+
+if typing.TYPE_CHECKING:
+    import polars as pl
+
+
+# above this rate a single vegeta process tends to become cpu-bound
+max_rate_per_process = 10_000
 
 
 def run_vegeta_attack(
@@ -16,16 +26,69 @@ def run_vegeta_attack(
     vegeta_args: str | None = None,
     verbose: bool = False,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    vegeta_processes: int | None = None,
+    concurrency: int | None = None,
+    client_config: spec.ClientConfig | None = None,
+    schedule: typing.Sequence[float] | None = None,
 ) -> spec.LoadTestOutputDatum:
-    attack = _construct_vegeta_attack(
-        calls=calls,
-        url=url,
-        verbose=verbose,
-    )
+    """run attack with vegeta
+
+    vegeta_processes is the number of vegeta processes to split the attack
+    across, by default one process per max_rate_per_process up to cpu count
+
+    if concurrency is given, the attack is closed-loop, using vegeta's
+    unpaced mode with a fixed number of workers
+
+    client_config sets vegeta's connection limit, initial workers, and
+    keepalive, split across processes like the rate
+
+    vegeta only paces requests at a constant rate, so it cannot replay a
+    schedule
+    """
+    if schedule is not None:
+        raise Exception('vegeta cannot replay schedules, use asyncio engine')
+    if client_config is None:
+        client_config = {
+            'max_connections': None,
+            'workers': None,
+            'keepalive': True,
+        }
+    elif concurrency is not None and client_config['workers'] is not None:
+        raise Exception('closed-loop attacks set workers using concurrency')
+    if concurrency is not None:
+        if vegeta_processes is None:
+            vegeta_processes = 1
+        vegeta_processes = max(1, min(vegeta_processes, concurrency))
+    else:
+        if vegeta_processes is None:
+            vegeta_processes = _get_default_vegeta_processes(rate)
+        vegeta_processes = max(1, min(vegeta_processes, rate))
+    if vegeta_processes > 1:
+        return _run_sharded_vegeta_attack(
+            url=url,
+            rate=rate,
+            calls=calls,
+            duration=duration,
+            vegeta_args=vegeta_args,
+            verbose=verbose,
+            include_deep_output=include_deep_output,
+            n_processes=vegeta_processes,
+            concurrency=concurrency,
+            client_config=client_config,
+        )
+
+    if verbose:
+        print('running vegeta attack...')
+        print('- targets: streamed over stdin,', len(calls), 'calls')
     attack_output = _vegeta_attack(
-        schedule_dir=attack['schedule_dir'],
+        calls=_get_attack_calls(calls, concurrency),
+        url=url,
         duration=duration,
-        rate=rate,
+        rate=rate if concurrency is None else 0,
+        max_connections=client_config['max_connections'],
+        workers=concurrency or client_config['workers'],
+        max_workers=concurrency,
+        keepalive=client_config['keepalive'],
         vegeta_args=vegeta_args,
         verbose=verbose,
     )
@@ -35,111 +98,200 @@ def run_vegeta_attack(
         target_duration=duration,
         include_deep_output=include_deep_output,
         calls=calls,
+        concurrency=concurrency,
     )
     return report
 
 
-def _construct_vegeta_attack(
-    calls: typing.Sequence[typing.Any],
-    url: str,
-    schedule_dir: str | None = None,
-    verbose: bool = False,
-) -> typing.Mapping[str, str]:
-    import json
-    import os
-    import tempfile
+#
+# # targets
+#
 
-    headers = {'Content-Type': 'application/json'}
 
-    # determine output directory
-    if schedule_dir is None:
-        schedule_dir = tempfile.mkdtemp()
+def _encode_vegeta_target(call: typing.Any, url: str) -> bytes:
+    """encode call as a single line of vegeta's json target format"""
+    import base64
+    import orjson
 
-    # create calls file
-    call_paths = []
-    for c, call in enumerate(calls):
-        vegeta_calls_path = os.path.join(
-            schedule_dir, 'vegeta_calls_' + str(c) + '.json'
-        )
-        with open(vegeta_calls_path, 'w') as f:
-            f.write(json.dumps(call))
-        call_paths.append(vegeta_calls_path)
-
-    # create targets specification
-    vegeta_targets_path = os.path.join(schedule_dir, 'vegeta_targets')
-    with open(vegeta_targets_path, 'w') as f:
-        for c, call in enumerate(calls):
-            f.write('POST ' + url + '\n')
-            for key, value in headers.items():
-                f.write(key + ': ' + value + '\n')
-            f.write('@' + call_paths[c] + '\n')
-            f.write('\n')
-
-    # output summary
-    if verbose:
-        print('running vegeta attack...')
-        print('- targets:', vegeta_targets_path)
-        print('- calls:', vegeta_calls_path)
+    request = load_test_engines._get_call_http_request(call, url)
+    method, target_url, header, body = request
+    target = {'method': method, 'url': target_url, 'header': header}
+    if body:
+        target['body'] = base64.b64encode(body).decode()
+
+    return orjson.dumps(target) + b'\n'
 
-    return {
-        'schedule_dir': schedule_dir,
-        'vegeta_calls_path': vegeta_calls_path,
-        'vegeta_targets_path': vegeta_targets_path,
-    }
+
+def _get_attack_calls(
+    calls: typing.Sequence[typing.Any], concurrency: int | None
+) -> typing.Iterable[typing.Any]:
+    """closed-loop attacks reuse calls until the attack duration elapses"""
+    from . import lazy_calls
+
+    if concurrency is not None and len(calls) > 0:
+        return lazy_calls.cycle_calls(calls)
+    else:
+        return calls
+
+
+def _write_vegeta_targets(
+    stdin: typing.IO[bytes],
+    calls: typing.Iterable[typing.Any],
+    url: str,
+    batch_size: int = 1024,
+) -> None:
+    """encode calls into vegeta stdin, flushing every batch_size targets"""
+    batch = []
+    try:
+        for call in calls:
+            batch.append(_encode_vegeta_target(call, url))
+            if len(batch) >= batch_size:
+                stdin.write(b''.join(batch))
+                stdin.flush()
+                batch = []
+        if len(batch) > 0:
+            stdin.write(b''.join(batch))
+    except BrokenPipeError:
+        # vegeta stops reading targets once the attack duration has elapsed
+        pass
+    finally:
+        try:
+            stdin.close()
+        except BrokenPipeError:
+            pass
+
+
+#
+# # attacks
+#
 
 
 def _vegeta_attack(
-    schedule_dir: str,
     *,
+    calls: typing.Iterable[typing.Any],
+    url: str,
     duration: int | None = None,
     rate: int | None = None,
     max_connections: int | None = None,
+    workers: int | None = None,
     max_workers: int | None = None,
     n_cpus: int | None = None,
+    keepalive: bool = True,
     report_path: str | None = None,
     vegeta_args: str | None = None,
     verbose: bool = False,
-) -> bytes:
-    import os
+    chunk_size: int = 2**20,
+) -> typing.Iterator[bytes]:
+    """run attack, yielding chunks of raw output as they are produced"""
     import subprocess
+    import threading
 
-    # construct command
-    cmd = 'vegeta attack'
-    cmd += ' -targets=' + os.path.join(schedule_dir, 'vegeta_targets')
+    # construct command, targets are read lazily from stdin as json
+    cmd = 'vegeta attack -format=json -lazy'
     if rate is not None:
         cmd += ' -rate=' + str(rate)
     if duration is not None:
         cmd += ' -duration=' + str(duration) + 's'
     if max_connections is not None:
         cmd += ' -max-connections=' + str(max_connections)
+    if workers is not None:
+        cmd += ' -workers=' + str(workers)
     if max_workers is not None:
         cmd += ' -max-workers=' + str(max_workers)
+    if n_cpus is not None:
+        cmd += ' -cpus=' + str(n_cpus)
+    if not keepalive:
+        cmd += ' -keepalive=false'
     if vegeta_args is not None:
         cmd += ' ' + vegeta_args
 
     if verbose:
         print('- command:', cmd)
 
-    # run command
-    return subprocess.check_output(cmd.split(' '))
+    # run command, encoding targets while the attack is already underway
+    process = subprocess.Popen(
+        cmd.split(' '), stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    writer = threading.Thread(
+        target=_write_vegeta_targets,
+        kwargs=dict(stdin=process.stdin, calls=calls, url=url),
+        daemon=True,
+    )
+    writer.start()
+
+    # yield output as it is produced rather than buffering it all
+    assert process.stdout is not None
+    while True:
+        chunk = process.stdout.read1(chunk_size)  # type: ignore
+        if len(chunk) == 0:
+            break
+        yield chunk
+    writer.join()
+    returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
 
 
 def _create_vegeta_report(
-    attack_output: bytes,
+    attack_output: typing.Iterable[bytes],
     target_rate: int,
     target_duration: int,
     include_deep_output: typing.Sequence[spec.DeepOutput] | None,
     calls: typing.Sequence[typing.Any],
+    concurrency: int | None = None,
 ) -> spec.LoadTestOutputDatum:
+    """consume attack output chunk by chunk, so it is never held in memory
+
+    summary statistics are computed by a streaming vegeta report process,
+    results are decoded incrementally into a latency histogram and deep
+    metrics, and raw output is spilled to disk
+    """
     import json
     import subprocess
 
+    if include_deep_output is None:
+        include_deep_output = []
+
+    # start consumers
     cmd = 'vegeta report -type json'
-    report_output = (
-        subprocess.check_output(cmd.split(' '), input=attack_output)
-        .decode()
-        .strip()
+    report_process = subprocess.Popen(
+        cmd.split(' '), stdin=subprocess.PIPE, stdout=subprocess.PIPE
     )
+    assert report_process.stdin is not None
+    assert report_process.stdout is not None
+    if 'metrics' in include_deep_output:
+        deep_decoder = deep_utils._start_streaming_deep_decoder()
+    if 'raw' in include_deep_output:
+        raw_spill = deep_utils._start_raw_output_spill()
+    gob_decoder = vegeta_gob.create_vegeta_decoder()
+    histograms = []
+    timings = deep_utils._start_streaming_timings(
+        target_rate if concurrency is None else 0
+    )
+
+    # feed each chunk of output to each consumer
+    for chunk in attack_output:
+        report_process.stdin.write(chunk)
+        columns = vegeta_gob.feed_vegeta_decoder(gob_decoder, chunk)
+        if len(columns['latency']) > 0:
+            histograms.append(
+                latency_histograms.create_latency_histogram(
+                    columns['latency']
+                )
+            )
+            deep_utils._add_streaming_timings(timings, columns)
+        if 'metrics' in include_deep_output:
+            deep_utils._add_streaming_deep_columns(deep_decoder, columns)
+        if 'raw' in include_deep_output:
+            raw_spill.write(chunk)
+    if len(gob_decoder['buffer']) > 0:
+        raise Exception('vegeta output ends with a truncated result')
+
+    # gather summary statistics
+    report_process.stdin.close()
+    report_output = report_process.stdout.read().decode().strip()
+    if report_process.wait() != 0:
+        raise subprocess.CalledProcessError(report_process.returncode, cmd)
     report: spec.RawLoadTestOutputDatum = json.loads(report_output)
 
     if 'min' in report['latencies']:
@@ -147,28 +299,37 @@ def _create_vegeta_report(
     else:
         latency_min = None
 
+    if len(histograms) > 0:
+        latency_histogram = latency_histograms.merge_latency_histograms(
+            histograms
+        )
+    else:
+        latency_histogram = latency_histograms.create_latency_histogram([])
+
+    # measure latencies from scheduled send times
+    corrected, in_flight = deep_utils._finish_streaming_timings(timings)
+
     # compute deep data
     deep_raw_output = None
     deep_metrics = None
     deep_rpc_error_pairs = None
-    if include_deep_output is None:
-        include_deep_output = []
     if 'raw' in include_deep_output:
-        deep_raw_output = deep_utils.encode_raw_vegeta_output(attack_output)
+        deep_raw_output = deep_utils._finish_raw_output_spill(raw_spill)
     if 'metrics' in include_deep_output:
-        if 'metrics' in include_deep_output:
-            (
-                deep_metrics,
-                deep_rpc_error_pairs,
-            ) = deep_utils.compute_deep_datum(
-                raw_output=attack_output,
-                target_rate=target_rate,
-                target_duration=target_duration,
-                calls=calls,
-            )
+        (
+            deep_metrics,
+            deep_rpc_error_pairs,
+        ) = deep_utils.compute_deep_datum_from_dataframe(
+            all_df=deep_utils._finish_streaming_deep_decoder(deep_decoder),
+            target_rate=target_rate,
+            target_duration=target_duration,
+            calls=calls,
+        )
 
-    return {
+    # client and batch keys are added by load_test_engines.run_attack
+    return {  # type: ignore[typeddict-item]
         'target_rate': target_rate,
+        'concurrency': concurrency,
         'actual_rate': report['rate'],
         'target_duration': target_duration,
         'actual_duration': report['duration'] / 1e9,
@@ -189,8 +350,219 @@ def _create_vegeta_report(
         'last_request_timestamp': report['latest'],
         'last_response_timestamp': report['end'],
         'final_wait_time': report['wait'] / 1e9,
+        'p50_corrected': corrected['p50_corrected'],
+        'p90_corrected': corrected['p90_corrected'],
+        'p95_corrected': corrected['p95_corrected'],
+        'p99_corrected': corrected['p99_corrected'],
+        'max_corrected': corrected['max_corrected'],
+        'mean_in_flight': in_flight['mean_in_flight'],
+        'max_in_flight': in_flight['max_in_flight'],
+        'latency_histogram': latency_histogram,
         'deep_raw_output': deep_raw_output,
         'deep_metrics': deep_metrics,
         'deep_rpc_error_pairs': deep_rpc_error_pairs,
     }
 
+
+#
+# # sharded attacks
+#
+
+
+def _get_default_vegeta_processes(rate: int) -> int:
+    import math
+    import os
+
+    n_cpus = os.cpu_count() or 1
+    return max(1, min(n_cpus, math.ceil(rate / max_rate_per_process)))
+
+
+def _run_sharded_vegeta_attack(
+    *,
+    url: str,
+    rate: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    vegeta_args: str | None,
+    verbose: bool,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None,
+    n_processes: int,
+    concurrency: int | None = None,
+    client_config: spec.ClientConfig | None = None,
+) -> spec.LoadTestOutputDatum:
+    """split calls and rate across multiple concurrent vegeta processes
+
+    closed-loop attacks split their workers across processes instead of rate
+
+    each process writes its output to a temporary file so that the attack
+    does not compete for cpu with decoding. afterwards, every output is
+    decoded and metrics are computed exactly over the combined responses
+    """
+    import os
+    import tempfile
+    import threading
+
+    if include_deep_output is None:
+        include_deep_output = []
+
+    # split load as evenly as possible, calls are interleaved across shards
+    rates: typing.Sequence[int]
+    if concurrency is not None:
+        shard_concurrencies: list[int | None] = list(
+            _split_evenly(concurrency, n_processes)
+        )
+        rates = [0] * n_processes
+    else:
+        shard_concurrencies = [None] * n_processes
+        rates = _split_evenly(rate, n_processes)
+    if client_config is None:
+        client_config = {
+            'max_connections': None,
+            'workers': None,
+            'keepalive': True,
+        }
+    shard_max_connections = _split_client_limit(
+        client_config['max_connections'], n_processes
+    )
+    shard_workers = _split_client_limit(client_config['workers'], n_processes)
+    keepalive = client_config['keepalive']
+    n_cpus = max(1, (os.cpu_count() or 1) // n_processes)
+    if verbose:
+        print('running vegeta attack...')
+        print('- targets: streamed over stdin,', len(calls), 'calls')
+        if concurrency is not None:
+            print(
+                '- processes:',
+                n_processes,
+                'with concurrencies',
+                shard_concurrencies,
+            )
+        else:
+            print('- processes:', n_processes, 'with rates', rates)
+
+    # run shards concurrently
+    outputs = [tempfile.TemporaryFile() for i in range(n_processes)]
+    errors: list[BaseException] = []
+
+    def run_shard(i: int) -> None:
+        try:
+            for chunk in _vegeta_attack(
+                calls=_get_attack_calls(
+                    calls[i::n_processes], shard_concurrencies[i]
+                ),
+                url=url,
+                duration=duration,
+                rate=rates[i],
+                max_connections=shard_max_connections[i],
+                workers=shard_concurrencies[i] or shard_workers[i],
+                max_workers=shard_concurrencies[i],
+                n_cpus=n_cpus,
+                keepalive=keepalive,
+                vegeta_args=vegeta_args,
+                verbose=verbose and i == 0,
+            ):
+                outputs[i].write(chunk)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run_shard, args=(i,))
+        for i in range(n_processes)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    try:
+        if len(errors) > 0:
+            raise errors[0]
+
+        # combine outputs of shards
+        deep_raw_output = None
+        if 'raw' in include_deep_output:
+            raw_spill = deep_utils._start_raw_output_spill()
+            for output in outputs:
+                for chunk in _read_chunks(output):
+                    raw_spill.write(chunk)
+            deep_raw_output = deep_utils._finish_raw_output_spill(raw_spill)
+        df = _decode_shard_outputs(
+            outputs=outputs,
+            classify='metrics' in include_deep_output,
+            rates=rates,
+        )
+    finally:
+        for output in outputs:
+            output.close()
+
+    return deep_utils._create_report_from_dataframe(
+        df=df,
+        target_rate=rate,
+        target_duration=duration,
+        include_deep_output=include_deep_output,
+        calls=calls,
+        deep_raw_output=deep_raw_output,
+        concurrency=concurrency,
+    )
+
+
+def _split_evenly(total: int, n: int) -> typing.Sequence[int]:
+    return [total // n + (1 if i < total % n else 0) for i in range(n)]
+
+
+def _split_client_limit(
+    limit: int | None, n: int
+) -> typing.Sequence[int | None]:
+    """split per-client limit across processes, giving each at least 1"""
+    if limit is None:
+        return [None] * n
+    return [max(1, item) for item in _split_evenly(limit, n)]
+
+
+def _decode_shard_outputs(
+    outputs: typing.Sequence[typing.IO[bytes]],
+    classify: bool,
+    rates: typing.Sequence[int],
+) -> pl.DataFrame:
+    """decode raw outputs of shards into a single dataframe
+
+    if classify, responses are classified for deep metrics, otherwise
+    response bodies are discarded. scheduled send times are computed per
+    shard, since each shard paces its own requests
+    """
+    import polars as pl
+
+    dfs = []
+    for output, rate in zip(outputs, rates):
+        if classify:
+            decoder = deep_utils._start_streaming_deep_decoder()
+            for chunk in _read_chunks(output):
+                deep_utils._feed_streaming_deep_decoder(decoder, chunk)
+            shard_df = deep_utils._finish_streaming_deep_decoder(decoder)
+        else:
+            shard_dfs = []
+            gob_decoder = vegeta_gob.create_vegeta_decoder()
+            for chunk in _read_chunks(output):
+                columns = vegeta_gob.feed_vegeta_decoder(gob_decoder, chunk)
+                columns['response'] = [b''] * len(columns['response'])
+                shard_dfs.append(vegeta_gob.vegeta_columns_to_dataframe(columns))
+            if len(gob_decoder['buffer']) > 0:
+                raise Exception('vegeta output ends with a truncated result')
+            if len(shard_dfs) == 0:
+                continue
+            shard_df = pl.concat(shard_dfs)
+        dfs.append(deep_utils._add_scheduled_timestamps(shard_df, rate))
+    if len(dfs) == 0:
+        return vegeta_gob.decode_vegeta_results(b'')
+    return pl.concat(dfs)
+
+
+def _read_chunks(
+    f: typing.IO[bytes], chunk_size: int = 2**20
+) -> typing.Iterator[bytes]:
+    f.seek(0)
+    while True:
+        chunk = f.read(chunk_size)
+        if len(chunk) == 0:
+            break
+        yield chunk
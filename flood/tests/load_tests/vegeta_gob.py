@@ -0,0 +1,480 @@
+"""pure-python decoder for vegeta's binary result format
+
+vegeta attack encodes each result as a go gob message. decoding the messages
+directly avoids a round trip through `vegeta encode --to csv`, which turns
+every response body into base64 text that then has to be parsed again.
+
+the decoder is incremental, so results can be decoded as chunks of attack
+output arrive. numeric fields are accumulated in typed arrays that are handed
+to polars through the buffer protocol rather than as lists of python ints.
+"""
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import array
+
+    import polars as pl
+
+    class _GobType(typing.TypedDict):
+        kind: typing.Literal['struct', 'slice', 'array', 'map', 'gobencoder']
+        name: str
+        fields: list[tuple[str, int]]
+        elem: int
+        key: int
+
+    class VegetaDecoder(typing.TypedDict):
+        buffer: bytes
+        types: dict[int, _GobType]
+        layouts: dict[int, list[int]]
+
+    class VegetaColumns(typing.TypedDict):
+        timestamp: array.array[int]
+        status_code: array.array[int]
+        latency: array.array[int]
+        bytes_out: array.array[int]
+        bytes_in: array.array[int]
+        index: array.array[int]
+        error: list[str | None]
+        response: list[bytes]
+
+
+# seconds between go's zero time (year 1) and the unix epoch
+_go_unix_offset = 62135596800
+
+# gob type ids that are predefined by the gob protocol
+_bool_id = 1
+_int_id = 2
+_uint_id = 3
+_float_id = 4
+_bytes_id = 5
+_string_id = 6
+_complex_id = 7
+
+# columns that fields of vegeta's Result struct are decoded into
+_skip_column = 0
+_timestamp_column = 1
+_status_code_column = 2
+_latency_column = 3
+_bytes_out_column = 4
+_bytes_in_column = 5
+_index_column = 6
+_error_column = 7
+_response_column = 8
+_result_fields = {
+    'Timestamp': _timestamp_column,
+    'Code': _status_code_column,
+    'Latency': _latency_column,
+    'BytesOut': _bytes_out_column,
+    'BytesIn': _bytes_in_column,
+    'Seq': _index_column,
+    'Error': _error_column,
+    'Body': _response_column,
+}
+
+
+def decode_vegeta_results(raw_output: bytes) -> pl.DataFrame:
+    """decode raw vegeta attack output to dataframe, 1 row per response"""
+    decoder = create_vegeta_decoder()
+    columns = feed_vegeta_decoder(decoder, raw_output)
+    if len(decoder['buffer']) > 0:
+        raise Exception('raw vegeta output ends with a truncated result')
+    return vegeta_columns_to_dataframe(columns)
+
+
+def create_vegeta_decoder() -> VegetaDecoder:
+    """create decoder for a single stream of vegeta attack output"""
+    return {'buffer': b'', 'types': {}, 'layouts': {}}
+
+
+def feed_vegeta_decoder(decoder: VegetaDecoder, chunk: bytes) -> VegetaColumns:
+    """decode every result completed by chunk, buffering any partial result"""
+    if len(decoder['buffer']) > 0:
+        chunk = decoder['buffer'] + chunk
+    data = memoryview(chunk)
+    columns = _create_columns()
+
+    pos = 0
+    end = len(data)
+    while pos < end:
+        # parse message length, waiting for more data if incomplete
+        first = data[pos]
+        if first < 128:
+            length = first
+            start = pos + 1
+        else:
+            start = pos + 1 + 256 - first
+            if start > end:
+                break
+            length = int.from_bytes(data[pos + 1 : start], 'big')
+        if start + length > end:
+            break
+        message = data[start : start + length]
+        pos = start + length
+
+        # messages begin with type id, negative for type definitions
+        type_id, offset = _read_int(message, 0)
+        # concatenated streams, e.g. from sharded attacks, redefine types
+        if type_id < 0:
+            decoder['types'][-type_id] = _read_wire_type(message, offset)
+            decoder['layouts'].pop(-type_id, None)
+        else:
+            _read_result(message, offset, type_id, decoder, columns)
+    decoder['buffer'] = bytes(data[pos:])
+
+    return columns
+
+
+def vegeta_columns_to_dataframe(columns: VegetaColumns) -> pl.DataFrame:
+    """convert decoded columns to dataframe, int columns via buffer protocol"""
+    import numpy as np
+    import polars as pl
+
+    def int_series(name: str) -> pl.Series:
+        array = columns[name]  # type: ignore
+        return pl.Series(name, np.frombuffer(array, dtype=np.int64))
+
+    return pl.DataFrame(
+        [
+            int_series('timestamp'),
+            int_series('status_code'),
+            int_series('latency'),
+            int_series('bytes_out'),
+            int_series('bytes_in'),
+            pl.Series('error', columns['error'], dtype=pl.Utf8),
+            pl.Series('response', columns['response'], dtype=pl.Binary),
+            int_series('index'),
+        ]
+    )
+
+
+def _create_columns() -> VegetaColumns:
+    import array
+
+    return {
+        'timestamp': array.array('q'),
+        'status_code': array.array('q'),
+        'latency': array.array('q'),
+        'bytes_out': array.array('q'),
+        'bytes_in': array.array('q'),
+        'index': array.array('q'),
+        'error': [],
+        'response': [],
+    }
+
+
+#
+# # values
+#
+
+
+def _read_result(
+    message: memoryview,
+    pos: int,
+    type_id: int,
+    decoder: VegetaDecoder,
+    columns: VegetaColumns,
+) -> None:
+    """read a single vegeta Result struct into columns
+
+    this is the hot loop of the decoder, so gob uints are read inline
+    """
+    layout = decoder['layouts'].get(type_id)
+    if layout is None:
+        layout = _get_result_layout(type_id, decoder['types'])
+        decoder['layouts'][type_id] = layout
+    n_used = len(layout)
+
+    timestamp = 0
+    status_code = 0
+    latency = 0
+    bytes_out = 0
+    bytes_in = 0
+    seq = 0
+    error = None
+    body = b''
+
+    field = -1
+    while True:
+        first = message[pos]
+        if first < 128:
+            delta = first
+            pos += 1
+        else:
+            end = pos + 1 + 256 - first
+            delta = int.from_bytes(message[pos + 1 : end], 'big')
+            pos = end
+        if delta == 0:
+            break
+        field += delta
+        if field >= n_used:
+            # remaining fields (method, url, headers) are not used
+            break
+
+        # every field used is a uint or begins with a uint length
+        column = layout[field]
+        start = pos
+        first = message[pos]
+        if first < 128:
+            value = first
+            pos += 1
+        else:
+            end = pos + 1 + 256 - first
+            value = int.from_bytes(message[pos + 1 : end], 'big')
+            pos = end
+
+        if column == _timestamp_column:
+            timestamp = _decode_time(message[pos : pos + value])
+            pos += value
+        elif column == _status_code_column:
+            status_code = value
+        elif column == _latency_column:
+            latency = ~(value >> 1) if value & 1 else value >> 1
+        elif column == _bytes_out_column:
+            bytes_out = value
+        elif column == _bytes_in_column:
+            bytes_in = value
+        elif column == _index_column:
+            seq = value
+        elif column == _error_column:
+            error = bytes(message[pos : pos + value]).decode()
+            pos += value
+        elif column == _response_column:
+            body = bytes(message[pos : pos + value])
+            pos += value
+        else:
+            field_type_id = decoder['types'][type_id]['fields'][field][1]
+            pos = _skip_value(message, start, field_type_id, decoder['types'])
+
+    columns['timestamp'].append(timestamp)
+    columns['status_code'].append(status_code)
+    columns['latency'].append(latency)
+    columns['bytes_out'].append(bytes_out)
+    columns['bytes_in'].append(bytes_in)
+    columns['index'].append(seq)
+    columns['error'].append(error)
+    columns['response'].append(body)
+
+
+def _get_result_layout(
+    type_id: int, types: typing.Mapping[int, _GobType]
+) -> list[int]:
+    """map each field of Result struct to a column, up to last used field"""
+    gob_type = types.get(type_id)
+    if gob_type is None or gob_type['kind'] != 'struct':
+        raise Exception('vegeta output contains value of unknown type')
+
+    layout = []
+    for name, field_type_id in gob_type['fields']:
+        column = _result_fields.get(name, _skip_column)
+        if column == _timestamp_column:
+            field_type = types.get(field_type_id)
+            valid = (
+                field_type is not None and field_type['kind'] == 'gobencoder'
+            )
+        elif column == _latency_column:
+            valid = field_type_id == _int_id
+        elif column in (_error_column, _response_column):
+            valid = field_type_id in (_string_id, _bytes_id)
+        elif column != _skip_column:
+            valid = field_type_id == _uint_id
+        else:
+            valid = True
+        if not valid:
+            raise Exception('unexpected type for vegeta result field ' + name)
+        layout.append(column)
+    while len(layout) > 0 and layout[-1] == _skip_column:
+        layout.pop()
+    return layout
+
+
+def _decode_time(encoded: memoryview) -> int:
+    """decode binary-marshaled go time.Time to unix timestamp in nanoseconds"""
+    if len(encoded) < 15 or encoded[0] not in (1, 2):
+        raise Exception('invalid time encoding in vegeta output')
+    seconds = int.from_bytes(encoded[1:9], 'big', signed=True)
+    nanoseconds = int.from_bytes(encoded[9:13], 'big')
+    return (seconds - _go_unix_offset) * 1_000_000_000 + nanoseconds
+
+
+def _skip_value(
+    message: memoryview,
+    pos: int,
+    type_id: int,
+    types: typing.Mapping[int, _GobType],
+) -> int:
+    """skip over a value of the given type, returning the new position"""
+    if type_id in (_bool_id, _int_id, _uint_id, _float_id):
+        return _read_uint(message, pos)[1]
+    elif type_id in (_bytes_id, _string_id):
+        length, pos = _read_uint(message, pos)
+        return pos + length
+    elif type_id == _complex_id:
+        pos = _read_uint(message, pos)[1]
+        return _read_uint(message, pos)[1]
+
+    gob_type = types.get(type_id)
+    if gob_type is None:
+        raise Exception('unknown gob type id: ' + str(type_id))
+    kind = gob_type['kind']
+    if kind == 'gobencoder':
+        length, pos = _read_uint(message, pos)
+        return pos + length
+    elif kind in ('slice', 'array'):
+        count, pos = _read_uint(message, pos)
+        for i in range(count):
+            pos = _skip_value(message, pos, gob_type['elem'], types)
+        return pos
+    elif kind == 'map':
+        count, pos = _read_uint(message, pos)
+        for i in range(count):
+            pos = _skip_value(message, pos, gob_type['key'], types)
+            pos = _skip_value(message, pos, gob_type['elem'], types)
+        return pos
+    elif kind == 'struct':
+        fields = gob_type['fields']
+        field = -1
+        while True:
+            delta, pos = _read_uint(message, pos)
+            if delta == 0:
+                return pos
+            field += delta
+            pos = _skip_value(message, pos, fields[field][1], types)
+    else:
+        raise Exception('unknown gob type kind: ' + str(kind))
+
+
+#
+# # type definitions
+#
+
+
+def _read_wire_type(message: memoryview, pos: int) -> _GobType:
+    """read gob wireType, a struct with one field set for the type's kind
+
+    wireType fields: ArrayT, SliceT, StructT, MapT, GobEncoderT,
+    BinaryMarshalerT, TextMarshalerT
+    """
+    kinds: list[typing.Any] = [
+        'array',
+        'slice',
+        'struct',
+        'map',
+        'gobencoder',
+        'gobencoder',
+        'gobencoder',
+    ]
+    gob_type: _GobType = {
+        'kind': 'struct',
+        'name': '',
+        'fields': [],
+        'elem': 0,
+        'key': 0,
+    }
+    field = -1
+    while True:
+        delta, pos = _read_uint(message, pos)
+        if delta == 0:
+            return gob_type
+        field += delta
+        gob_type['kind'] = kinds[field]
+        pos = _read_type_body(message, pos, gob_type)
+
+
+def _read_type_body(message: memoryview, pos: int, gob_type: _GobType) -> int:
+    """read arrayType, sliceType, structType, mapType, or gobEncoderType
+
+    every one begins with a CommonType, remaining fields depend on kind:
+    - arrayType: Elem, Len
+    - sliceType: Elem
+    - structType: Field
+    - mapType: Key, Elem
+    """
+    kind = gob_type['kind']
+    field = -1
+    while True:
+        delta, pos = _read_uint(message, pos)
+        if delta == 0:
+            return pos
+        field += delta
+        if field == 0:
+            pos = _read_common_type(message, pos, gob_type)
+        elif kind == 'struct' and field == 1:
+            count, pos = _read_uint(message, pos)
+            for i in range(count):
+                name, field_type_id, pos = _read_field_type(message, pos)
+                gob_type['fields'].append((name, field_type_id))
+        elif kind == 'map' and field == 1:
+            gob_type['key'], pos = _read_int(message, pos)
+        elif kind == 'map' and field == 2:
+            gob_type['elem'], pos = _read_int(message, pos)
+        elif kind in ('slice', 'array') and field == 1:
+            gob_type['elem'], pos = _read_int(message, pos)
+        elif kind == 'array' and field == 2:
+            pos = _read_uint(message, pos)[1]
+        else:
+            raise Exception('invalid gob type definition')
+
+
+def _read_common_type(
+    message: memoryview, pos: int, gob_type: _GobType
+) -> int:
+    """read CommonType struct: Name, Id"""
+    field = -1
+    while True:
+        delta, pos = _read_uint(message, pos)
+        if delta == 0:
+            return pos
+        field += delta
+        if field == 0:
+            length, pos = _read_uint(message, pos)
+            gob_type['name'] = bytes(message[pos : pos + length]).decode()
+            pos += length
+        elif field == 1:
+            pos = _read_uint(message, pos)[1]
+        else:
+            raise Exception('invalid gob type definition')
+
+
+def _read_field_type(message: memoryview, pos: int) -> tuple[str, int, int]:
+    """read fieldType struct: Name, Id"""
+    name = ''
+    type_id = 0
+    field = -1
+    while True:
+        delta, pos = _read_uint(message, pos)
+        if delta == 0:
+            return name, type_id, pos
+        field += delta
+        if field == 0:
+            length, pos = _read_uint(message, pos)
+            name = bytes(message[pos : pos + length]).decode()
+            pos += length
+        elif field == 1:
+            type_id, pos = _read_int(message, pos)
+        else:
+            raise Exception('invalid gob type definition')
+
+
+#
+# # integers
+#
+
+
+def _read_uint(data: memoryview, pos: int) -> tuple[int, int]:
+    """read gob unsigned int, either 1 byte or a negated byte count + bytes"""
+    first = data[pos]
+    if first < 128:
+        return first, pos + 1
+    end = pos + 1 + 256 - first
+    return int.from_bytes(data[pos + 1 : end], 'big'), end
+
+
+def _read_int(data: memoryview, pos: int) -> tuple[int, int]:
+    """read gob signed int, stored as uint with sign in the lowest bit"""
+    value, pos = _read_uint(data, pos)
+    if value & 1:
+        return ~(value >> 1), pos
+    else:
+        return value >> 1, pos
@@ -0,0 +1,458 @@
+"""websocket load testing engine for json-rpc nodes
+
+- pool of persistent websocket connections, used round-robin
+- many requests in flight per connection, responses are matched by id
+- same open-loop pacer and closed-loop workers as the asyncio engine
+
+requests are renumbered on the wire so that ids are unique per connection.
+a response counts as a 200 response, since websocket messages have no status
+"""
+from __future__ import annotations
+
+import typing
+
+from ... import spec
+from . import asyncio_engine
+from . import deep_utils
+from . import load_test_construction
+
+if typing.TYPE_CHECKING:
+    import asyncio
+
+    class _WebsocketConnection(typing.TypedDict):
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+        pending: dict[int, asyncio.Future[bytes]]
+        receiver: asyncio.Task[None]
+
+    class _WebsocketPool(typing.TypedDict):
+        url: str
+        connections: list[_WebsocketConnection]
+        n_requests: int
+
+
+default_n_connections = 4
+default_timeout = 30
+
+_websocket_guid = b'258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+_opcode_continuation = 0x0
+_opcode_text = 0x1
+_opcode_binary = 0x2
+_opcode_close = 0x8
+_opcode_ping = 0x9
+_opcode_pong = 0xA
+
+
+def run_websocket_attack(
+    *,
+    url: str,
+    rate: int,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    vegeta_args: str | None = None,
+    verbose: bool = False,
+    include_deep_output: typing.Sequence[spec.DeepOutput] | None = None,
+    vegeta_processes: int | None = None,
+    concurrency: int | None = None,
+    client_config: spec.ClientConfig | None = None,
+    schedule: typing.Sequence[float] | None = None,
+    n_connections: int = default_n_connections,
+    timeout: float = default_timeout,
+) -> spec.LoadTestOutputDatum:
+    import asyncio
+
+    if vegeta_args is not None:
+        raise Exception('vegeta_args not supported by websocket engine')
+    if vegeta_processes is not None:
+        raise Exception('vegeta_processes not supported by websocket engine')
+    if client_config is not None:
+        raise Exception('client_config only supported by vegeta engine')
+    if include_deep_output is None:
+        include_deep_output = []
+    if 'raw' in include_deep_output:
+        raise Exception('raw deep output only supported by vegeta engine')
+    if n_connections < 1:
+        raise Exception('n_connections must be at least 1')
+
+    if verbose:
+        print('running websocket attack...')
+        if concurrency is not None:
+            print('- concurrency:', concurrency)
+        elif schedule is not None:
+            print('- replaying', len(schedule), 'calls')
+        else:
+            print('- rate:', rate)
+        print('- duration:', duration)
+        print('- connections:', n_connections)
+
+    records = asyncio.run(
+        _async_websocket_attack(
+            url=url,
+            rate=rate,
+            concurrency=concurrency,
+            calls=calls,
+            duration=duration,
+            n_connections=n_connections,
+            timeout=timeout,
+            schedule=schedule,
+        )
+    )
+    df = asyncio_engine._records_to_dataframe(records, n_calls=len(calls))
+    if schedule is not None:
+        df = deep_utils._add_scheduled_timestamps(df, rate, schedule=schedule)
+
+    return deep_utils._create_report_from_dataframe(
+        df=df,
+        target_rate=rate,
+        target_duration=duration,
+        include_deep_output=include_deep_output,
+        calls=calls,
+        concurrency=concurrency,
+    )
+
+
+async def _async_websocket_attack(
+    *,
+    url: str,
+    rate: int,
+    concurrency: int | None,
+    calls: typing.Sequence[typing.Any],
+    duration: int,
+    n_connections: int,
+    timeout: float,
+    schedule: typing.Sequence[float] | None = None,
+) -> asyncio_engine._ResponseRecords:
+    records = asyncio_engine._create_records()
+    if len(calls) == 0:
+        return records
+    pool = await _open_websocket_pool(url, n_connections)
+
+    async def send(call: typing.Any, index: int) -> None:
+        await _send_websocket_call(
+            call=call,
+            index=index,
+            pool=pool,
+            records=records,
+            timeout=timeout,
+        )
+
+    try:
+        if concurrency is not None:
+            await asyncio_engine._run_closed_loop(
+                concurrency=concurrency,
+                calls=calls,
+                duration=duration,
+                send=send,
+            )
+        else:
+            await asyncio_engine._pace_calls(
+                rate=rate,
+                calls=calls,
+                duration=duration,
+                send=send,
+                schedule=schedule,
+            )
+    finally:
+        await _close_websocket_pool(pool)
+
+    return records
+
+
+#
+# # requests
+#
+
+
+async def _send_websocket_call(
+    *,
+    call: typing.Any,
+    index: int,
+    pool: _WebsocketPool,
+    records: asyncio_engine._ResponseRecords,
+    timeout: float,
+) -> None:
+    import asyncio
+    import time
+
+    # renumber call so that its id is unique on its connection
+    connection = pool['connections'][index % len(pool['connections'])]
+    request_ids, body = _encode_websocket_call(call, pool)
+    future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+    for request_id in request_ids:
+        connection['pending'][request_id] = future
+
+    status_code = 0
+    response = b''
+    error = None
+    timestamp = time.time_ns()
+    t_start = time.perf_counter_ns()
+    try:
+        if connection['receiver'].done():
+            raise ConnectionError('connection closed by server')
+        connection['writer'].write(_encode_frame(_opcode_text, body))
+        response = await asyncio.wait_for(future, timeout=timeout)
+        status_code = 200
+    except asyncio.TimeoutError:
+        error = 'timeout exceeded after ' + str(timeout) + 's'
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    finally:
+        for request_id in request_ids:
+            connection['pending'].pop(request_id, None)
+    latency = time.perf_counter_ns() - t_start
+
+    asyncio_engine._add_record(
+        records,
+        timestamp=timestamp,
+        status_code=status_code,
+        latency=latency,
+        bytes_out=len(body),
+        response=response,
+        error=error,
+        index=index,
+    )
+
+
+def _encode_websocket_call(
+    call: typing.Any, pool: _WebsocketPool
+) -> tuple[typing.Sequence[int], bytes]:
+    """encode call with fresh ids, returning (ids, encoded call)"""
+    import orjson
+
+    call = load_test_construction._decode_call(call)
+    if isinstance(call, list):
+        batch = []
+        for item in call:
+            pool['n_requests'] += 1
+            batch.append(dict(item, id=pool['n_requests']))
+        return [item['id'] for item in batch], orjson.dumps(batch)
+    elif isinstance(call, dict) and 'url' not in call:
+        pool['n_requests'] += 1
+        request_id = pool['n_requests']
+        return [request_id], orjson.dumps(dict(call, id=request_id))
+    else:
+        raise Exception('websocket engine only supports json-rpc calls')
+
+
+def _get_response_id(message: bytes) -> int | None:
+    """get id of response, or of the first response in a batch"""
+    import orjson
+
+    try:
+        decoded = orjson.loads(message)
+    except orjson.JSONDecodeError:
+        return None
+    if isinstance(decoded, list):
+        if len(decoded) == 0:
+            return None
+        decoded = decoded[0]
+    if isinstance(decoded, dict):
+        response_id = decoded.get('id')
+        if isinstance(response_id, int):
+            return response_id
+    return None
+
+
+async def _receive_responses(connection: _WebsocketConnection) -> None:
+    """resolve pending requests as their responses arrive"""
+    pending = connection['pending']
+    try:
+        while True:
+            message = await _read_message(
+                connection['reader'], connection['writer']
+            )
+            if message is None:
+                break
+            response_id = _get_response_id(message)
+            future = pending.get(response_id)  # type: ignore
+            if future is not None and not future.done():
+                future.set_result(message)
+        error = ConnectionError('connection closed by server')
+    except Exception as e:
+        error = ConnectionError(str(e) or type(e).__name__)
+
+    for future in pending.values():
+        if not future.done():
+            future.set_exception(error)
+
+
+#
+# # connections
+#
+
+
+async def _open_websocket_pool(url: str, n_connections: int) -> _WebsocketPool:
+    import asyncio
+
+    connections = []
+    for i in range(n_connections):
+        reader, writer = await _open_websocket(url)
+        connection: _WebsocketConnection = {
+            'reader': reader,
+            'writer': writer,
+            'pending': {},
+            'receiver': None,  # type: ignore
+        }
+        connection['receiver'] = asyncio.ensure_future(
+            _receive_responses(connection)
+        )
+        connections.append(connection)
+    return {'url': url, 'connections': connections, 'n_requests': 0}
+
+
+async def _close_websocket_pool(pool: _WebsocketPool) -> None:
+    import asyncio
+
+    for connection in pool['connections']:
+        try:
+            connection['writer'].write(_encode_frame(_opcode_close, b''))
+        except Exception:
+            pass
+        connection['receiver'].cancel()
+        connection['writer'].close()
+    await asyncio.gather(
+        *[connection['receiver'] for connection in pool['connections']],
+        return_exceptions=True,
+    )
+
+
+async def _open_websocket(
+    url: str,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """open connection and perform websocket opening handshake"""
+    import asyncio
+    import base64
+    import hashlib
+    import os
+    import urllib.parse
+
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.scheme not in ('ws', 'wss'):
+        raise Exception('websocket engine only supports ws and wss urls')
+    if parsed.hostname is None:
+        raise Exception('could not parse host from url: ' + url)
+    if parsed.port is not None:
+        port = parsed.port
+    elif parsed.scheme == 'wss':
+        port = 443
+    else:
+        port = 80
+
+    if parsed.scheme == 'wss':
+        import ssl
+
+        reader, writer = await asyncio.open_connection(
+            parsed.hostname,
+            port,
+            ssl=ssl.create_default_context(),
+            server_hostname=parsed.hostname,
+        )
+    else:
+        reader, writer = await asyncio.open_connection(parsed.hostname, port)
+
+    path = parsed.path or '/'
+    if parsed.query:
+        path += '?' + parsed.query
+    key = base64.b64encode(os.urandom(16))
+    lines = [
+        'GET ' + path + ' HTTP/1.1',
+        'Host: ' + parsed.netloc.rsplit('@', 1)[-1],
+        'Upgrade: websocket',
+        'Connection: Upgrade',
+        'Sec-WebSocket-Key: ' + key.decode(),
+        'Sec-WebSocket-Version: 13',
+    ]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode())
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = status_line.decode('latin-1').split(' ')
+    if len(status) < 2 or status[1] != '101':
+        writer.close()
+        raise Exception(
+            'websocket handshake failed: ' + status_line.decode().strip()
+        )
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    accept = base64.b64encode(hashlib.sha1(key + _websocket_guid).digest())
+    if headers.get('sec-websocket-accept') != accept.decode():
+        writer.close()
+        raise Exception('websocket handshake failed: invalid accept key')
+
+    return reader, writer
+
+
+#
+# # frames
+#
+
+
+def _encode_frame(opcode: int, payload: bytes) -> bytes:
+    """encode single masked frame, as required for client frames"""
+    import os
+    import struct
+
+    n = len(payload)
+    if n < 126:
+        header = struct.pack('!BB', 0x80 | opcode, 0x80 | n)
+    elif n < 2**16:
+        header = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, n)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, n)
+    mask = os.urandom(4)
+    return header + mask + _apply_mask(payload, mask)
+
+
+def _apply_mask(payload: bytes, mask: bytes) -> bytes:
+    """xor payload with repeating mask, as one big integer operation"""
+    n = len(payload)
+    if n == 0:
+        return b''
+    repeated = (mask * (n // 4 + 1))[:n]
+    masked = int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')
+    return masked.to_bytes(n, 'big')
+
+
+async def _read_message(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> bytes | None:
+    """read next data message, answering pings, or None if connection closed"""
+    import asyncio
+    import struct
+
+    fragments = []
+    while True:
+        try:
+            head = await reader.readexactly(2)
+        except asyncio.IncompleteReadError:
+            return None
+        fin = head[0] & 0x80
+        opcode = head[0] & 0x0F
+        length = head[1] & 0x7F
+        if length == 126:
+            (length,) = struct.unpack('!H', await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack('!Q', await reader.readexactly(8))
+        if head[1] & 0x80:
+            mask = await reader.readexactly(4)
+            payload = _apply_mask(await reader.readexactly(length), mask)
+        else:
+            payload = await reader.readexactly(length)
+
+        if opcode == _opcode_ping:
+            writer.write(_encode_frame(_opcode_pong, payload))
+        elif opcode == _opcode_pong:
+            pass
+        elif opcode == _opcode_close:
+            return None
+        elif opcode in (_opcode_text, _opcode_binary, _opcode_continuation):
+            fragments.append(payload)
+            if fin:
+                return b''.join(fragments)
+        else:
+            raise Exception('unknown websocket opcode: ' + str(opcode))
@@ -0,0 +1,77 @@
+import http.server
+import json
+import threading
+
+import pytest
+
+import flood
+
+
+class JsonRpcHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        request = json.loads(self.rfile.read(length))
+        if request['id'] % 2 == 0:
+            response = {'jsonrpc': '2.0', 'id': request['id'], 'result': '0x1'}
+        else:
+            response = {'jsonrpc': '2.0', 'id': request['id'], 'result': None}
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_json_rpc_url():
+    pytest.importorskip('polars')
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), JsonRpcHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:' + str(server.server_address[1])
+    server.shutdown()
+
+
+def test_asyncio_attack(local_json_rpc_url):
+    calls = [
+        {'jsonrpc': '2.0', 'id': i, 'method': 'eth_blockNumber', 'params': []}
+        for i in range(20)
+    ]
+    result = flood.tests.load_tests.run_attack(
+        url=local_json_rpc_url,
+        rate=20,
+        calls=calls,
+        duration=1,
+        include_deep_output=['metrics'],
+        engine='asyncio',
+    )
+    assert result['requests'] == 20
+    assert result['success'] == 1.0
+    assert result['status_codes'] == {'200': 20}
+    assert result['deep_metrics']['all']['n_rpc_errors'] == 10
+
+
+def test_asyncio_closed_loop_attack(local_json_rpc_url):
+    calls = [
+        {'jsonrpc': '2.0', 'id': i, 'method': 'eth_blockNumber', 'params': []}
+        for i in range(4)
+    ]
+    result = flood.tests.load_tests.run_attack(
+        url=local_json_rpc_url,
+        rate=0,
+        calls=calls,
+        duration=1,
+        engine='asyncio',
+        concurrency=2,
+    )
+    assert result['concurrency'] == 2
+    # calls are reused until the duration elapses
+    assert result['requests'] > len(calls)
+    assert result['success'] == 1.0
+
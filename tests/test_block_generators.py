@@ -0,0 +1,134 @@
+import pytest
+
+from flood.generators.object_generators import block_generators
+
+
+def test_generate_block_numbers():
+    pytest.importorskip('numpy')
+
+    # without replacement, drawn directly from the range
+    blocks = block_generators.generate_block_numbers(
+        n=10_000, start_block=0, end_block=16_000_000, random_seed=0
+    )
+    assert len(set(blocks)) == 10_000
+    assert all(0 <= block <= 16_000_000 for block in blocks)
+    assert blocks == block_generators.generate_block_numbers(
+        n=10_000, start_block=0, end_block=16_000_000, random_seed=0
+    )
+
+    # dense samples cover the whole range
+    blocks = block_generators.generate_block_numbers(
+        n=10, start_block=5, end_block=14, random_seed=0, sort=True
+    )
+    assert blocks == list(range(5, 15))
+
+    # more samples than blocks are drawn with replacement
+    blocks = block_generators.generate_block_numbers(
+        n=100, start_block=5, end_block=14, random_seed=0
+    )
+    assert len(blocks) == 100 and set(blocks) == set(range(5, 15))
+
+
+def test_generate_block_numbers_by_recency():
+    np = pytest.importorskip('numpy')
+
+    # half of samples are within one half life of end_block
+    blocks = block_generators.generate_block_numbers(
+        n=10_000,
+        start_block=0,
+        end_block=1_000_000,
+        random_seed=0,
+        replace=True,
+        recency_half_life=1000,
+    )
+    ages = 1_000_000 - np.array(blocks)
+    assert ages.min() >= 0
+    assert np.median(ages) == pytest.approx(1000, rel=0.1)
+
+    # without replacement, recent blocks are exhausted first
+    blocks = block_generators.generate_block_numbers(
+        n=1000,
+        start_block=0,
+        end_block=1_000_000,
+        random_seed=0,
+        replace=False,
+        recency_half_life=100_000,
+    )
+    ages = 1_000_000 - np.array(blocks)
+    assert len(set(blocks)) == 1000
+    assert np.median(ages) == pytest.approx(100_000, rel=0.15)
+
+
+def test_generate_block_numbers_by_zipf():
+    pytest.importorskip('numpy')
+
+    # popular blocks repeat by default
+    blocks = block_generators.generate_block_numbers(
+        n=100_000,
+        start_block=0,
+        end_block=16_000_000,
+        random_seed=0,
+        distribution='zipf:2',
+    )
+    assert len(blocks) == 100_000
+    assert blocks.count(16_000_000) > 50_000
+
+
+def test_generate_block_ranges():
+    pytest.importorskip('numpy')
+
+    ranges = block_generators.generate_block_ranges(
+        n=100_000,
+        range_size=10,
+        start_block=10_000_000,
+        end_block=12_000_000,
+        random_seed=0,
+        method='gaps',
+    )
+    assert len(ranges) == 100_000
+    ranges = sorted(ranges)
+    assert ranges[0][0] >= 10_000_000 and ranges[-1][1] <= 12_000_000
+    assert all(end - start == 10 for start, end in ranges)
+    assert all(b[0] > a[1] for a, b in zip(ranges[:-1], ranges[1:]))
+
+    # ranges can fill the block bounds exactly
+    ranges = block_generators.generate_block_ranges(
+        n=3,
+        range_size=1,
+        start_block=0,
+        end_block=5,
+        random_seed=0,
+        sort=True,
+        method='gaps',
+    )
+    assert ranges == [(0, 1), (2, 3), (4, 5)]
+    with pytest.raises(Exception):
+        block_generators.generate_block_ranges(
+            n=3,
+            range_size=2,
+            start_block=0,
+            end_block=5,
+            random_seed=0,
+            method='gaps',
+        )
+
+
+def test_generate_block_ranges_individual_is_seeded(monkeypatch):
+    import itertools
+    import time
+
+    pytest.importorskip('numpy')
+
+    # unseeded draws would differ between calls
+    clock = itertools.count(1_000_000)
+    monkeypatch.setattr(time, 'time', lambda: next(clock))
+    kwargs = dict(
+        n=100,
+        range_size=10,
+        start_block=0,
+        end_block=100_000,
+        random_seed=0,
+        method='individual',
+    )
+    ranges = block_generators.generate_block_ranges(**kwargs)
+    assert ranges == block_generators.generate_block_ranges(**kwargs)
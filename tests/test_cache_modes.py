@@ -0,0 +1,91 @@
+import pytest
+
+import flood
+from flood.tests.load_tests import cache_modes
+
+
+def _generate(test_name='move_get_account', **kwargs):
+    return flood.generate_test(
+        test_name=test_name,
+        rates=[10, 10],
+        durations=[2, 2],
+        network='',
+        flood_version=flood.get_flood_version(),
+        random_seed=0,
+        **kwargs,
+    )
+
+
+def _get_keys(calls):
+    return [cache_modes._get_call_key(call) for call in calls]
+
+
+def test_cold_cache_mode():
+    pytest.importorskip('numpy')
+
+    test = _generate(cache_mode='cold')
+    first, second = [_get_keys(attack['calls']) for attack in test['attacks']]
+    assert len(first) == len(set(first)) == 20
+    assert len(second) == len(set(second)) == 20
+    assert test['test_parameters']['n_unique_calls'] == [20, 20]
+
+    # test parameters regenerate the same test
+    regenerated = flood.generate_test(**test['test_parameters'])
+    assert regenerated['attacks'][1]['calls'] == test['attacks'][1]['calls']
+
+    # identical calls cannot be sent cold
+    with pytest.raises(Exception):
+        _generate('move_get_ledger_info', cache_mode='cold')
+
+
+def test_cold_cache_mode_with_repeated_parameters():
+    pytest.importorskip('numpy')
+
+    # calls are sampled with replacement, so some parameters repeat
+    kwargs = dict(
+        test_name='move_get_block_by_height',
+        rates=[2000],
+        durations=[10],
+        network='',
+        flood_version=flood.get_flood_version(),
+        random_seed=0,
+    )
+    test = flood.generate_test(**kwargs)
+    assert len(set(_get_keys(test['attacks'][0]['calls']))) < 20000
+
+    # cold mode generates more calls to fill the attack
+    test = flood.generate_test(cache_mode='cold', **kwargs)
+    keys = _get_keys(test['attacks'][0]['calls'])
+    assert len(keys) == len(set(keys)) == 20000
+    assert test['test_parameters']['n_unique_calls'] == [20000]
+
+
+def test_warm_cache_mode():
+    pytest.importorskip('numpy')
+
+    test = _generate(cache_mode='warm', working_set_size=5)
+    first, second = [_get_keys(attack['calls']) for attack in test['attacks']]
+    assert len(first) == 20 and len(set(first)) == 5
+    assert first == second
+    assert test['test_parameters']['n_unique_calls'] == [5, 5]
+
+    # working set is limited by the distinct calls available
+    test = _generate(
+        'move_get_ledger_info', cache_mode='warm', working_set_size=5
+    )
+    assert test['test_parameters']['n_unique_calls'] == [1, 1]
+
+    with pytest.raises(Exception):
+        _generate(cache_mode='warm')
+    with pytest.raises(Exception):
+        _generate(working_set_size=5)
+
+
+def test_get_distinct_calls():
+    calls = [
+        b'{"jsonrpc":"2.0","id":1,"method":"eth_chainId","params":[]}',
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'eth_chainId', 'params': []},
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'eth_blockNumber'},
+    ]
+    assert cache_modes.get_distinct_calls(calls) == [calls[0], calls[2]]
+    assert cache_modes.get_distinct_calls(calls, limit=1) == [calls[0]]
@@ -0,0 +1,161 @@
+import pytest
+
+import flood
+from flood.generators.test_generators import call_set_cache
+
+
+def _create_attacks():
+    rpc_calls = [
+        {'jsonrpc': '2.0', 'id': i, 'method': 'eth_blockNumber', 'params': []}
+        for i in range(5)
+    ]
+    rest_calls = [
+        {
+            'method': 'GET',
+            'url': '/v1/blocks/by_height/' + str(i),
+            'header': {'Content-Type': ['application/json']},
+            'body': '',
+        }
+        for i in range(3)
+    ]
+    return [
+        {
+            'rate': 5,
+            'duration': 1,
+            'calls': rpc_calls,
+            'vegeta_args': None,
+            'concurrency': None,
+            'client_config': None,
+        },
+        {
+            'rate': 3,
+            'duration': 1,
+            'calls': rest_calls,
+            'vegeta_args': None,
+            'concurrency': None,
+            'client_config': None,
+        },
+    ]
+
+
+def test_call_set_cache(tmp_path):
+    import orjson
+
+    pytest.importorskip('numpy')
+    cache_dir = str(tmp_path)
+    attacks = _create_attacks()
+    assert call_set_cache.load_cached_attacks(cache_dir, 'key') is None
+    assert call_set_cache.save_cached_attacks(cache_dir, 'key', attacks)
+
+    loaded = call_set_cache.load_cached_attacks(cache_dir, 'key')
+    assert loaded is not None
+    assert [attack['rate'] for attack in loaded] == [5, 3]
+
+    # json-rpc calls are loaded as request bodies
+    rpc_calls = loaded[0]['calls']
+    assert all(isinstance(call, bytes) for call in rpc_calls)
+    assert [orjson.loads(call) for call in rpc_calls] == attacks[0]['calls']
+
+    # other calls are loaded as they were
+    assert loaded[1]['calls'] == attacks[1]['calls']
+
+
+def test_call_cache_key(monkeypatch):
+    kwargs = dict(
+        test_name='eth_getBlockByNumber',
+        rates=[10, 100],
+        durations=[30, 30],
+        vegeta_args=None,
+        network='ethereum',
+    )
+    key = call_set_cache.get_call_cache_key(random_seed=0, **kwargs)
+    assert key == call_set_cache.get_call_cache_key(random_seed=0, **kwargs)
+    assert key != call_set_cache.get_call_cache_key(random_seed=1, **kwargs)
+    assert call_set_cache.get_call_cache_key(random_seed=None, **kwargs) is None
+
+    monkeypatch.delenv('FLOOD_CACHE_DIR', raising=False)
+    assert call_set_cache.get_call_cache_dir(None) is None
+    assert call_set_cache.get_call_cache_dir('out').endswith('call_cache')
+    monkeypatch.setenv('FLOOD_CACHE_DIR', '/tmp/flood_cache')
+    assert call_set_cache.get_call_cache_dir('out') == '/tmp/flood_cache'
+
+
+def test_generate_test_from_cache(tmp_path, monkeypatch):
+    pytest.importorskip('numpy')
+    kwargs = dict(
+        test_name='move_get_account',
+        rates=[10],
+        durations=[2],
+        network='',
+        flood_version=flood.get_flood_version(),
+        random_seed=0,
+        cache_dir=str(tmp_path),
+    )
+    test = flood.generate_test(**kwargs)
+
+    def fail(**kwargs):
+        raise Exception('calls should be loaded from cache')
+
+    monkeypatch.setattr(
+        flood.generators, 'generate_test_move_get_account', fail
+    )
+    cached = flood.generate_test(**kwargs)
+    assert cached['attacks'][0]['calls'] == test['attacks'][0]['calls']
+
+
+def test_generate_test_without_seed(tmp_path):
+    pytest.importorskip('numpy')
+    test = flood.generate_test(
+        test_name='move_get_account',
+        rates=[10],
+        durations=[2],
+        network='',
+        flood_version=flood.get_flood_version(),
+        cache_dir=str(tmp_path),
+    )
+    random_seed = test['test_parameters']['random_seed']
+    assert isinstance(random_seed, int)
+    key = call_set_cache.get_call_cache_key(
+        test_name='move_get_account',
+        random_seed=random_seed,
+        rates=[10],
+        durations=[2],
+        vegeta_args=None,
+        network='',
+    )
+    assert key is not None
+    assert call_set_cache.load_cached_attacks(str(tmp_path), key) is not None
+
+
+def test_generate_test_with_distribution(tmp_path):
+    pytest.importorskip('numpy')
+    kwargs = dict(
+        test_name='move_get_account',
+        rates=[10],
+        durations=[2],
+        random_seed=0,
+        network='',
+        flood_version=flood.get_flood_version(),
+        cache_dir=str(tmp_path),
+    )
+    uniform = flood.generate_test(**kwargs)  # type: ignore
+    skewed = flood.generate_test(
+        distribution='zipf:2', **kwargs  # type: ignore
+    )
+    assert uniform['test_parameters']['distribution'] is None
+    assert skewed['test_parameters']['distribution'] == 'zipf:2'
+    key_kwargs = dict(
+        test_name='move_get_account',
+        random_seed=0,
+        rates=[10],
+        durations=[2],
+        vegeta_args=None,
+        network='',
+    )
+    uniform_key = call_set_cache.get_call_cache_key(
+        **key_kwargs  # type: ignore
+    )
+    skewed_key = call_set_cache.get_call_cache_key(
+        distribution='zipf:2', **key_kwargs  # type: ignore
+    )
+    assert uniform_key != skewed_key
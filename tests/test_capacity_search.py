@@ -0,0 +1,70 @@
+import pytest
+
+from flood.tests.load_tests import capacity_search
+
+
+def _fake_probe(capacity):
+    def run_probe(*, rate, **kwargs):
+        success = 1.0 if rate <= capacity else 0.9
+        return {
+            'target_rate': [rate],
+            'actual_rate': [float(rate)],
+            'success': [success],
+            'p99': [0.01],
+        }
+
+    return run_probe
+
+
+@pytest.mark.parametrize('capacity', [10, 100, 1000, 3000])
+def test_search_finds_capacity(monkeypatch, capacity):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(capacity_search, '_run_probe', _fake_probe(capacity))
+    output, summary = capacity_search.run_capacity_search(
+        node='localhost:8545',
+        test_name='eth_getBlockByNumber',
+        initial_rate=16,
+        tolerance=0.01,
+    )
+    found = summary['capacity']
+    assert found is not None
+    assert capacity * 0.99 - 1 <= found <= capacity
+    assert all(
+        probe['passed'] == (probe['rate'] <= capacity)
+        for probe in summary['probes']
+    )
+    assert output['target_rate'] == sorted(output['target_rate'])
+
+
+def test_search_without_passing_rate(monkeypatch):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(capacity_search, '_run_probe', _fake_probe(0))
+    output, summary = capacity_search.run_capacity_search(
+        node='localhost:8545',
+        test_name='eth_getBlockByNumber',
+        initial_rate=16,
+    )
+    assert summary['capacity'] is None
+    assert summary['probes'][-1]['rate'] == 1
+
+
+def test_search_stops_at_max_rate(monkeypatch):
+    pytest.importorskip('numpy')
+    monkeypatch.setattr(capacity_search, '_run_probe', _fake_probe(10**9))
+    output, summary = capacity_search.run_capacity_search(
+        node='localhost:8545',
+        test_name='eth_getBlockByNumber',
+        initial_rate=16,
+        max_rate=100,
+    )
+    assert summary['capacity'] == 100
+    assert [probe['rate'] for probe in summary['probes']] == [16, 32, 64, 100]
+
+
+def test_meets_slo():
+    output = {'success': [0.9995], 'p99': [0.2]}
+    assert capacity_search.meets_slo(output, {'min_success': 0.999})
+    assert not capacity_search.meets_slo(
+        output, {'min_success': 0.999, 'max_p99': 0.1}
+    )
+    assert not capacity_search.meets_slo(output, {'min_success': 0.9999})
@@ -0,0 +1,48 @@
+import os
+import time
+
+import pytest
+
+from flood.tests.load_tests import client_monitor
+
+
+def _output(**kwargs):
+    output = {
+        'target_rate': 1000,
+        'concurrency': None,
+        'actual_rate': 999.0,
+        'client_cpu_mean': 0.2,
+        'client_sched_lag_max': 0.001,
+        'client_sockets_max': 10,
+    }
+    output.update(kwargs)
+    return output
+
+
+def test_client_monitor():
+    monitor = client_monitor.start_client_monitor(interval=0.05)
+    t_end = time.perf_counter() + 0.3
+    while time.perf_counter() < t_end:
+        pass
+    metrics = client_monitor.stop_client_monitor(monitor)
+    assert metrics['client_sched_lag_max'] >= 0
+    if os.path.isdir('/proc/self'):
+        assert 0 < metrics['client_cpu_max'] <= 1
+        assert metrics['client_cpu_mean'] <= metrics['client_cpu_max']
+        assert metrics['client_sockets_max'] >= 0
+
+
+@pytest.mark.parametrize(
+    'kwargs,n_reasons',
+    [
+        ({}, 0),
+        ({'actual_rate': 500.0}, 1),
+        ({'actual_rate': 500.0, 'concurrency': 8, 'target_rate': 0}, 0),
+        ({'client_cpu_mean': 0.95}, 1),
+        ({'client_sched_lag_max': 0.5, 'client_cpu_mean': None}, 1),
+        ({'actual_rate': 500.0, 'client_cpu_mean': 0.95}, 2),
+    ],
+)
+def test_saturation_reasons(kwargs, n_reasons):
+    reasons = client_monitor.get_saturation_reasons(_output(**kwargs))
+    assert len(reasons) == n_reasons
@@ -0,0 +1,88 @@
+import pytest
+
+import flood
+from flood.runners.single_runner import single_runner_execution
+from flood.tests.load_tests import client_sweep
+from flood.tests.load_tests import vegeta
+
+
+def test_get_client_configs():
+    configs = client_sweep.get_client_configs(
+        max_connections=[16, 64], workers=[10], keepalives=[True, False]
+    )
+    assert len(configs) == 4
+    assert configs[0] == {
+        'max_connections': 16,
+        'workers': 10,
+        'keepalive': True,
+    }
+    assert [config['keepalive'] for config in configs] == [
+        True,
+        True,
+        False,
+        False,
+    ]
+
+
+def test_summarize_client_sweep():
+    configs = client_sweep.get_client_configs(
+        max_connections=[1, 8, 64], workers=[10], keepalives=[True]
+    )
+    output = {
+        'client_config': configs,
+        'actual_rate': [100.0, 100.0, 100.0],
+        # one connection cannot keep up with the target rate
+        'throughput': [60.0, 99.5, 99.9],
+        'success': [1.0, 1.0, 1.0],
+        'p50': [0.5, 0.010, 0.012],
+        'p99': [0.9, 0.020, 0.030],
+    }
+    summary = client_sweep.summarize_client_sweep(output, rate=100)
+    assert [result['achieved_rate'] for result in summary['results']] == [
+        False,
+        True,
+        True,
+    ]
+    assert summary['best'] == configs[1]
+
+    output['throughput'] = [60.0, 60.0, 60.0]
+    summary = client_sweep.summarize_client_sweep(output, rate=100)
+    assert summary['best'] is None
+
+
+def test_split_client_limit():
+    assert vegeta._split_client_limit(None, 3) == [None, None, None]
+    assert vegeta._split_client_limit(10, 3) == [4, 3, 3]
+    assert vegeta._split_client_limit(2, 4) == [1, 1, 1, 1]
+
+
+def test_run_dispatches_sweep(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        single_runner_execution,
+        '_run_client_sweep',
+        lambda **kwargs: calls.append(kwargs),
+    )
+    flood.run(
+        test_name='eth_get_block_by_number',
+        mode='sweep',
+        rates=[100],
+        sweep_connections=[16, 64],
+        sweep_workers=[10],
+        sweep_keepalives=[False],
+    )
+    assert len(calls) == 1
+    assert calls[0]['rates'] == [100]
+    assert calls[0]['sweep_connections'] == [16, 64]
+    assert calls[0]['sweep_workers'] == [10]
+    assert calls[0]['sweep_keepalives'] == [False]
+
+
+def test_run_sweep_rejects_cache_mode():
+    with pytest.raises(Exception, match='sweep mode'):
+        flood.run(
+            test_name='eth_get_block_by_number',
+            mode='sweep',
+            rates=[100],
+            cache_mode='cold',
+        )
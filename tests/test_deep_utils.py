@@ -0,0 +1,168 @@
+import pytest
+
+from flood.tests.load_tests import deep_utils
+
+
+response_classes = [
+    (200, b'{"jsonrpc":"2.0","id":1,"result":"0x1"}', False, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":"0x1"}\n', False, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":null}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":null}\n', False, True),
+    (200, b'{"id":1,"result":null,"jsonrpc":"2.0"}', False, True),
+    (200, b'{"jsonrpc": "2.0", "id": 1, "result": null}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1,"error":{"code":-32000}}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":{"error":"0x"}}', False, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":{"a":null}}', False, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":  null}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":\nnull}', False, True),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":"0x1",}', True, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"result":"0x1" "0x2"}', True, False),
+    (200, b'{"jsonrpc":"2.0","id":"a","result":"0x1"}', False, False),
+    (200, b'{"jsonrpc":"2.0","id":1,"resu', True, False),
+    (200, b'', True, False),
+    (0, b'', False, False),
+    (500, b'{"jsonrpc":"2.0","id":1,"result":null}', False, False),
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 100_000])
+def test_add_error_columns(chunk_size, monkeypatch):
+    pl = pytest.importorskip('polars')
+
+    df = pl.DataFrame(
+        {
+            'status_code': [item[0] for item in response_classes],
+            'response': pl.Series(
+                [item[1] for item in response_classes], dtype=pl.Binary
+            ),
+        }
+    )
+    if chunk_size == 1:
+        # exercise the parallel json parse
+        classify = deep_utils._classify_responses
+        monkeypatch.setattr(
+            deep_utils,
+            '_classify_responses',
+            lambda responses: classify(responses, chunk_size=2),
+        )
+    df = deep_utils._add_error_columns(df)
+    assert df['invalid_json_error'].to_list() == [
+        item[2] for item in response_classes
+    ]
+    assert df['rpc_error'].to_list() == [item[3] for item in response_classes]
+
+
+def test_corrected_latencies():
+    pl = pytest.importorskip('polars')
+
+    # client sends 10 requests per second but stalls for 1s after request 6
+    t0 = 1_700_000_000 * 10**9
+    timestamps = [t0 + i * 10**8 + (10**9 if i >= 7 else 0) for i in range(10)]
+    df = pl.DataFrame(
+        {
+            'timestamp': timestamps,
+            'latency': [10**7] * 10,
+            'index': list(range(10)),
+        }
+    )
+    df = deep_utils._add_scheduled_timestamps(df, target_rate=10)
+    assert df['scheduled_timestamp'][0] == t0
+    metrics = deep_utils._compute_corrected_latency_metrics(df)
+    assert metrics['max_corrected'] == pytest.approx(1.01)
+    assert metrics['p50_corrected'] == pytest.approx(0.01)
+
+    # closed-loop attacks have no schedule
+    df = deep_utils._add_scheduled_timestamps(df, target_rate=0)
+    metrics = deep_utils._compute_corrected_latency_metrics(df)
+    assert metrics['p99_corrected'] is None
+
+
+@pytest.mark.parametrize('target_rate', [1000, 0])
+def test_streaming_timings(target_rate):
+    np = pytest.importorskip('numpy')
+    pl = pytest.importorskip('polars')
+
+    from flood.tests.load_tests import vegeta_gob
+
+    # client falls 50ms behind schedule for the last quarter of the attack
+    rng = np.random.default_rng(0)
+    n = 2000
+    index = np.arange(n)
+    timestamps = 1_700_000_000 * 10**9 + index * 10**6
+    timestamps += (index >= n * 3 // 4) * 5 * 10**7
+    timestamps += rng.integers(10**5, size=n)
+    latencies = rng.integers(10**5, 2 * 10**7, size=n)
+
+    # vegeta emits results as they complete
+    timings = deep_utils._start_streaming_timings(target_rate)
+    order = np.argsort(timestamps + latencies)
+    for start in range(0, n, 300):
+        rows = order[start : start + 300]
+        columns = vegeta_gob._create_columns()
+        columns['timestamp'].extend(timestamps[rows].tolist())
+        columns['latency'].extend(latencies[rows].tolist())
+        columns['index'].extend(index[rows].tolist())
+        deep_utils._add_streaming_timings(timings, columns)
+    corrected, in_flight = deep_utils._finish_streaming_timings(timings)
+
+    df = pl.DataFrame(
+        {'timestamp': timestamps, 'latency': latencies, 'index': index}
+    )
+    df = deep_utils._add_scheduled_timestamps(df, target_rate)
+    expected = deep_utils._compute_corrected_latency_metrics(df)
+    for name, value in expected.items():
+        if target_rate == 0:
+            assert value is None and corrected[name] is None
+        else:
+            assert corrected[name] == pytest.approx(value, rel=0.02)
+
+    # in flight counts are sampled every millisecond
+    expected_in_flight = deep_utils._compute_in_flight_metrics(df)
+    assert in_flight['mean_in_flight'] == pytest.approx(
+        expected_in_flight['mean_in_flight']
+    )
+    assert expected_in_flight['max_in_flight'] is not None
+    assert in_flight['max_in_flight'] is not None
+    assert (
+        expected_in_flight['max_in_flight'] - 3
+        <= in_flight['max_in_flight']
+        <= expected_in_flight['max_in_flight']
+    )
+
+
+def test_batch_responses():
+    pl = pytest.importorskip('polars')
+
+    responses = [
+        (200, b'[{"id":1,"result":"0x1"},{"id":2,"result":"0x2"}]', False, 2),
+        (200, b'[{"id":3,"result":"0x1"},{"id":4,"error":{}}]', True, 1),
+        (200, b'[]', True, 0),
+        (200, b'{"id":5,"result":"0x1"}', False, 1),
+        (500, b'[{"id":6,"result":"0x1"}]', False, 0),
+    ]
+    df = pl.DataFrame(
+        {
+            'status_code': [item[0] for item in responses],
+            'response': pl.Series(
+                [item[1] for item in responses], dtype=pl.Binary
+            ),
+        }
+    )
+    df = deep_utils._add_error_columns(df)
+    assert df['rpc_error'].to_list() == [item[2] for item in responses]
+    assert df['n_successful_calls'].to_list() == [item[3] for item in responses]
+
+
+def test_in_flight_metrics():
+    pl = pytest.importorskip('polars')
+
+    # two requests overlap for 1s, each lasting 2s, over a 3s span
+    df = pl.DataFrame({'timestamp': [0, 10**9], 'latency': [2 * 10**9] * 2})
+    metrics = deep_utils._compute_in_flight_metrics(df)
+    assert metrics['max_in_flight'] == 2
+    assert metrics['mean_in_flight'] == pytest.approx(4 / 3)
+
+    # a request sent as another completes does not overlap it
+    df = pl.DataFrame({'timestamp': [0, 10**9], 'latency': [10**9] * 2})
+    assert deep_utils._compute_in_flight_metrics(df)['max_in_flight'] == 1
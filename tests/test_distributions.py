@@ -0,0 +1,65 @@
+import pytest
+
+from flood.generators import distributions
+
+
+def test_parse_distribution():
+    assert distributions.parse_distribution(None)['name'] == 'uniform'
+    assert distributions.parse_distribution('zipf:1.2') == {
+        'name': 'zipf',
+        'exponent': 1.2,
+        'half_life': None,
+    }
+    assert distributions.parse_distribution('recency')['half_life'] is None
+    assert distributions.is_uniform_distribution('uniform')
+    assert not distributions.is_uniform_distribution({'name': 'zipf'})
+    for invalid in ['pareto', 'zipf:0', 'recency:-5', 'uniform:1']:
+        with pytest.raises(Exception):
+            distributions.parse_distribution(invalid)
+
+
+def test_sample_zipf_ranks():
+    np = pytest.importorskip('numpy')
+
+    # empirical frequencies match the truncated zipf pmf
+    for exponent in [0.5, 1.0, 2.0]:
+        ranks = distributions.sample_ranks(
+            200_000, 20, 'zipf:' + str(exponent), random_seed=0
+        )
+        assert ranks.min() >= 0 and ranks.max() < 20
+        pmf = np.arange(1, 21, dtype=float) ** -exponent
+        pmf /= pmf.sum()
+        frequencies = np.bincount(ranks, minlength=20) / len(ranks)
+        assert np.abs(frequencies - pmf).max() < 0.005
+
+    # sampling is independent of the number of items
+    ranks = distributions.sample_ranks(1000, 10**15, 'zipf', random_seed=0)
+    assert ranks.max() < 10**15
+    assert (ranks == 0).mean() > 0.01
+
+
+def test_sample_recency_ranks():
+    np = pytest.importorskip('numpy')
+
+    ranks = distributions.sample_ranks(
+        100_000, 1_000_000, 'recency:1000', random_seed=0
+    )
+    assert ranks.min() >= 0
+    assert np.median(ranks) == pytest.approx(1000, rel=0.05)
+
+
+def test_sample_distinct_ranks():
+    np = pytest.importorskip('numpy')
+
+    for distribution in ['uniform', 'zipf:1.1', 'recency:100']:
+        ranks = distributions.sample_ranks(
+            500, 1000, distribution, replace=False, random_seed=0
+        )
+        assert len(np.unique(ranks)) == 500
+        assert ranks.max() < 1000
+
+    # too steep to find enough distinct items
+    with pytest.raises(Exception):
+        distributions.sample_ranks(
+            1000, 10**9, 'recency:1', replace=False, random_seed=0
+        )
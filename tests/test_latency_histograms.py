@@ -0,0 +1,52 @@
+import pytest
+
+from flood.tests.load_tests import latency_histograms
+
+
+@pytest.fixture
+def latencies():
+    np = pytest.importorskip('numpy')
+    rng = np.random.default_rng(0)
+    return rng.lognormal(17, 1, 10_000).astype(np.int64)
+
+
+def test_histogram_quantiles(latencies):
+    import numpy as np
+
+    histogram = latency_histograms.create_latency_histogram(latencies)
+    assert histogram['n'] == len(latencies)
+    assert sum(histogram['counts']) == len(latencies)
+
+    quantiles = [0, 0.5, 0.9, 0.99, 1]
+    estimates = latency_histograms.compute_latency_histogram_quantiles(
+        histogram, quantiles
+    )
+    exact = np.quantile(latencies, quantiles, method='inverted_cdf') / 1e9
+    for estimate, value in zip(estimates, exact):
+        assert estimate == pytest.approx(value, rel=1 / 128)
+
+
+def test_merge_histograms(latencies):
+    histogram = latency_histograms.create_latency_histogram(latencies)
+    merged = latency_histograms.merge_latency_histograms(
+        [
+            latency_histograms.create_latency_histogram(latencies[:3000]),
+            latency_histograms.create_latency_histogram([]),
+            latency_histograms.create_latency_histogram(latencies[3000:]),
+        ]
+    )
+    assert merged == histogram
+
+
+def test_bucket_bounds():
+    np = pytest.importorskip('numpy')
+    values = np.concatenate(
+        [np.arange(0, 5000), np.array([2**40 + 12345, 10**11])]
+    )
+    buckets = latency_histograms._get_bucket_indices(values, 7)
+    lower, upper = latency_histograms._get_bucket_bounds(buckets, 7)
+    assert ((lower <= values) & (values < upper)).all()
+    assert (upper[lower < 256] - lower[lower < 256] == 1).all()
+    assert ((upper - lower) / np.maximum(lower, 1) <= 1 / 128)[
+        lower >= 128
+    ].all()
@@ -0,0 +1,113 @@
+import pytest
+
+from flood.tests import load_tests
+
+
+def test_create_closed_loop_test():
+    calls = list(range(1000))
+    attacks = load_tests.create_load_test(
+        calls=calls, concurrencies=[1, 2], duration=2
+    )
+    assert [attack['rate'] for attack in attacks] == [0, 0]
+    assert [attack['concurrency'] for attack in attacks] == [1, 2]
+    assert [len(attack['calls']) for attack in attacks] == [200, 400]
+
+
+def test_batch_calls():
+    calls = [{'jsonrpc': '2.0', 'id': 1, 'method': 'eth_chainId'}] * 10
+    batches = load_tests.batch_calls(calls, 4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    ids = [call['id'] for batch in batches for call in batch]
+    assert ids == list(range(1, 11))
+    assert load_tests.get_batch_size(batches) == 4
+    assert load_tests.get_batch_size(calls) is None
+
+
+def _generate_calls(n_calls, random_seed):
+    import numpy as np
+
+    rng = np.random.default_rng(random_seed)
+    return [
+        {
+            'jsonrpc': '2.0',
+            'id': 1,
+            'method': 'eth_getBlockByNumber',
+            'params': [hex(block), False],
+        }
+        for block in rng.integers(1_000_000, size=n_calls).tolist()
+    ]
+
+
+def test_lazy_calls():
+    pytest.importorskip('numpy')
+
+    generated = []
+
+    def generate_calls(n_calls, random_seed):
+        generated.append(n_calls)
+        return _generate_calls(n_calls, random_seed)
+
+    calls = load_tests.generate_lazy_calls(
+        generate_calls, n_calls=2500, random_seed=0, chunk_size=1000
+    )
+    assert isinstance(calls, load_tests.LazyCalls)
+    assert len(calls) == 2500
+    assert generated == []
+
+    # partitioning into attacks generates nothing
+    attacks = load_tests.create_load_test(
+        calls=calls, rates=[10, 20], duration=50
+    )
+    assert [len(attack['calls']) for attack in attacks] == [500, 1000]
+    assert generated == []
+
+    # calls are identical when regenerated
+    all_calls = list(calls)
+    assert generated == [1000, 1000, 500]
+    assert list(calls) == all_calls
+    assert list(attacks[1]['calls']) == all_calls[500:1500]
+    assert list(attacks[1]['calls'][1::3]) == all_calls[501:1500:3]
+    assert calls[-1] == all_calls[-1]
+
+    # ids are numbered across chunks
+    assert [call['id'] for call in all_calls] == list(range(1, 2501))
+
+    # batches are numbered across chunks
+    batches = load_tests.batch_calls(calls, 300)
+    assert load_tests.get_batch_size(batches) == 300
+    ids = [call['id'] for batch in batches for call in batch]
+    assert ids == list(range(1, 2501))
+
+    # small tests are generated immediately, as by the call generator
+    small = load_tests.generate_lazy_calls(
+        generate_calls, n_calls=10, random_seed=0, chunk_size=1000
+    )
+    assert small == _generate_calls(10, 0)
+
+
+def test_lazy_calls_differ_across_chunks():
+    pytest.importorskip('numpy')
+    orjson = pytest.importorskip('orjson')
+
+    import flood
+
+    calls = load_tests.generate_lazy_calls(
+        flood.generators.generate_calls_trace_block,
+        n_calls=2500,
+        random_seed=0,
+        chunk_size=1000,
+        network='ethereum',
+    )
+    decoded = [orjson.loads(call) for call in calls]
+    assert [call['id'] for call in decoded] == list(range(1, 2501))
+    blocks = [call['params'][0] for call in decoded]
+    assert blocks[:500] != blocks[1000:1500]
+    assert blocks[5] != blocks[2005]
+
+
+def test_cycle_calls():
+    import itertools
+
+    cycled = load_tests.cycle_calls([1, 2, 3])
+    assert list(itertools.islice(cycled, 7)) == [1, 2, 3, 1, 2, 3, 1]
+    assert list(load_tests.cycle_calls([])) == []
@@ -0,0 +1,90 @@
+import pytest
+
+import flood
+from flood.generators.test_generators import mix_test_generators
+from flood.tests.load_tests import deep_utils
+
+
+def test_parse_mix_weights():
+    weights = mix_test_generators.parse_mix_weights(
+        'mix:eth_getBlockByNumber=3,trace_block=1'
+    )
+    assert weights == {'eth_getBlockByNumber': 0.75, 'trace_block': 0.25}
+
+    with pytest.raises(Exception):
+        mix_test_generators.parse_mix_weights('mix:eth_notAMethod=1')
+    with pytest.raises(Exception):
+        mix_test_generators.parse_mix_weights('mix:trace_block')
+
+
+def test_mix_deep_metrics():
+    pytest.importorskip('numpy')
+    orjson = pytest.importorskip('orjson')
+    pl = pytest.importorskip('polars')
+
+    weights = {'eth_getBlockByNumber': 0.75, 'trace_block': 0.25}
+    calls = mix_test_generators.generate_calls_mix(
+        1000, weights=weights, network='ethereum', random_seed=0
+    )
+    methods = deep_utils._get_call_methods(calls)
+    assert methods is not None
+    assert 650 < methods.count('eth_getBlockByNumber') < 850
+    assert [orjson.loads(call)['id'] for call in calls] == list(range(1, 1001))
+
+    # vegeta responses are matched to calls by id, whatever their order
+    n = 1500
+    order = [(i * 7) % 1000 for i in range(n)]
+    responses = [
+        b'{"jsonrpc":"2.0","id":' + str(i + 1).encode() + b',"result":"0x1"}'
+        for i in order
+    ]
+    # failed requests have no response and fall back to their index
+    responses[0] = b''
+    df = pl.DataFrame(
+        {
+            'timestamp': [i * 1_000_000 for i in range(n)],
+            'latency': [1_000_000] * n,
+            'status_code': [0] + [200] * (n - 1),
+            'error': pl.Series(['timeout'] + [None] * (n - 1), dtype=pl.Utf8),
+            'response': pl.Series(responses, dtype=pl.Binary),
+            'index': list(range(n)),
+        }
+    )
+    metrics, _ = deep_utils.compute_deep_datum_from_dataframe(
+        all_df=df, target_rate=1000, target_duration=1, calls=calls
+    )
+    expected = [methods[i] for i in order]
+    for method in weights:
+        assert metrics[method]['requests'] == expected.count(method)
+    assert metrics['all']['requests'] == n
+
+    # engines that record the call of each request use it instead
+    df = df.with_columns((pl.col('index') % 1000).alias('call_index'))
+    metrics, _ = deep_utils.compute_deep_datum_from_dataframe(
+        all_df=df, target_rate=1000, target_duration=1, calls=calls
+    )
+    expected = (methods + methods)[:n]
+    for method in weights:
+        assert metrics[method]['requests'] == expected.count(method)
+
+
+def test_run_requests_deep_metrics(monkeypatch):
+    pytest.importorskip('numpy')
+    calls = []
+
+    def run_load_tests(**kwargs):
+        calls.append(kwargs)
+        return {}
+
+    monkeypatch.setattr(
+        flood.user_io, 'parse_nodes', lambda nodes, **kwargs: {}
+    )
+    monkeypatch.setattr(flood, 'run_load_tests', run_load_tests)
+    flood.run(
+        test_name='move_get_account',
+        rates=[10],
+        duration=1,
+        deep_check=True,
+        verbose=False,
+    )
+    assert calls[0]['include_deep_output'] == ['metrics']
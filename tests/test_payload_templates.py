@@ -0,0 +1,61 @@
+import pytest
+
+from flood.generators.object_generators import payload_templates
+from flood.tests import load_tests
+
+
+def test_render_payloads():
+    import orjson
+
+    pytest.importorskip('numpy')
+    template = payload_templates.compile_payload_template(
+        'eth_getStorageAt',
+        [
+            payload_templates.slot('str'),
+            payload_templates.slot('str'),
+            payload_templates.slot('hex'),
+        ],
+    )
+    addresses = ['0xab', '0x5f98805a4e8be255a32880fdec7f6728c6568ba0', '0x1']
+    positions = ['0x0', '0x1', '0x2']
+    blocks = [0, 255, 2**63]
+    calls = payload_templates.render_payloads(
+        template, [addresses, positions, blocks], start_id=99
+    )
+
+    assert len(calls) == 3
+    assert [orjson.loads(call) for call in calls] == [
+        {
+            'jsonrpc': '2.0',
+            'id': 99 + i,
+            'method': 'eth_getStorageAt',
+            'params': [address, position, hex(block)],
+        }
+        for i, (address, position, block) in enumerate(
+            zip(addresses, positions, blocks)
+        )
+    ]
+    assert calls[::2][1] == calls[2]
+    assert len(calls.buffer) == sum(len(call) for call in calls)
+
+    empty = payload_templates.render_payloads(template, [[], [], []])
+    assert len(empty) == 0 and list(empty) == []
+
+
+def test_rendered_calls_in_attacks():
+    import orjson
+
+    pytest.importorskip('numpy')
+    template = payload_templates.compile_payload_template(
+        'eth_getBlockByNumber', [payload_templates.slot('hex'), False]
+    )
+    calls = payload_templates.render_payloads(template, [list(range(10))])
+
+    method, _, _, body = load_tests.load_test_engines._get_call_http_request(
+        calls[3], 'http://localhost:8545'
+    )
+    assert method == 'POST' and body == calls[3]
+
+    batches = load_tests.batch_calls(calls, 4)
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[0][3] == dict(orjson.loads(calls[3]), id=4)
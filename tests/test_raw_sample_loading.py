@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from flood.generators.raw_data_sources import raw_sample_loading
+
+
+def test_load_samples(tmp_path):
+    pytest.importorskip('numpy')
+    pl = pytest.importorskip('polars')
+
+    addresses = [bytes([i]) * 20 for i in range(10)]
+    slots = [bytes([i]) * 32 for i in range(10)]
+    path = os.path.join(tmp_path, 'testnet_slots_samples__XS__v1_0_0.parquet')
+    pl.DataFrame({'contract_address': addresses, 'slot': slots}).write_parquet(
+        path
+    )
+
+    def load(n, **kwargs):
+        return raw_sample_loading.load_samples(
+            network='testnet',
+            datatype='slots',
+            n=n,
+            samples_dir=str(tmp_path),
+            download_missing=False,
+            **kwargs,
+        )
+
+    # rows are sampled without replacement and encoded as hex
+    rows = load(5, random_seed=0)
+    assert len(rows) == 5 and len(set(rows)) == 5
+    expected = {
+        ('0x' + address.hex(), '0x' + slot.hex())
+        for address, slot in zip(addresses, slots)
+    }
+    assert set(rows) <= expected
+    assert rows == load(5, random_seed=0)
+
+    # columns are converted once to memory-mapped stores
+    assert os.path.isfile(path[: -len('.parquet')] + '__slot.npy')
+
+    # more samples than rows reuse each row equally
+    rows = load(25, random_seed=1)
+    assert len(rows) == 25 and set(rows) == expected
+    assert all(rows.count(row) in (2, 3) for row in expected)
+
+    rows = load(3, random_seed=0, binary_convert=False)
+    assert all(row in set(zip(addresses, slots)) for row in rows)
+
+    # hot rows are the first rows of the samples, whatever the seed
+    for seed in range(3):
+        rows = load(1000, random_seed=seed, distribution='zipf:2')
+        assert max(set(rows), key=rows.count) == (
+            '0x' + addresses[0].hex(),
+            '0x' + slots[0].hex(),
+        )
@@ -0,0 +1,82 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from flood.generators.test_generators import request_log_replay
+from flood.tests.load_tests import deep_utils
+from flood.tests.load_tests import load_test_construction
+
+
+def test_ingest_request_log(tmp_path):
+    pytest.importorskip('numpy')
+    orjson = pytest.importorskip('orjson')
+
+    request = {'jsonrpc': '2.0', 'id': 7, 'method': 'eth_blockNumber'}
+    lines = [
+        json.dumps({'timestamp': 1000.5, 'request': request, 'status': 200}),
+        'not json',
+        json.dumps({'timestamp': 1000.0, 'request': request}),
+        json.dumps({'request': request}),
+        json.dumps(
+            {
+                'timestamp': '1970-01-01T00:16:41Z',
+                'request': [
+                    {'method': 'eth_chainId'},
+                    {'method': 'eth_getBalance', 'params': ['0x1', 'latest']},
+                ],
+            }
+        ),
+    ]
+    log_path = os.path.join(tmp_path, 'requests.ndjson.gz')
+    with gzip.open(log_path, 'wt') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    store_dir = os.path.join(tmp_path, 'store')
+    request_log_replay.ingest_request_log(log_path, store_dir)
+    calls, send_times = request_log_replay.load_request_log(store_dir)
+
+    # calls are sorted by send time, and batches are split into calls
+    assert list(send_times) == [1000.0, 1000.5, 1001.0, 1001.0]
+    decoded = [orjson.loads(call) for call in calls]
+    assert [call['method'] for call in decoded] == [
+        'eth_blockNumber',
+        'eth_blockNumber',
+        'eth_chainId',
+        'eth_getBalance',
+    ]
+    assert sorted(call['id'] for call in decoded) == [1, 2, 3, 4]
+    assert decoded[3]['params'] == ['0x1', 'latest']
+    with open(os.path.join(store_dir, 'log.json')) as f:
+        assert json.load(f)['n_skipped_lines'] == 2
+
+    # each speed replays every call, compressing the schedule
+    attacks = load_test_construction.create_load_test(
+        calls=calls, send_times=send_times, speeds=[1, 2]
+    )
+    assert [list(attack['schedule']) for attack in attacks] == [
+        [0.0, 0.5, 1.0, 1.0],
+        [0.0, 0.25, 0.5, 0.5],
+    ]
+    assert all(len(attack['calls']) == 4 for attack in attacks)
+
+
+def test_scheduled_timestamps_of_replay():
+    pytest.importorskip('numpy')
+    pl = pytest.importorskip('polars')
+
+    # the second request was sent 0.2s late
+    df = pl.DataFrame(
+        {
+            'timestamp': [0, 1_200_000_000, 1_500_000_000],
+            'latency': [100] * 3,
+            'index': [0, 1, 2],
+        }
+    )
+    df = deep_utils._add_scheduled_timestamps(df, 1, schedule=[0.0, 1.0, 1.5])
+    assert df['scheduled_timestamp'].to_list() == [
+        0,
+        1_000_000_000,
+        1_500_000_000,
+    ]
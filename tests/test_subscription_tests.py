@@ -0,0 +1,138 @@
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+
+import pytest
+
+from flood.tests.load_tests import subscription_tests
+from flood.tests.load_tests import websocket_engine
+
+# subscriber 0 misses every other block, subscriber 1 receives blocks late
+block_interval = 0.05
+late_delay = 0.2
+
+
+class SubscriptionServer:
+    def __init__(self):
+        self.subscribers = []
+
+    async def handle_connection(self, reader, writer):
+        headers = {}
+        await reader.readline()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            key, _, value = line.decode().partition(':')
+            headers[key.strip().lower()] = value.strip()
+        accept = base64.b64encode(
+            hashlib.sha1(
+                headers['sec-websocket-key'].encode()
+                + websocket_engine._websocket_guid
+            ).digest()
+        )
+        writer.write(
+            b'HTTP/1.1 101 Switching Protocols\r\n'
+            b'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+            b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+        )
+
+        message = await websocket_engine._read_message(reader, writer)
+        request = json.loads(message)
+        subscriber = len(self.subscribers)
+        send(writer, {'jsonrpc': '2.0', 'id': request['id'], 'result': '0xa'})
+        self.subscribers.append(writer)
+        while await websocket_engine._read_message(reader, writer):
+            pass
+        self.subscribers[subscriber] = None
+        writer.close()
+
+    async def publish_blocks(self):
+        number = 0
+        while True:
+            await asyncio.sleep(block_interval)
+            number += 1
+            notification = {
+                'jsonrpc': '2.0',
+                'method': 'eth_subscription',
+                'params': {
+                    'subscription': '0xa',
+                    'result': {'hash': hex(number), 'number': hex(number)},
+                },
+            }
+            for subscriber, writer in enumerate(self.subscribers):
+                if writer is None:
+                    continue
+                elif subscriber == 0 and number % 2 == 1:
+                    continue
+                elif subscriber == 1:
+                    asyncio.get_running_loop().call_later(
+                        late_delay, send, writer, notification
+                    )
+                else:
+                    send(writer, notification)
+
+
+def send(writer, message):
+    body = json.dumps(message).encode()
+    writer.write(struct.pack('!BBH', 0x81, 126, len(body)) + body)
+
+
+@pytest.fixture
+def local_subscription_url():
+    pytest.importorskip('numpy')
+    server = SubscriptionServer()
+    loop = asyncio.new_event_loop()
+    listener = loop.run_until_complete(
+        asyncio.start_server(server.handle_connection, '127.0.0.1', 0)
+    )
+    loop.create_task(server.publish_blocks())
+    port = listener.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield 'ws://127.0.0.1:' + str(port)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_subscription_test(local_subscription_url):
+    output = subscription_tests.run_subscription_test(
+        url=local_subscription_url,
+        n_subscribers=4,
+        ramp_rate=100,
+        duration=1,
+        late_threshold=0.1,
+    )
+    assert output['n_subscribed'] == 4
+    assert output['n_connection_errors'] == 0
+    assert output['n_notifications'] > 10
+    assert output['delay_histogram']['n'] == output['n_deliveries']
+    assert output['subscribe_latency_histogram']['n'] == 4
+
+    # subscriber 0 drops half of all blocks, subscriber 1 is late for all,
+    # and drops the last blocks, which arrive after the drain period
+    n = output['n_notifications']
+    n_undrained = late_delay / block_interval
+    assert n / 2 - 1 <= output['n_dropped'] <= n / 2 + 1 + n_undrained
+    assert n - n_undrained - 1 <= output['n_late'] <= n
+    assert output['delay_max'] == pytest.approx(late_delay, abs=0.1)
+
+
+def test_notification_keys():
+    def notification(result):
+        message = {
+            'jsonrpc': '2.0',
+            'method': 'eth_subscription',
+            'params': {'subscription': '0x1', 'result': result},
+        }
+        return json.dumps(message).encode()
+
+    get_key = subscription_tests._get_notification_key
+    head = {'hash': '0xab', 'number': '0x1'}
+    log = {'blockHash': '0xab', 'logIndex': '0x2', 'data': '0x'}
+    assert get_key(notification(head)) == '0xab'
+    assert get_key(notification(log)) == ('0xab', '0x2', False)
+    assert get_key(b'{"jsonrpc":"2.0","id":1,"result":"0x1"}') is None
+    assert get_key(b'not json') is None
@@ -0,0 +1,116 @@
+import pytest
+
+from flood.tests.load_tests import deep_utils
+from flood.tests.load_tests import vegeta_gob
+
+
+# 12 results from vegeta attack, saved in the deep_raw_output format
+# - every 7th result is a connection error with no response
+# - every 11th result is a json-rpc response with a null result
+# - result 5 has a timestamp in a non-utc timezone
+sample_raw_output = (
+    'H4sIAPIs1GoC/73UP2jUUBwH8PfL5ZK7a9QupYtofGpPoXpXsSDhFlsFhUpre04uhuTJRd'
+    'O8mLwDQyletf6DDh3UxUHBUXBxEkEEFxGE0lFcBemig5Mgz/fuDZpbupRM+QV+/H4fvu8l'
+    '/MmtEoAxT9JuyID3EFhgnGbM9a6DhaC0QG6AgUCfpj6RRbUdLJKUuYsx8NsIzBmXkcjLQE'
+    'dQmcoYSWe7TPaZ/ZfzkazLZ5OEJnKcPkX9DGoIjAuEdajfX3FpfkY+zXPE9UmSAr+HEBrm'
+    'K2UAXW6TixAa5Xd1AVVNskdA+SpCFr+jgSYqMQPxZ7yn7wHRvvvrt+/IvPx5BCH4s2+1By'
+    '1trx+4oc282LE9GkXEYwGN7IRc7abEh7ElfC2lURJ72MEnjjfxOA587EyM46SfDXaibhgu'
+    'gz43u9CGkQ5jsdNohNRzww5NmXNq8uQkgDVNIxEIO9bOYgLDbhyHgefKRQ05HfGHvKcB8I'
+    '/wn/KX97ivXJuDFuzX6ttKcPPmBN4RipanVNZ+q8Ae2YJiF0op5SnVw+sqlac/BeVAoRR9'
+    'gPKurlJ58V5QcKGU8sBdkTe6JSgv1wXlYKEUI0+p/WirVF5fEZRDRVEyITG1f4yh+1vqnr'
+    'xtbveNazsQQiUfgmWvqBA+IBHCWKHnUR2gvBlVQXzaEJR6oZRanrLr4iuVyuZzQTlSGOWB'
+    'oAwNULbOqFS+xIJyVCvmN/8XkDYWhFYHAAA='
+)
+
+
+@pytest.fixture
+def raw_output():
+    pytest.importorskip('polars')
+    return deep_utils.decode_raw_vegeta_output(sample_raw_output)
+
+
+def test_decode_vegeta_results(raw_output):
+    df = vegeta_gob.decode_vegeta_results(raw_output)
+    assert len(df) == 12
+    assert df['index'].to_list() == list(range(12))
+    assert df['timestamp'][0] == 1700000000123456789
+    assert df['timestamp'][1] == 1700000000133456789
+    assert df['timestamp'][5] == 1700000000123456789
+    assert df['latency'].to_list() == [1000000 + i * 1000 for i in range(12)]
+    assert df['status_code'].to_list() == [0] + [200] * 6 + [0] + [200] * 4
+    assert df['error'][7] == 'dial tcp: connection refused'
+    assert df['error'][8] is None
+    assert df['response'][7] == b''
+    assert df['response'][11] == b'{"jsonrpc":"2.0","id":1,"result":null}'
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 100])
+def test_decode_vegeta_results_in_chunks(raw_output, chunk_size):
+    decoder = vegeta_gob.create_vegeta_decoder()
+    dfs = []
+    for i in range(0, len(raw_output), chunk_size):
+        chunk = raw_output[i : i + chunk_size]
+        columns = vegeta_gob.feed_vegeta_decoder(decoder, chunk)
+        dfs.append(vegeta_gob.vegeta_columns_to_dataframe(columns))
+    assert len(decoder['buffer']) == 0
+
+    import polars as pl
+
+    df = pl.concat(dfs)
+    assert df.frame_equal(vegeta_gob.decode_vegeta_results(raw_output))
+
+
+def test_decode_truncated_vegeta_results(raw_output):
+    with pytest.raises(Exception):
+        vegeta_gob.decode_vegeta_results(raw_output[:-1])
+
+
+@pytest.mark.parametrize('chunk_size', [7, 1000])
+def test_streaming_deep_metrics_by_method(raw_output, chunk_size):
+    orjson = pytest.importorskip('orjson')
+
+    # give the 11 responses with bodies ids in a different order than calls
+    response_ids = [9, 2, 7, 4, 5, 6, 3, 8, 1, 6, 5]
+    parts = raw_output.split(b'"id":1,')
+    assert len(parts) == len(response_ids) + 1
+    permuted = parts[0]
+    for response_id, part in zip(response_ids, parts[1:]):
+        permuted += b'"id":' + str(response_id).encode() + b',' + part
+
+    methods = ['eth_blockNumber', 'eth_chainId'] * 4 + ['eth_blockNumber']
+    calls = [
+        orjson.dumps(
+            {'jsonrpc': '2.0', 'id': i + 1, 'method': method, 'params': []}
+        )
+        for i, method in enumerate(methods)
+    ]
+
+    decoder = deep_utils._start_streaming_deep_decoder()
+    for i in range(0, len(permuted), chunk_size):
+        chunk = permuted[i : i + chunk_size]
+        deep_utils._feed_streaming_deep_decoder(decoder, chunk)
+    df = deep_utils._finish_streaming_deep_decoder(decoder)
+
+    # bodies of successful responses are dropped, but their ids are kept
+    row_ids = response_ids[:7] + [None] + response_ids[7:]
+    assert df['response'][1] is None
+    assert df['response_id'].to_list() == row_ids
+
+    metrics, _ = deep_utils.compute_deep_datum_from_dataframe(
+        all_df=df, target_rate=100, target_duration=1, calls=calls
+    )
+
+    # the response without a body falls back to its index
+    call_indices = [
+        i if row_id is None else row_id - 1 for i, row_id in enumerate(row_ids)
+    ]
+    latencies = df['latency'].to_list()
+    for method in set(methods):
+        rows = [
+            i
+            for i, call_index in enumerate(call_indices)
+            if methods[call_index] == method
+        ]
+        assert metrics[method]['requests'] == len(rows)
+        mean = sum(latencies[i] for i in rows) / len(rows) / 1e9
+        assert metrics[method]['mean'] == pytest.approx(mean)
@@ -0,0 +1,96 @@
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+
+import pytest
+
+import flood
+from flood.tests.load_tests import websocket_engine
+
+
+async def handle_connection(reader, writer):
+    # opening handshake
+    headers = {}
+    await reader.readline()
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        key, _, value = line.decode().partition(':')
+        headers[key.strip().lower()] = value.strip()
+    accept = base64.b64encode(
+        hashlib.sha1(
+            headers['sec-websocket-key'].encode()
+            + websocket_engine._websocket_guid
+        ).digest()
+    )
+    writer.write(
+        b'HTTP/1.1 101 Switching Protocols\r\n'
+        b'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+        b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+    )
+
+    # answer requests out of order, as unmasked server frames
+    async def respond(message):
+        await asyncio.sleep(random.random() * 0.02)
+        request = json.loads(message)
+        if request['params'][0] % 2 == 0:
+            result = '0x1'
+        else:
+            result = None
+        body = json.dumps(
+            {'jsonrpc': '2.0', 'id': request['id'], 'result': result}
+        ).encode()
+        writer.write(struct.pack('!BB', 0x81, len(body)) + body)
+
+    while True:
+        message = await websocket_engine._read_message(reader, writer)
+        if message is None:
+            break
+        asyncio.ensure_future(respond(message))
+    writer.close()
+
+
+@pytest.fixture
+def local_websocket_url():
+    pytest.importorskip('polars')
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(
+        asyncio.start_server(handle_connection, '127.0.0.1', 0)
+    )
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield 'ws://127.0.0.1:' + str(port)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def test_websocket_attack(local_websocket_url):
+    calls = [
+        {'jsonrpc': '2.0', 'id': i, 'method': 'eth_getBalance', 'params': [i]}
+        for i in range(40)
+    ]
+    result = flood.tests.load_tests.run_attack(
+        url=local_websocket_url,
+        rate=40,
+        calls=calls,
+        duration=1,
+        include_deep_output=['metrics'],
+    )
+    assert result['requests'] == 40
+    assert result['success'] == 1.0
+    assert result['status_codes'] == {'200': 40}
+    assert result['deep_metrics']['all']['n_rpc_errors'] == 20
+
+
+def test_frame_masking():
+    payload = bytes(range(256)) * 300
+    opcode = websocket_engine._opcode_text
+    frame = websocket_engine._encode_frame(opcode, payload)
+    assert frame[1] & 0x7F == 127
+    mask = frame[10:14]
+    assert websocket_engine._apply_mask(frame[14:], mask) == payload